@@ -0,0 +1,136 @@
+"""
+Micro-benchmark: get_conn (sync, conexão nova por chamada) x pool assíncrono.
+
+Roda o mesmo mix de operações (insert em staff_logs + leitura do evento aberto)
+nos dois caminhos e mede:
+- ops/s
+- travamento do event loop (atraso de um ticker de 1ms rodando em paralelo)
+
+Uso:
+    python -m benchmarks.bench_database [--ops 2000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from utils import database
+
+INSERT_LOG = """
+INSERT INTO staff_logs (guild_id, event_id, action_type, target_user_id, actor_user_id, actor_display_name, reason, metadata_json, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_OPEN = """
+SELECT * FROM events
+WHERE guild_id = ? AND event_type = 'karaoke' AND status IN ('signup_open', 'active')
+ORDER BY id DESC LIMIT 1
+"""
+
+
+def _log_row(i: int) -> tuple:
+    return (1, None, "bench", i, 42, "bench", None, None, datetime.utcnow().isoformat())
+
+
+class LoopLag:
+    """Ticker que acorda a cada `interval` e registra o quanto atrasou."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _tick(self) -> None:
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - t0 - self.interval))
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._tick())
+        await asyncio.sleep(0)  # deixa o ticker armar o primeiro sleep
+
+    async def stop(self) -> None:
+        # um tick extra para registrar o atraso do último bloqueio
+        await asyncio.sleep(self.interval * 2)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def summary(self) -> dict:
+        if not self.samples:
+            return {"max_ms": 0.0, "p99_ms": 0.0, "total_ms": 0.0}
+        data = sorted(self.samples)
+        p99 = data[min(len(data) - 1, int(len(data) * 0.99))]
+        return {
+            "max_ms": round(data[-1] * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "total_ms": round(sum(data) * 1000, 1),
+        }
+
+
+async def _sync_op(i: int) -> None:
+    # caminho antigo: conexão nova + I/O no próprio event loop
+    with database.get_conn() as conn:
+        if i % 2:
+            conn.execute(INSERT_LOG, _log_row(i))
+        else:
+            conn.execute(SELECT_OPEN, (1,)).fetchone()
+
+
+async def _async_op(i: int) -> None:
+    if i % 2:
+        await database.execute(INSERT_LOG, _log_row(i))
+    else:
+        await database.fetchone(SELECT_OPEN, (1,))
+
+
+async def _run(op, ops: int, concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with sem:
+            await op(i)
+
+    lag = LoopLag()
+    await lag.start()
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(ops)))
+    elapsed = time.perf_counter() - t0
+    await lag.stop()
+    return {"ops_per_sec": round(ops / elapsed, 1), "elapsed_s": round(elapsed, 3), "loop_stall": lag.summary()}
+
+
+async def main(ops: int, concurrency: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+        database.init_db()
+
+        sync_result = await _run(_sync_op, ops, concurrency)
+
+        await database.open_pool()
+        try:
+            async_result = await _run(_async_op, ops, concurrency)
+        finally:
+            await database.close_pool()
+
+    print(f"ops={ops} concurrency={concurrency}")
+    for name, r in (("get_conn (sync)", sync_result), ("pool (async)", async_result)):
+        s = r["loop_stall"]
+        print(
+            f"{name:<16} {r['ops_per_sec']:>10} ops/s | "
+            f"stall max {s['max_ms']}ms p99 {s['p99_ms']}ms total {s['total_ms']}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.ops, args.concurrency))
@@ -0,0 +1,67 @@
+"""
+Benchmark de construção dos embeds da marca.
+
+- make_embed: caminho antigo (resolve display_avatar.url e guild.icon.url a
+  cada chamada e monta author/footer/thumbnail do zero)
+- branded:    EmbedTemplates (assets em cache + campos pré-montados)
+
+Os assets são discord.Asset reais, criados como o discord.py cria a cada
+acesso de `display_avatar` / `guild.icon`.
+
+Uso:
+    python -m benchmarks.bench_embeds [--n 50000]
+"""
+import argparse
+import timeit
+
+import discord
+
+from utils.embeds import EmbedTemplates, make_embed
+
+BOT_NAME = "Robô Duki"
+
+
+class _User:
+    id = 111
+
+    @property
+    def display_avatar(self) -> discord.Asset:
+        return discord.Asset._from_avatar(None, self.id, "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4")
+
+
+class _Guild:
+    id = 222
+
+    @property
+    def icon(self) -> discord.Asset:
+        return discord.Asset._from_guild_icon(None, self.id, "f6e5d4c3b2a1f6e5d4c3b2a1f6e5d4c3")
+
+
+def main(n: int) -> None:
+    user, guild = _User(), _Guild()
+    templates = EmbedTemplates(BOT_NAME)
+
+    def old() -> discord.Embed:
+        return make_embed(
+            title="STATUS",
+            footer=BOT_NAME,
+            author_name=f"{BOT_NAME} • status",
+            author_icon=user.display_avatar.url if user else None,
+            thumbnail_url=guild.icon.url if guild.icon else None,
+        )
+
+    def new() -> discord.Embed:
+        return templates.branded("STATUS", user=user, guild=guild, author_suffix="status", thumbnail=True)
+
+    assert old().to_dict() == new().to_dict()
+
+    old_us = min(timeit.repeat(old, number=n, repeat=3)) / n * 1_000_000
+    new_us = min(timeit.repeat(new, number=n, repeat=3)) / n * 1_000_000
+    print(f"make_embed (antes):  {old_us:6.2f} µs/embed")
+    print(f"branded (depois):    {new_us:6.2f} µs/embed  ({old_us / new_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50_000)
+    main(parser.parse_args().n)
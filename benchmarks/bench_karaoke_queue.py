@@ -0,0 +1,125 @@
+"""
+Benchmark da fila do karaokê (padrão: 500 cantores).
+
+- lista:   caminho ingênuo (list + posições 1..n; mexeu na ordem, regrava
+           queue_position de todo mundo)
+- engine:  KaraokeQueue (OrderedDict + posições com gap; grava só a linha
+           que mudou)
+
+Mix de operações: pular para o fim, remover, reinserir e avançar, sobre o
+banco real (pool + WAL) num diretório temporário.
+
+Uso:
+    python -m benchmarks.bench_karaoke_queue [--singers 500] [--ops 300]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from utils import database
+from utils.karaoke_queue import KaraokeQueue, UPSERT_QUEUE_SQL
+
+
+class ListQueue:
+    """Fila ingênua: a ordem é a lista; toda mudança regrava as posições."""
+
+    def __init__(self, event_id: int) -> None:
+        self.event_id = event_id
+        self.order: list[int] = []
+        self.current: int | None = None
+        self.rows_written = 0
+
+    async def _rewrite(self, extra: list[tuple] = ()) -> None:
+        rows = [(self.event_id, uid, i + 1, "waiting") for i, uid in enumerate(self.order)]
+        rows.extend(extra)
+        self.rows_written += await database.executemany(UPSERT_QUEUE_SQL, rows)
+
+    async def build(self, user_ids: list[int]) -> None:
+        self.order = user_ids[:]
+        random.shuffle(self.order)
+        await self._rewrite()
+
+    async def advance(self) -> None:
+        done = [(self.event_id, self.current, 0, "done")] if self.current else []
+        self.current = self.order.pop(0) if self.order else None
+        if self.current:
+            done.append((self.event_id, self.current, 0, "singing"))
+        await self._rewrite(done)
+
+    async def skip(self, user_id: int) -> None:
+        self.order.remove(user_id)
+        self.order.append(user_id)
+        await self._rewrite()
+
+    async def remove(self, user_id: int) -> None:
+        self.order.remove(user_id)
+        await self._rewrite([(self.event_id, user_id, 0, "removed")])
+
+    async def reinsert(self, user_id: int) -> None:
+        self.order.append(user_id)
+        await self._rewrite()
+
+
+async def _run(q, singers: list[int], ops: int, seed: int) -> dict:
+    rnd = random.Random(seed)
+    await q.build(singers)
+    q.rows_written = 0
+    removed: list[int] = []
+
+    t0 = time.perf_counter()
+    for i in range(ops):
+        waiting = q.peek(len(q)) if isinstance(q, KaraokeQueue) else q.order
+        op = i % 4
+        if op == 0 and waiting:
+            await q.skip(rnd.choice(waiting))
+        elif op == 1 and waiting:
+            uid = rnd.choice(waiting)
+            await q.remove(uid)
+            removed.append(uid)
+        elif op == 2 and removed:
+            await q.reinsert(removed.pop())
+        else:
+            await q.advance()
+    elapsed = time.perf_counter() - t0
+    return {"ms_per_op": elapsed / ops * 1000, "rows_per_op": q.rows_written / ops}
+
+
+def _order_from_db(conn: sqlite3.Connection, event_id: int) -> list[int]:
+    rows = conn.execute(
+        "SELECT user_id FROM event_queue WHERE event_id = ? AND queue_status = 'waiting' ORDER BY queue_position",
+        (event_id,),
+    ).fetchall()
+    return [r["user_id"] for r in rows]
+
+
+async def main(singers: int, ops: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "bench.db")
+        database.init_db()
+        await database.open_pool()
+        try:
+            users = list(range(10_000, 10_000 + singers))
+            old = await _run(ListQueue(1), users, ops, seed=3)
+            new = await _run(KaraokeQueue(2), users, ops, seed=3)
+
+            # a fila em memória bate com o que está no banco
+            q = await KaraokeQueue.load(2)
+            assert q.peek(singers) == (await database.run(_order_from_db, 2))
+        finally:
+            await database.close_pool()
+
+    print(f"fila com {singers} cantores, {ops} operações (pular/remover/reinserir/avançar)")
+    print(f"lista (antes):   {old['ms_per_op']:7.2f} ms/op  {old['rows_per_op']:7.1f} linhas/op")
+    print(f"engine (depois): {new['ms_per_op']:7.2f} ms/op  {new['rows_per_op']:7.1f} linhas/op")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--singers", type=int, default=500)
+    parser.add_argument("--ops", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(main(args.singers, args.ops))
@@ -0,0 +1,103 @@
+"""
+Benchmark do /status com uma guild sintética (padrão: 200k membros, 60 cargos).
+
+- scan:     caminho antigo (2 passadas em guild.members + role.members por cargo)
+- counters: GuildCounters (build no ready; /status só lê e faz top-12)
+- update:   custo por evento de join/leave/update de cargo
+- check:    autochecagem (recalcula e compara)
+
+Uso:
+    python -m benchmarks.bench_member_stats [--members 200000] [--roles 60]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.fake_discord import FakeGuild, FakeHTTP, FakeMember, FakeRole
+from utils.member_stats import GuildCounters, MemberStats
+
+
+def _guild(members: int, roles: int, seed: int = 7) -> FakeGuild:
+    rnd = random.Random(seed)
+    g = FakeGuild(FakeHTTP())
+    everyone = g.add_role(FakeRole(g.id, 0, "@everyone"))
+    pool = [g.add_role(FakeRole(1000 + i, i + 1, f"r{i}")) for i in range(roles)]
+    # distribuição enviesada: poucos cargos grandes, muitos pequenos
+    weights = [1 / (i + 1) for i in range(roles)]
+    for i in range(members):
+        k = rnd.randint(0, 4)
+        picked = set(rnd.choices(pool, weights=weights, k=k))
+        g.add_member(FakeMember(g._http, g, 10_000 + i, [everyone, *picked], bot=rnd.random() < 0.02))
+    return g
+
+
+def _old_status(g: FakeGuild) -> list:
+    members = g.members
+    humans = sum(1 for m in members if not m.bot)
+    bots = sum(1 for m in members if m.bot)
+    counts = []
+    for role in g.roles:
+        if role.is_default():
+            continue
+        # role.members do discord.py varre o cache de membros
+        count = sum(1 for m in members if role in m.roles)
+        if count > 0:
+            counts.append((count, role.id))
+    counts.sort(reverse=True)
+    return [humans, bots, counts[:12]]
+
+
+def _timed(fn, repeat: int = 1) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main(members: int, roles: int) -> None:
+    t0 = time.perf_counter()
+    g = _guild(members, roles)
+    print(f"guild sintética: {members} membros, {roles} cargos ({time.perf_counter() - t0:.1f}s para montar)")
+
+    old_ms = _timed(lambda: _old_status(g))
+
+    stats = MemberStats()
+    build_ms = _timed(lambda: stats.rebuild(g))
+    c = stats.get(g)
+    status_ms = _timed(lambda: (c.humans, c.bots, c.top_roles(12)), repeat=200)
+
+    # eventos: join / update de cargo / leave
+    rnd = random.Random(1)
+    role_pool = [r for r in g.roles if not r.is_default()]
+    n_events = 10_000
+    newcomers = [FakeMember(g._http, g, 900_000 + i, [g.get_role(g.id)]) for i in range(n_events)]
+    t1 = time.perf_counter()
+    for m in newcomers:
+        g.add_member(m)
+        c.add_member(m)
+        before = FakeMember(g._http, g, m.id, list(m.roles))
+        m.roles.append(rnd.choice(role_pool))
+        c.update_member(before, m)
+    for m in newcomers[: n_events // 2]:
+        del g._members[m.id]
+        c.remove_member(m)
+    event_us = (time.perf_counter() - t1) / (n_events * 2.5) * 1_000_000
+
+    check_ms = _timed(lambda: stats.check(g))
+    diffs = stats.check(g)
+
+    assert _old_status(g)[2] == [(cnt, rid) for cnt, rid in GuildCounters.build(g).top_roles(12)]
+
+    print(f"/status antigo (scan):       {old_ms:10.1f} ms por chamada")
+    print(f"counters build (ready):      {build_ms:10.1f} ms uma vez")
+    print(f"/status com counters:        {status_ms:10.3f} ms por chamada")
+    print(f"evento join/update/leave:    {event_us:10.2f} µs por evento")
+    print(f"autochecagem:                {check_ms:10.1f} ms ({len(diffs)} divergências)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=200_000)
+    parser.add_argument("--roles", type=int, default=60)
+    args = parser.parse_args()
+    main(args.members, args.roles)
@@ -0,0 +1,126 @@
+"""
+Benchmark do botão "Li e concordo" sob rajada de cliques.
+
+Compara, contra o FakeHTTP (rota de cargos com limite por janela):
+- inline: add_roles dentro do callback e resposta só depois (caminho antigo)
+- fila:   VerifyRulesView real -> defer + RoleGrantWorker
+
+Métricas: grants/s, latência clique->cargo (p50/p95/p99), latência do ack
+e quantos cliques estouraram os 3s da interaction.
+
+Uso:
+    python -m benchmarks.bench_role_grants [--clicks 500] [--limit 10] [--window 0.1]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.fake_discord import (
+    FakeClient,
+    FakeGuild,
+    FakeHTTP,
+    FakeInteraction,
+    FakeMember,
+    FakeRole,
+    RouteLimit,
+    latency_summary,
+)
+from utils.role_grants import RoleGrantWorker
+from views.verify import VerifyRulesView
+
+ROLE_ID = 100
+INTERACTION_TIMEOUT = 3.0
+
+
+def _setup(args) -> tuple[FakeHTTP, FakeGuild, FakeRole, list[FakeMember]]:
+    http = FakeHTTP({
+        "member_roles": RouteLimit(args.limit, args.window, args.latency),
+        "interaction_callback": RouteLimit(10_000, 1.0, args.latency),
+        "webhook": RouteLimit(10_000, 1.0, args.latency),
+    })
+    guild = FakeGuild(http)
+    everyone = guild.add_role(FakeRole(guild.id, 0, "@everyone"))
+    role = guild.add_role(FakeRole(ROLE_ID, 5, "verificado"))
+    bot_role = guild.add_role(FakeRole(101, 10, "bot"))
+    guild.me = guild.add_member(FakeMember(http, guild, 1, [everyone, bot_role], bot=True))
+    members = [guild.add_member(FakeMember(http, guild, 1000 + i, [everyone])) for i in range(args.clicks)]
+    return http, guild, role, members
+
+
+async def _inline_click(interaction: FakeInteraction, role: FakeRole) -> None:
+    await interaction.user.add_roles(role, reason="Aceitou as regras do servidor")
+    await interaction.response.send_message("✅ Verificação concluída.", ephemeral=True)
+
+
+def _report(name: str, http: FakeHTTP, interactions: list[FakeInteraction], elapsed: float) -> dict:
+    granted = [i for i in interactions if i.user.role_added_at is not None]
+    role_lat = [i.user.role_added_at - i.created_at for i in granted]
+    ack_lat = [i.acked_at - i.created_at for i in interactions if i.acked_at is not None]
+    return {
+        "mode": name,
+        "clicks": len(interactions),
+        "granted": len(granted),
+        "grants_per_sec": round(len(granted) / elapsed, 1) if elapsed else 0.0,
+        "click_to_role": latency_summary(role_lat),
+        "click_to_ack": latency_summary(ack_lat),
+        "ack_over_3s": sum(1 for v in ack_lat if v > INTERACTION_TIMEOUT),
+        "http": http.totals(),
+    }
+
+
+async def run_inline(args) -> dict:
+    http, guild, role, members = _setup(args)
+    client = FakeClient()
+    interactions = [FakeInteraction(http, guild, m, client) for m in members]
+    t0 = time.monotonic()
+    await asyncio.gather(*(_inline_click(i, role) for i in interactions))
+    return _report("inline", http, interactions, time.monotonic() - t0)
+
+
+async def run_queued(args) -> dict:
+    http, guild, role, members = _setup(args)
+    # 90% do limite da rota: folga para jitter de latência
+    worker = RoleGrantWorker(rate=0.9 * args.limit / args.window, burst=1)
+    client = FakeClient(extras={"role_grants": worker})
+    view = VerifyRulesView(ROLE_ID)
+
+    # metade dos membros clica duas vezes (dedupe)
+    interactions = [FakeInteraction(http, guild, m, client) for m in members]
+    doubles = [FakeInteraction(http, guild, m, client) for m in members[::2]]
+
+    worker.start()
+    t0 = time.monotonic()
+    await asyncio.gather(*(view.accept_rules.callback(i) for i in interactions + doubles))
+    while worker.pending:
+        await asyncio.sleep(0.01)
+    elapsed = time.monotonic() - t0
+    await worker.stop()
+
+    report = _report("queued", http, interactions, elapsed)
+    report["worker"] = worker.stats()
+    return report
+
+
+async def main(args) -> None:
+    results = [await run_inline(args), await run_queued(args)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(
+            f"{r['mode']:<7} grants/s={r['grants_per_sec']:<7} "
+            f"role p50={r['click_to_role']['p50_ms']}ms p99={r['click_to_role']['p99_ms']}ms | "
+            f"ack p99={r['click_to_ack']['p99_ms']}ms over3s={r['ack_over_3s']} | "
+            f"http calls={r['http']['calls']} 429s={r['http']['rate_limited']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clicks", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10, help="requests por janela na rota de cargos")
+    parser.add_argument("--window", type=float, default=0.1, help="janela do bucket em segundos")
+    parser.add_argument("--latency", type=float, default=0.03, help="latência simulada por request")
+    parser.add_argument("--json", action="store_true")
+    asyncio.run(main(parser.parse_args()))
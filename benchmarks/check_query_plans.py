@@ -0,0 +1,40 @@
+"""
+Checagem de plano das queries quentes.
+
+Cria um banco temporário, aplica as migrações e roda EXPLAIN QUERY PLAN em
+cada query registrada via database.register_hot_query. Sai com código 1 se
+alguma query deixou de usar o índice esperado.
+
+Uso:
+    python -m benchmarks.check_query_plans
+"""
+import os
+import sys
+import tempfile
+
+from utils import database
+import utils.event_service  # noqa: F401  (registra as queries quentes)
+import utils.karaoke_queue  # noqa: F401
+import utils.dm_fanout  # noqa: F401
+import utils.jobs  # noqa: F401
+import utils.dm_dispatcher  # noqa: F401
+import utils.templates  # noqa: F401
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "plans.db")
+        database.init_db()
+        with database.get_conn() as conn:
+            failures = database.check_query_plans(conn)
+
+    for name in sorted(database.HOT_QUERIES):
+        status = "FAIL" if any(f.startswith(f"{name}:") for f in failures) else "ok"
+        print(f"{status:<4} {name}")
+    for f in failures:
+        print(f, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
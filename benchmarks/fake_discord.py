@@ -0,0 +1,425 @@
+"""
+Stand-in local do Discord para benchmarks (sem rede, sem token).
+
+- FakeHTTP: rotas com limite por janela + latência; responde 429 com
+  retry_after quando o bucket esgota e o cliente repete, como o discord.py.
+- Objetos mínimos (guild, role, member, interaction) com a mesma forma
+  que as views/cogs usam.
+"""
+import asyncio
+import datetime
+import time
+from dataclasses import dataclass, field
+
+import discord
+
+
+@dataclass
+class RouteLimit:
+    limit: int
+    window: float
+    latency: float = 0.05
+
+
+class FakeRoute:
+    def __init__(self, key: str, cfg: RouteLimit) -> None:
+        self.key = key
+        self.cfg = cfg
+        self.remaining = cfg.limit
+        self.reset_at = 0.0
+        self.calls = 0
+        self.ok = 0
+        self.rate_limited = 0
+
+    async def hit(self) -> float | None:
+        """Uma requisição. None = 2xx; float = 429 com retry_after."""
+        self.calls += 1
+        await asyncio.sleep(self.cfg.latency)
+        now = time.monotonic()
+        if now >= self.reset_at:
+            self.remaining = self.cfg.limit
+            self.reset_at = now + self.cfg.window
+        if self.remaining > 0:
+            self.remaining -= 1
+            self.ok += 1
+            return None
+        self.rate_limited += 1
+        return self.reset_at - now
+
+
+class FakeHTTP:
+    DEFAULT = RouteLimit(limit=50, window=1.0, latency=0.05)
+
+    def __init__(self, limits: dict[str, RouteLimit] | None = None) -> None:
+        self.limits = limits or {}
+        self.routes: dict[str, FakeRoute] = {}
+
+    def route(self, kind: str, major: object) -> FakeRoute:
+        key = f"{kind}:{major}"
+        r = self.routes.get(key)
+        if r is None:
+            r = self.routes[key] = FakeRoute(key, self.limits.get(kind, self.DEFAULT))
+        return r
+
+    async def request(self, kind: str, major: object) -> None:
+        route = self.route(kind, major)
+        while True:
+            retry_after = await route.hit()
+            if retry_after is None:
+                return
+            await asyncio.sleep(retry_after)
+
+    def totals(self) -> dict[str, int]:
+        out = {"calls": 0, "ok": 0, "rate_limited": 0}
+        for r in self.routes.values():
+            out["calls"] += r.calls
+            out["ok"] += r.ok
+            out["rate_limited"] += r.rate_limited
+        return out
+
+
+class FakeRole:
+    def __init__(self, role_id: int, position: int, name: str = "role") -> None:
+        self.id = role_id
+        self.position = position
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+    def is_default(self) -> bool:
+        return self.position == 0
+
+    def __ge__(self, other: "FakeRole") -> bool:
+        return self.position >= other.position
+
+    def __gt__(self, other: "FakeRole") -> bool:
+        return self.position > other.position
+
+
+class FakeMember:
+    def __init__(self, http: FakeHTTP, guild: "FakeGuild", member_id: int, roles=None, bot: bool = False) -> None:
+        self._http = http
+        self.guild = guild
+        self.id = member_id
+        self.bot = bot
+        self.roles: list[FakeRole] = list(roles or [])
+        self.mention = f"<@{member_id}>"
+        self.display_name = f"user{member_id}"
+        self.name = self.display_name
+        self.role_added_at: float | None = None
+        self.dms: list = []
+        self.dm_closed = False
+
+    def __str__(self) -> str:
+        return self.name
+
+    @property
+    def top_role(self) -> FakeRole:
+        return max(self.roles, key=lambda r: r.position)
+
+    def get_role(self, role_id: int) -> FakeRole | None:
+        return next((r for r in self.roles if r.id == role_id), None)
+
+    async def add_roles(self, *roles: FakeRole, reason: str | None = None) -> None:
+        await self._http.request("member_roles", self.guild.id)
+        for r in roles:
+            if r not in self.roles:
+                self.roles.append(r)
+        self.role_added_at = time.monotonic()
+
+    async def send(self, content: str | None = None, **kwargs) -> None:
+        await self._http.request("dm", self.id)
+        if self.dm_closed:
+            raise discord.Forbidden(_FakeResponse(403), "Cannot send messages to this user")
+        self.dms.append(content or kwargs.get("embed"))
+
+
+class FakeGuild:
+    def __init__(self, http: FakeHTTP, guild_id: int = 1) -> None:
+        self._http = http
+        self.id = guild_id
+        self.name = f"guild{guild_id}"
+        self.icon = None
+        self.shard_id = 0
+        self._roles: dict[int, FakeRole] = {}
+        self._members: dict[int, FakeMember] = {}
+        self._channels: dict[int, "FakeTextChannel"] = {}
+        self.me: FakeMember | None = None
+        self.created_at = discord.utils.utcnow() - datetime.timedelta(days=365)
+
+    @property
+    def member_count(self) -> int:
+        return len(self._members)
+
+    def add_channel(self, channel: "FakeTextChannel") -> "FakeTextChannel":
+        self._channels[channel.id] = channel
+        return channel
+
+    def get_channel(self, channel_id: int) -> "FakeTextChannel | None":
+        return self._channels.get(channel_id)
+
+    @property
+    def text_channels(self) -> list["FakeTextChannel"]:
+        return list(self._channels.values())
+
+    def add_role(self, role: FakeRole) -> FakeRole:
+        self._roles[role.id] = role
+        return role
+
+    def add_member(self, member: FakeMember) -> FakeMember:
+        self._members[member.id] = member
+        return member
+
+    def get_role(self, role_id: int) -> FakeRole | None:
+        return self._roles.get(role_id)
+
+    def get_member(self, member_id: int) -> FakeMember | None:
+        return self._members.get(member_id)
+
+    async def fetch_member(self, member_id: int) -> FakeMember:
+        await self._http.request("get_member", self.id)
+        return self._members[member_id]
+
+    @property
+    def roles(self) -> list[FakeRole]:
+        return sorted(self._roles.values(), key=lambda r: r.position)
+
+    @property
+    def members(self) -> list[FakeMember]:
+        return list(self._members.values())
+
+
+class FakeMessage:
+    def __init__(self, channel: "FakeTextChannel", message_id: int, created_at: datetime.datetime, *, author=None, content: str = "", pinned: bool = False) -> None:
+        self.channel = channel
+        self.id = message_id
+        self.created_at = created_at
+        self.author = author
+        self.content = content
+        self.pinned = pinned
+        self.embeds: list = []
+
+    async def delete(self, *, delay: float | None = None) -> None:
+        await self.channel._http.request("delete_message", self.channel.id)
+        self.channel._remove([self])
+
+    async def fetch(self) -> "FakeMessage":
+        return await self.channel.fetch_message(self.id)
+
+    async def edit(self, **kwargs) -> "FakeMessage":
+        await self.channel._http.request("edit_message", self.channel.id)
+        if "content" in kwargs:
+            self.content = kwargs["content"]
+        if "embed" in kwargs:
+            self.embeds = [kwargs["embed"]]
+        if "embeds" in kwargs:
+            self.embeds = list(kwargs["embeds"])
+        return self
+
+
+def _snowflake(value) -> int | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return discord.utils.time_snowflake(value)
+    return value.id
+
+
+class FakeTextChannel(discord.TextChannel):
+    """Passa no isinstance(…, discord.TextChannel) dos cogs; o resto é local."""
+
+    def __init__(self, http: FakeHTTP, guild: FakeGuild, channel_id: int, name: str = "geral") -> None:
+        self._http = http
+        self.guild = guild
+        self.id = channel_id
+        self.name = name
+        self.position = 0
+        self.messages: list[FakeMessage] = []  # mais antiga primeiro
+        self._index: dict[int, FakeMessage] = {}
+        self.sent: list[FakeMessage] = []
+
+    def seed(self, count: int, *, age: datetime.timedelta, spread: datetime.timedelta, authors=(), pinned_every: int = 0) -> None:
+        """Cria `count` mensagens entre (agora - age - spread) e (agora - age)."""
+        now = discord.utils.utcnow()
+        start = now - age - spread
+        step = spread / max(1, count)
+        for i in range(count):
+            ts = start + step * i
+            mid = discord.utils.time_snowflake(ts) + i % 4096
+            author = authors[i % len(authors)] if authors else None
+            msg = FakeMessage(self, mid, ts, author=author, pinned=bool(pinned_every and i % pinned_every == 0))
+            self.messages.append(msg)
+            self._index[mid] = msg
+
+    def _remove(self, msgs) -> None:
+        ids = {m.id for m in msgs}
+        self.messages = [m for m in self.messages if m.id not in ids]
+        for mid in ids:
+            self._index.pop(mid, None)
+
+    async def send(self, content: str | None = None, **kwargs) -> FakeMessage:
+        await self._http.request("send_message", self.id)
+        now = discord.utils.utcnow()
+        msg = FakeMessage(self, discord.utils.time_snowflake(now) + len(self.messages) % 4096, now, content=content or "")
+        if "embed" in kwargs and kwargs["embed"] is not None:
+            msg.embeds = [kwargs["embed"]]
+        if "embeds" in kwargs:
+            msg.embeds = list(kwargs["embeds"])
+        self.messages.append(msg)
+        self._index[msg.id] = msg
+        self.sent.append(msg)
+        return msg
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self._http.request("get_message", self.id)
+        msg = self._index.get(message_id)
+        if msg is None:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Message")
+        return msg
+
+    def permissions_for(self, obj) -> discord.Permissions:
+        return discord.Permissions.all()
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        return self._index.get(message_id) or FakeMessage(self, message_id, discord.utils.snowflake_time(message_id))
+
+    async def history(self, *, limit: int | None = 100, before=None, after=None, around=None, oldest_first: bool | None = None):
+        before_id = _snowflake(before)
+        after_id = _snowflake(after)
+        if oldest_first is None:
+            oldest_first = after is not None
+        pool = [m for m in self.messages if (before_id is None or m.id < before_id) and (after_id is None or m.id > after_id)]
+        if not oldest_first:
+            pool.reverse()
+        remaining = limit if limit is not None else len(pool)
+        for i in range(0, min(len(pool), remaining), 100):
+            # uma página = uma request
+            await self._http.request("get_messages", self.id)
+            for m in pool[i:min(i + 100, remaining)]:
+                yield m
+
+    async def delete_messages(self, messages, *, reason: str | None = None) -> None:
+        messages = list(messages)
+        if not messages:
+            return
+        if len(messages) == 1:
+            await messages[0].delete()
+            return
+        if len(messages) > 100:
+            raise discord.HTTPException(_FakeResponse(400), "bulk delete > 100")
+        await self._http.request("bulk_delete", self.id)
+        self._remove(messages)
+
+    async def purge(self, *, limit: int | None = 100, check=None, before=None, after=None, around=None, oldest_first=None, bulk: bool = True, reason: str | None = None):
+        # mesma estratégia do discord.py: lotes de 100 (<14 dias) + delete individual
+        cutoff = discord.utils.time_snowflake(discord.utils.utcnow() - datetime.timedelta(days=14))
+        deleted: list[FakeMessage] = []
+        batch: list[FakeMessage] = []
+        async for msg in self.history(limit=limit, before=before, after=after, oldest_first=oldest_first):
+            if check is not None and not check(msg):
+                continue
+            if bulk and msg.id >= cutoff:
+                batch.append(msg)
+                if len(batch) == 100:
+                    await self.delete_messages(batch)
+                    deleted.extend(batch)
+                    batch = []
+            else:
+                await msg.delete()
+                deleted.append(msg)
+        if batch:
+            await self.delete_messages(batch)
+            deleted.extend(batch)
+        return deleted
+
+
+class _FakeResponse:
+    def __init__(self, status: int) -> None:
+        self.status = status
+        self.reason = "fake"
+
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction") -> None:
+        self._i = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _ack(self) -> None:
+        if self._done:
+            raise RuntimeError("interaction já respondida")
+        await self._i._http.request("interaction_callback", self._i.id)
+        self._done = True
+        self._i.acked_at = time.monotonic()
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        await self._ack()
+
+    async def send_message(self, content: str | None = None, **kwargs) -> None:
+        await self._ack()
+        self._i.messages.append(content)
+        self._i.completed_at = time.monotonic()
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction") -> None:
+        self._i = interaction
+
+    async def send(self, content: str | None = None, **kwargs) -> None:
+        await self._i._http.request("webhook", self._i.id)
+        self._i.messages.append(content)
+        self._i.completed_at = time.monotonic()
+
+
+@dataclass
+class FakeClient:
+    user: object = None
+    extras: dict = field(default_factory=dict)
+
+    def __getattr__(self, name: str):
+        try:
+            return self.extras[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class FakeInteraction:
+    _next_id = 1
+
+    def __init__(self, http: FakeHTTP, guild: FakeGuild, user: FakeMember, client, channel_id: int = 0) -> None:
+        self._http = http
+        self.id = FakeInteraction._next_id
+        FakeInteraction._next_id += 1
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.user = user
+        self.client = client
+        self.extras: dict = {}
+        self.channel_id = channel_id
+        self.channel = guild.get_channel(channel_id) if guild else None
+        self.message = None
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.messages: list[str | None] = []
+        self.created_at = time.monotonic()
+        self.acked_at: float | None = None
+        self.completed_at: float | None = None
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    data = sorted(values)
+    idx = min(len(data) - 1, max(0, int(round(p / 100 * len(data))) - 1))
+    return data[idx]
+
+
+def latency_summary(values: list[float]) -> dict[str, float]:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 1),
+        "p95_ms": round(percentile(values, 95) * 1000, 1),
+        "p99_ms": round(percentile(values, 99) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1) if values else 0.0,
+    }
@@ -0,0 +1,457 @@
+"""
+Load test offline do DukiBot.
+
+Sobe o DukiBot real (setup_hook: banco, workers e todos os cogs/views) sem
+login e roda cenários contra o stand-in local de gateway/REST
+(benchmarks.fake_discord), com limite por rota e latência modelados.
+
+Cenários:
+- join_wave:      N entradas (listeners de welcome + admin), DMs e log
+- verify_clicks:  N cliques simultâneos no "Li e concordo"
+- karaoke_signup: rajada de cliques em "Vou cantar"/"Só assistir"
+- mass_purge:     /clean em canais cheios (inclui mensagens >14 dias)
+- raid_sweep:     /clean_user de 3 contas em todos os canais (vs. purge
+                  sequencial canal a canal)
+- announce_dm:    /anuncio com DM para um cargo inteiro, com restart do
+                  scheduler no meio (retomada sem DM repetida)
+
+Saída: JSON (throughput, p50/p95/p99, chamadas REST e 429s por cenário),
+estável para diff entre commits.
+
+Uso:
+    python -m benchmarks.loadtest [--scale 50] [--out resultado.json] [--only join_wave,...]
+
+`--scale` acelera o relógio das rotas (janela / scale) e os rates do bot
+na mesma proporção, para os cenários caberem em segundos.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ADMIN_CHANNEL_ID = 10
+LOG_CHANNEL_ID = 11
+ANNOUNCE_CHANNEL_ID = 12
+RULES_ROLE_ID = 100
+GUILD_ID = 1
+
+# limites por rota (janela em segundos reais) — perto do que o Discord devolve
+ROUTES = {
+    "member_roles": (10, 1.0),
+    "dm": (5, 1.0),
+    "send_message": (5, 5.0),
+    "edit_message": (5, 5.0),
+    "delete_message": (5, 1.0),
+    "bulk_delete": (1, 1.0),
+    "get_messages": (5, 1.0),
+    "get_message": (5, 1.0),
+    "interaction_callback": (10_000, 1.0),
+    "webhook": (5, 2.0),
+}
+
+
+def _configure_env(scale: float) -> None:
+    # config.Settings lê o ambiente no import; precisa vir antes de importar o bot
+    os.environ.setdefault("DISCORD_TOKEN", "offline")
+    os.environ["ADMIN_CHANNEL_ID"] = str(ADMIN_CHANNEL_ID)
+    os.environ["LOG_CHANNEL_ID"] = str(LOG_CHANNEL_ID)
+    os.environ["ANNOUNCE_CHANNEL_ID"] = str(ANNOUNCE_CHANNEL_ID)
+    os.environ["RULES_ROLE_ID"] = str(RULES_ROLE_ID)
+    os.environ.setdefault("DM_WELCOME_TEXT", "Olá {member}, bem-vindo(a)!")
+    os.environ["ROLE_GRANT_RATE"] = str(5 * scale)
+    os.environ["DM_RATE"] = str(2 * scale)
+    os.environ["ANNOUNCE_DM_RATE"] = str(2 * scale)
+    os.environ["CHAMADA_EDIT_INTERVAL"] = str(3 / scale)
+    os.environ["CLEAN_OLD_RATE"] = str(1 * scale)
+    os.environ["JOB_PROGRESS_INTERVAL"] = str(5 / scale)
+    os.environ["JOB_RETRY_BASE"] = str(30 / scale)
+
+
+def _http(scale: float, latency: float):
+    from benchmarks.fake_discord import FakeHTTP, RouteLimit
+
+    return FakeHTTP({k: RouteLimit(limit, window / scale, latency) for k, (limit, window) in ROUTES.items()})
+
+
+def _guild(http, members: int = 0):
+    from benchmarks.fake_discord import FakeGuild, FakeMember, FakeRole, FakeTextChannel
+
+    g = FakeGuild(http, GUILD_ID)
+    everyone = g.add_role(FakeRole(g.id, 0, "@everyone"))
+    g.add_role(FakeRole(RULES_ROLE_ID, 5, "verificado"))
+    bot_role = g.add_role(FakeRole(101, 10, "bot"))
+    g.me = g.add_member(FakeMember(http, g, 1, [everyone, bot_role], bot=True))
+    g.add_channel(FakeTextChannel(http, g, ADMIN_CHANNEL_ID, "admin"))
+    g.add_channel(FakeTextChannel(http, g, LOG_CHANNEL_ID, "log"))
+    for i in range(members):
+        g.add_member(FakeMember(http, g, 10_000 + i, [everyone]))
+    return g
+
+
+async def _wait_until(pred, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred():
+            return True
+        await asyncio.sleep(0.01)
+    return pred()
+
+
+# -------------------------
+# cenários
+# -------------------------
+async def scenario_join_wave(bot, args) -> dict:
+    from benchmarks.fake_discord import FakeMember, latency_summary
+
+    http = _http(args.scale, args.latency)
+    g = _guild(http)
+    everyone = g.get_role(g.id)
+    welcome = bot.get_cog("WelcomeCog")
+    admin = bot.get_cog("AdminCog")
+    admin.member_stats.rebuild(g)
+
+    lat: list[float] = []
+    t0 = time.monotonic()
+    joined = []
+    for i in range(args.joins):
+        m = g.add_member(FakeMember(http, g, 500_000 + i, [everyone]))
+        joined.append(m)
+        s = time.perf_counter()
+        await welcome.on_member_join(m)
+        await admin.on_member_join(m)
+        lat.append(time.perf_counter() - s)
+    listener_s = time.monotonic() - t0
+
+    # janela fixa de drenagem das DMs (o total de 5k leva minutos no rate real)
+    await _wait_until(lambda: all(m.dms for m in joined), args.drain)
+    elapsed = time.monotonic() - t0
+    dms = sum(1 for m in joined if m.dms)
+    await bot.log_digest.flush()
+
+    return {
+        "joins": args.joins,
+        "listener_latency": latency_summary(lat),
+        "listener_throughput_per_sec": round(args.joins / listener_s, 1) if listener_s else 0.0,
+        "dms_sent": dms,
+        "dm_throughput_per_sec": round(dms / elapsed, 1) if elapsed else 0.0,
+        "log_digest": bot.log_digest.stats(),
+        "status_consistent": not admin.member_stats.check(g),
+        "http": http.totals(),
+    }
+
+
+async def scenario_verify_clicks(bot, args) -> dict:
+    from benchmarks.fake_discord import FakeInteraction, latency_summary
+    from views.verify import VerifyRulesView
+
+    http = _http(args.scale, args.latency)
+    g = _guild(http, members=args.clicks)
+    view = VerifyRulesView(RULES_ROLE_ID)
+    members = [m for m in g.members if not m.bot]
+    interactions = [FakeInteraction(http, g, m, bot, channel_id=ADMIN_CHANNEL_ID) for m in members]
+
+    t0 = time.monotonic()
+    await asyncio.gather(*(view.accept_rules.callback(i) for i in interactions))
+    await _wait_until(lambda: all(m.role_added_at for m in members), args.drain)
+    elapsed = time.monotonic() - t0
+
+    granted = [i for i in interactions if i.user.role_added_at]
+    return {
+        "clicks": args.clicks,
+        "granted": len(granted),
+        "grants_per_sec": round(len(granted) / elapsed, 1) if elapsed else 0.0,
+        "click_to_ack": latency_summary([i.acked_at - i.created_at for i in interactions if i.acked_at]),
+        "click_to_role": latency_summary([i.user.role_added_at - i.created_at for i in granted]),
+        "http": http.totals(),
+    }
+
+
+async def scenario_karaoke_signup(bot, args) -> dict:
+    import discord
+
+    from benchmarks.fake_discord import FakeClient, FakeInteraction, latency_summary
+    from utils import database, event_service
+    from views.karaoke_signup import KaraokeSignupView
+
+    http = _http(args.scale, args.latency)
+    g = _guild(http, members=args.signups)
+    # o que o /evento karaoke chamada faz: evento, cache quente, mensagem acompanhada
+    event_id = await event_service.create_event(g.id, "Load test", g.me.id)
+    await event_service.get_open_karaoke_event(g.id)
+    view = KaraokeSignupView(event_id)
+    chamada = await g.get_channel(ADMIN_CHANNEL_ID).send(embed=discord.Embed(title="🎤 Load test"), view=view)
+    bot.signup_board.client = FakeClient(extras={"get_partial_messageable": g.get_channel})
+    await bot.signup_board.track(event_id, chamada)
+    members = [m for m in g.members if not m.bot]
+
+    clicks = []
+    for idx, m in enumerate(members):
+        button = view.singer_button if idx % 3 else view.spectator_button
+        clicks.append((button, FakeInteraction(http, g, m, bot, channel_id=ADMIN_CHANNEL_ID)))
+        if idx % 4 == 0:  # clique duplo
+            clicks.append((button, FakeInteraction(http, g, m, bot, channel_id=ADMIN_CHANNEL_ID)))
+        if idx % 7 == 0:  # trocou de ideia
+            other = view.spectator_button if button is view.singer_button else view.singer_button
+            clicks.append((other, FakeInteraction(http, g, m, bot, channel_id=ADMIN_CHANNEL_ID)))
+
+    t0 = time.monotonic()
+    await asyncio.gather(*(b.callback(i) for b, i in clicks))
+    elapsed = time.monotonic() - t0
+    await bot.signups.flush()
+    row = await database.fetchone("SELECT COUNT(*) AS n FROM event_signups WHERE event_id = ?", (event_id,))
+    await bot.signup_board.finish(event_id)
+    singers, spectators = bot.signups.counts(event_id)
+    shown = chamada.embeds[0].fields[0].value
+
+    return {
+        "clicks": len(clicks),
+        "clicks_per_sec": round(len(clicks) / elapsed, 1) if elapsed else 0.0,
+        "click_to_ack": latency_summary([i.acked_at - i.created_at for _, i in clicks if i.acked_at]),
+        "signups_stored": row["n"],
+        "signup_writer": bot.signups.stats(),
+        "signup_board": bot.signup_board.stats(),
+        "board_consistent": shown == f"🎤 Cantores: **{singers}**\n👀 Espectadores: **{spectators}**",
+        "http": http.totals(),
+    }
+
+
+async def scenario_mass_purge(bot, args) -> dict:
+    import datetime
+
+    from benchmarks.fake_discord import FakeInteraction, FakeTextChannel, latency_summary
+
+    http = _http(args.scale, args.latency)
+    g = _guild(http, members=10)
+    cleanup = bot.get_cog("CleanupCog")
+    admin_user = g.me
+
+    channels = []
+    for c in range(args.purge_channels):
+        ch = g.add_channel(FakeTextChannel(http, g, 1000 + c, f"canal{c}"))
+        # 80% recentes, 20% com mais de 14 dias
+        ch.seed(args.purge_messages // 5, age=datetime.timedelta(days=20), spread=datetime.timedelta(days=5))
+        ch.seed(args.purge_messages - args.purge_messages // 5, age=datetime.timedelta(hours=1), spread=datetime.timedelta(days=3), pinned_every=97)
+        channels.append(ch)
+    before = sum(len(ch.messages) for ch in channels)
+
+    # sem gateway o bot não tem cache de canais; o progresso vai para o canal admin fake
+    bot.get_channel = g.get_channel
+    lat: list[float] = []
+
+    async def one(ch) -> None:
+        i = FakeInteraction(http, g, admin_user, bot, channel_id=ADMIN_CHANNEL_ID)
+        s = time.monotonic()
+        await cleanup.clean.callback(cleanup, i, ch, 0, False)
+        lat.append(time.monotonic() - s)
+
+    t0 = time.monotonic()
+    await asyncio.gather(*(one(ch) for ch in channels))
+    jobs = await bot.jobs.recent(GUILD_ID, len(channels))
+    await _wait_until(lambda: all(j.finished for j in jobs), args.drain * 6)
+    await asyncio.sleep(0.1)  # última edição do progresso
+    elapsed = time.monotonic() - t0
+    deleted = before - sum(len(ch.messages) for ch in channels)
+    del bot.get_channel
+
+    return {
+        "channels": len(channels),
+        "messages_before": before,
+        "deleted": deleted,
+        "deleted_bulk": sum(j.progress.get("deleted_bulk", 0) for j in jobs),
+        "deleted_old": sum(j.progress.get("deleted_old", 0) for j in jobs),
+        "deleted_per_sec": round(deleted / elapsed, 1) if elapsed else 0.0,
+        "command_latency": latency_summary(lat),
+        "jobs_done": sum(1 for j in jobs if j.status == "done"),
+        "progress_posts": len(g.get_channel(ADMIN_CHANNEL_ID).sent),
+        "http": http.totals(),
+    }
+
+
+async def scenario_raid_sweep(bot, args) -> dict:
+    import datetime
+
+    from benchmarks.fake_discord import FakeInteraction, FakeMember, FakeTextChannel
+
+    def build():
+        http = _http(args.scale, args.latency)
+        g = _guild(http, members=20)
+        regulars = [m for m in g.members if not m.bot]
+        raiders = [g.add_member(FakeMember(http, g, 900_000_000_000_000_000 + i, [])) for i in range(3)]
+        for c in range(args.sweep_channels):
+            ch = g.add_channel(FakeTextChannel(http, g, 2000 + c, f"canal{c}"))
+            ch.seed(args.sweep_messages, age=datetime.timedelta(hours=1), spread=datetime.timedelta(days=3), authors=regulars)
+            ch.seed(args.sweep_messages // 50, age=datetime.timedelta(minutes=5), spread=datetime.timedelta(hours=1), authors=raiders)
+        return http, g, raiders
+
+    def raid_left(g, raiders) -> int:
+        ids = {r.id for r in raiders}
+        return sum(1 for ch in g.text_channels for m in ch.messages if m.author is not None and m.author.id in ids)
+
+    # antes: purge sequencial canal a canal, lendo o histórico inteiro
+    http, g, raiders = build()
+    raid_before = raid_left(g, raiders)
+    ids = {r.id for r in raiders}
+    t0 = time.monotonic()
+    for ch in g.text_channels:
+        if ch.id in (ADMIN_CHANNEL_ID, LOG_CHANNEL_ID):
+            continue
+        await ch.purge(limit=None, check=lambda m: m.author is not None and m.author.id in ids)
+    sequential_s = time.monotonic() - t0
+    sequential_calls = http.totals()["calls"]
+
+    # depois: /clean_user
+    http, g, raiders = build()
+    cleanup = bot.get_cog("CleanupCog")
+    bot.get_channel = g.get_channel
+    i = FakeInteraction(http, g, g.me, bot, channel_id=ADMIN_CHANNEL_ID)
+    mentions = " ".join(r.mention for r in raiders)
+    t0 = time.monotonic()
+    await cleanup.clean_user.callback(cleanup, i, mentions, 2)
+    job = (await bot.jobs.recent(GUILD_ID, 1))[0]
+    await _wait_until(lambda: job.finished, args.drain * 6)
+    sweep_s = time.monotonic() - t0
+    await asyncio.sleep(0.1)
+    del bot.get_channel
+
+    return {
+        "channels": len(g.text_channels),
+        "raid_messages": raid_before,
+        "raid_left": raid_left(g, raiders),
+        "sequential_s": round(sequential_s, 2),
+        "sequential_http_calls": sequential_calls,
+        "sweep_s": round(sweep_s, 2),
+        "sweep_deleted": sum(c["deleted_bulk"] + c["deleted_old"] for c in job.progress["channels"].values()),
+        "http": http.totals(),
+    }
+
+
+async def scenario_announce_dm(bot, args) -> dict:
+    from benchmarks.fake_discord import FakeInteraction, FakeMember, FakeRole, FakeTextChannel
+    from utils import database
+
+    http = _http(args.scale, args.latency)
+    g = _guild(http)
+    g.add_channel(FakeTextChannel(http, g, ANNOUNCE_CHANNEL_ID, "avisos"))
+    everyone = g.get_role(g.id)
+    role = g.add_role(FakeRole(200, 3, "avisos"))
+    targets = []
+    for i in range(args.dm_members):
+        m = g.add_member(FakeMember(http, g, 700_000 + i, [everyone, role], bot=i % 100 == 99))
+        m.dm_closed = i % 20 == 7
+        if not m.bot:
+            targets.append(m)
+
+    bot.get_channel = g.get_channel
+    bot.get_guild = lambda _gid: g
+    messages = bot.get_cog("MessagesCog")
+    i = FakeInteraction(http, g, g.me, bot, channel_id=ADMIN_CHANNEL_ID)
+
+    t0 = time.monotonic()
+    await messages.anuncio.callback(messages, i, "Aviso", "Texto do aviso.", False, role)
+    ack_s = time.monotonic() - t0
+    job = next(j for j in await bot.jobs.recent(GUILD_ID, 2) if j.job_type == "announce_dm")
+
+    def done(j) -> int:
+        return sum(j.progress.get(k, 0) for k in ("sent", "failed", "blocked"))
+
+    # "restart" no meio: o job volta como pending e retoma do banco
+    await _wait_until(lambda: done(job) >= len(targets) // 2, args.drain * 6)
+    await bot.jobs.stop()
+    interrupted_at = done(job)
+    await bot.jobs.start()
+    job = await bot.jobs.get(job.id)
+    await _wait_until(lambda: job.finished, args.drain * 6)
+    elapsed = time.monotonic() - t0
+    await asyncio.sleep(0.1)
+    rows = await database.fetchall("SELECT status FROM announcement_deliveries WHERE job_id = ?", (job.id,))
+    del bot.get_channel
+    del bot.get_guild
+
+    return {
+        "targets": len(targets),
+        "command_ack_ms": round(ack_s * 1000, 1),
+        "interrupted_at": interrupted_at,
+        "status": job.status,
+        "sent": job.progress.get("sent", 0),
+        "blocked": job.progress.get("blocked", 0),
+        "failed": job.progress.get("failed", 0),
+        "rows": len(rows),
+        "received": sum(1 for m in targets if m.dms),
+        "duplicates": sum(len(m.dms) - 1 for m in targets if len(m.dms) > 1),
+        "dm_per_sec": round(len(rows) / elapsed, 1) if elapsed else 0.0,
+        "http": http.totals(),
+    }
+
+
+SCENARIOS = {
+    "join_wave": scenario_join_wave,
+    "verify_clicks": scenario_verify_clicks,
+    "karaoke_signup": scenario_karaoke_signup,
+    "mass_purge": scenario_mass_purge,
+    "raid_sweep": scenario_raid_sweep,
+    "announce_dm": scenario_announce_dm,
+}
+
+
+async def run(args) -> dict:
+    from utils import database
+
+    logging.getLogger("duki_odyssey").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "loadtest.db")
+
+        from main import DukiBot
+
+        bot = DukiBot()
+        await bot.setup_hook()
+        # sem gateway não há READY; o scheduler sobe aqui
+        await bot.jobs.start()
+
+        results: dict = {"scale": args.scale, "latency_ms": args.latency * 1000, "scenarios": {}}
+        try:
+            for name in args.only:
+                t0 = time.monotonic()
+                r = await SCENARIOS[name](bot, args)
+                r["wall_s"] = round(time.monotonic() - t0, 2)
+                results["scenarios"][name] = r
+                print(f"[loadtest] {name}: {r['wall_s']}s", file=sys.stderr)
+        finally:
+            for ext in list(bot.extensions):
+                await bot.unload_extension(ext)
+            await bot.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=50.0, help="acelera janelas de rate limit e rates do bot")
+    parser.add_argument("--latency", type=float, default=0.04, help="latência por request (s)")
+    parser.add_argument("--joins", type=int, default=5000)
+    parser.add_argument("--clicks", type=int, default=1000)
+    parser.add_argument("--signups", type=int, default=1000)
+    parser.add_argument("--purge-channels", type=int, default=4)
+    parser.add_argument("--purge-messages", type=int, default=1500)
+    parser.add_argument("--sweep-channels", type=int, default=60)
+    parser.add_argument("--sweep-messages", type=int, default=1000)
+    parser.add_argument("--dm-members", type=int, default=1000)
+    parser.add_argument("--drain", type=float, default=10.0, help="tempo máx. esperando filas drenarem (s)")
+    parser.add_argument("--only", type=lambda s: s.split(","), default=list(SCENARIOS))
+    parser.add_argument("--out", help="grava o JSON também neste arquivo")
+    args = parser.parse_args()
+
+    _configure_env(args.scale)
+    results = asyncio.run(run(args))
+    text = json.dumps(results, indent=2, sort_keys=True, ensure_ascii=False)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,11 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from config import load_settings
-from utils.embeds import make_embed, format_embed_body
-
-settings = load_settings()
+from utils.embeds import format_embed_body
+from utils.event_service import open_event_cache
+from utils.jobs import ICONS
+from utils.member_stats import MemberStats
+from utils.metrics import registry as metrics, timed
 
 
 def _uptime_seconds(bot: commands.Bot) -> int:
@@ -35,9 +36,59 @@ def _fmt_uptime(secs: int) -> str:
 class AdminCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.settings = bot.settings
         # marca início (pra uptime)
         if not hasattr(self.bot, "_start_time"):
             setattr(self.bot, "_start_time", time.time())
+        # contadores de membros/cargos para o /status
+        self.member_stats = MemberStats()
+
+    # -------------------------
+    # contadores incrementais
+    # -------------------------
+    @commands.Cog.listener()
+    @timed("listener", "admin.ready")
+    async def on_ready(self) -> None:
+        for guild in self.bot.guilds:
+            self.member_stats.rebuild(guild)
+
+    @commands.Cog.listener()
+    @timed("listener", "admin.guild_join")
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        self.member_stats.rebuild(guild)
+
+    @commands.Cog.listener()
+    @timed("listener", "admin.guild_remove")
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.member_stats.forget(guild.id)
+
+    @commands.Cog.listener()
+    @timed("listener", "admin.member_join")
+    async def on_member_join(self, member: discord.Member) -> None:
+        c = self.member_stats.peek(member.guild.id)
+        if c is not None:
+            c.add_member(member)
+
+    @commands.Cog.listener()
+    @timed("listener", "admin.member_remove")
+    async def on_member_remove(self, member: discord.Member) -> None:
+        c = self.member_stats.peek(member.guild.id)
+        if c is not None:
+            c.remove_member(member)
+
+    @commands.Cog.listener()
+    @timed("listener", "admin.member_update")
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        c = self.member_stats.peek(after.guild.id)
+        if c is not None:
+            c.update_member(before, after)
+
+    @commands.Cog.listener()
+    @timed("listener", "admin.guild_role_delete")
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        c = self.member_stats.peek(role.guild.id)
+        if c is not None:
+            c.drop_role(role.id)
 
     # -------------------------
     # /about
@@ -52,16 +103,10 @@ class AdminCog(commands.Cog):
         cmds = [c.name for c in self.bot.tree.get_commands()]
         cmds_sorted = ", ".join(f"`/{c}`" for c in sorted(cmds)) if cmds else "—"
 
-        embed = make_embed(
-            title="SOBRE",
-            footer=settings.bot_name,
-            author_name=settings.bot_name,
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
-            thumbnail_url=guild.icon.url if guild and guild.icon else None,
-        )
+        embed = self.bot.embeds.branded("SOBRE", guild=guild, thumbnail=True)
 
         body = (
-            f"🧠 **{settings.bot_name}** online.\n\n"
+            f"🧠 **{self.settings.bot_name}** online.\n\n"
             f"🏷️ Servidor: **{guild_name}**\n"
             f"🆔 Guild ID: `{guild_id}`\n"
             f"⏱️ Uptime: **{_fmt_uptime(_uptime_seconds(self.bot))}**\n"
@@ -79,21 +124,35 @@ class AdminCog(commands.Cog):
     @app_commands.command(name="health", description="Checagem rápida de saúde do bot (admin).")
     @app_commands.checks.has_permissions(administrator=True)
     async def health(self, interaction: discord.Interaction) -> None:
-        embed = make_embed(
-            title="HEALTH",
-            footer=settings.bot_name,
-            author_name=settings.bot_name,
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
-        )
+        embed = self.bot.embeds.branded("HEALTH")
 
         ws_ms = int(self.bot.latency * 1000)
         up = _fmt_uptime(_uptime_seconds(self.bot))
+        cache = open_event_cache.stats()
+        digest = self.bot.log_digest.stats()
 
         body = (
             f"✅ **Status:** ONLINE\n"
             f"🛰️ **WebSocket:** `{ws_ms}ms`\n"
             f"⏱️ **Uptime:** `{up}`\n"
+            f"🗃️ **Cache de evento:** `{cache['hits']} hits / {cache['misses']} misses ({cache['hit_ratio']:.0%})`\n"
+            f"🧾 **Log agrupado:** `{digest['delivered']} linhas em {digest['messages']} msgs ({digest['calls_saved']} chamadas poupadas)`\n"
         )
+
+        # valores já amostrados em background (HealthSampler)
+        sample = self.bot.health.latest()
+        if sample is None:
+            body += "\n⏳ **Processo:** aguardando primeira amostra."
+        else:
+            window = self.bot.health.summary()
+            body += (
+                f"\n💾 **RSS:** `{sample.rss_mb:.1f} MB` (pico `{window['rss_max_mb']:.1f} MB`)\n"
+                f"🔥 **CPU:** `{sample.cpu_percent:.1f}%` (média `{window['cpu_avg']:.1f}%`)\n"
+                f"📂 **FDs:** `{sample.fds}` • 🧵 **Threads:** `{sample.threads}` • ⚙️ **Tasks:** `{sample.tasks}`\n"
+                f"🌀 **Lag do loop:** `{sample.loop_lag_ms:.1f}ms` "
+                f"(média `{window['lag_avg_ms']:.1f}ms`, máx `{window['lag_max_ms']:.1f}ms` em {window['window_s']:.0f}s)\n"
+                f"🗂️ **Cache gateway:** `{sample.guilds} guilds / {sample.members} membros / {sample.messages} msgs`\n"
+            )
         embed.description = format_embed_body(body)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
@@ -109,12 +168,7 @@ class AdminCog(commands.Cog):
 
         ws_ms = int(self.bot.latency * 1000)
 
-        embed = make_embed(
-            title="PING",
-            footer=settings.bot_name,
-            author_name=settings.bot_name,
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
-        )
+        embed = self.bot.embeds.branded("PING")
 
         body = (
             f"🛰️ **WebSocket:** `{ws_ms}ms`\n"
@@ -124,45 +178,124 @@ class AdminCog(commands.Cog):
         embed.description = format_embed_body(body)
         await interaction.followup.send(embed=embed, ephemeral=True)
 
+    # -------------------------
+    # /metrics (resumo dos contadores/latências)
+    # -------------------------
+    @app_commands.command(name="metrics", description="Latência e erros por comando/botão/listener/banco (admin).")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def metrics_cmd(self, interaction: discord.Interaction, tipo: str | None = None) -> None:
+        rows = [(k, m) for k, m in metrics.items() if tipo is None or k[0] == tipo]
+        rows.sort(key=lambda x: x[1].calls, reverse=True)
+
+        embed = self.bot.embeds.branded("METRICS")
+
+        lines = []
+        for (kind, name), m in rows[:20]:
+            p50 = m.latency.quantile(0.5) * 1000
+            p99 = m.latency.quantile(0.99) * 1000
+            lines.append(f"`{kind}:{name}` {m.calls}x • erros {m.errors} • p50≤{p50:g}ms p99≤{p99:g}ms")
+
+        embed.description = format_embed_body("\n".join(lines) if lines else "Sem dados ainda.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    # -------------------------
+    # /jobs (operações em background)
+    # -------------------------
+    @app_commands.command(name="jobs", description="Lista os jobs em background ou detalha um deles (admin).")
+    @app_commands.describe(job="ID do job para ver os detalhes")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def jobs(self, interaction: discord.Interaction, job: int | None = None) -> None:
+        scheduler = self.bot.jobs
+
+        if job is not None:
+            found = await scheduler.get(job)
+            if found is None or found.guild_id != interaction.guild_id:
+                await interaction.response.send_message(f"❌ Job **#{job}** não existe.", ephemeral=True)
+                return
+            embed = self.bot.embeds.branded(scheduler.title(found))
+            embed.description = format_embed_body(scheduler.describe(found))
+            embed.add_field(name="🔁 Tentativas", value=f"{found.attempts}/{found.max_attempts}", inline=True)
+            embed.add_field(name="👤 Pedido por", value=f"<@{found.created_by_id}>" if found.created_by_id else "—", inline=True)
+            embed.add_field(name="🕒 Criado", value=f"`{found.created_at[:19]}`", inline=True)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        recent = await scheduler.recent(interaction.guild_id)
+        lines = [
+            f"{ICONS.get(j.status, '🕒')} **#{j.id}** `{j.job_type}` • {j.status}"
+            + (f" • tentativa {j.attempts}/{j.max_attempts}" if j.attempts > 1 else "")
+            for j in recent
+        ]
+        stats = scheduler.stats()
+        embed = self.bot.embeds.branded("JOBS")
+        body = (
+            f"⏳ Rodando: **{stats['running']}** • 🕒 Na fila: **{stats['queued']}**\n\n"
+            + ("\n".join(lines) if lines else "Nenhum job ainda.")
+        )
+        embed.description = format_embed_body(body)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="job_cancel", description="Cancela um job em andamento ou na fila (admin).")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def job_cancel(self, interaction: discord.Interaction, job: int) -> None:
+        found = await self.bot.jobs.get(job)
+        if found is not None and found.guild_id == interaction.guild_id and await self.bot.jobs.cancel(job):
+            msg = f"⏹️ Job **#{job}** cancelado. Use `/job_retry` para continuar de onde parou."
+        else:
+            msg = f"❌ Job **#{job}** não está rodando nem na fila."
+        await interaction.response.send_message(msg, ephemeral=True)
+
+    @app_commands.command(name="job_retry", description="Recoloca na fila um job que falhou ou foi cancelado (admin).")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def job_retry(self, interaction: discord.Interaction, job: int) -> None:
+        found = await self.bot.jobs.get(job)
+        if found is not None and found.guild_id == interaction.guild_id and await self.bot.jobs.retry(job):
+            msg = f"▶️ Job **#{job}** de volta na fila; continua do último checkpoint."
+        else:
+            msg = f"❌ Job **#{job}** não existe, já terminou ou ainda está ativo."
+        await interaction.response.send_message(msg, ephemeral=True)
+
     # -------------------------
     # /status (sem ranking)
     # -------------------------
     @app_commands.command(name="status", description="Resumo do servidor: membros e contagem por cargo (admin).")
     @app_commands.checks.has_permissions(administrator=True)
-    async def status(self, interaction: discord.Interaction) -> None:
+    async def status(self, interaction: discord.Interaction, verificar: bool = False) -> None:
         guild = interaction.guild
         if not guild:
             await interaction.response.send_message("Use no servidor.", ephemeral=True)
             return
 
+        counters = self.member_stats.get(guild)
+
+        # autochecagem opcional: recalcula do zero e corrige se divergiu
+        check_text = None
+        if verificar:
+            diffs = self.member_stats.check(guild)
+            if diffs:
+                self.member_stats.rebuild(guild)
+                counters = self.member_stats.get(guild)
+                check_text = f"⚠️ {len(diffs)} divergência(s) corrigida(s):\n" + "\n".join(f"• {d}" for d in diffs[:10])
+            else:
+                check_text = "✅ Contadores consistentes."
+
         # membros
-        total = guild.member_count or len(guild.members)
-        humans = sum(1 for m in guild.members if not m.bot)
-        bots = sum(1 for m in guild.members if m.bot)
+        total = guild.member_count or (counters.humans + counters.bots)
+        humans = counters.humans
+        bots = counters.bots
 
         # contagem por cargos (top 12) sem poluir
-        role_counts = []
-        for role in guild.roles:
-            if role.is_default():
-                continue
-            count = len(role.members)
-            if count > 0:
-                role_counts.append((count, role))
-
-        role_counts.sort(reverse=True, key=lambda x: x[0])
-        top = role_counts[:12]
+        top = []
+        for count, role_id in counters.top_roles(12):
+            role = guild.get_role(role_id)
+            if role is not None:
+                top.append((count, role))
 
         roles_text = "—"
         if top:
             roles_text = "\n".join([f"• {r.mention}: **{c}**" for c, r in top])
 
-        embed = make_embed(
-            title="STATUS",
-            footer=settings.bot_name,
-            author_name=f"{settings.bot_name} • status",
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
-            thumbnail_url=guild.icon.url if guild.icon else None,
-        )
+        embed = self.bot.embeds.branded("STATUS", guild=guild, author_suffix="status", thumbnail=True)
 
         body = (
             f"🏷️ **Servidor:** {guild.name}\n"
@@ -172,6 +305,8 @@ class AdminCog(commands.Cog):
         embed.description = format_embed_body(body)
 
         embed.add_field(name="📌 Cargos (top)", value=roles_text, inline=False)
+        if check_text:
+            embed.add_field(name="🔎 Autochecagem", value=check_text, inline=False)
 
         # dia de criação do servidor (contador de dias ativo)
         created = guild.created_at
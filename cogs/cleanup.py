@@ -1,58 +1,120 @@
+import datetime
+import re
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from config import load_settings
-from utils.embeds import make_embed, format_embed_body
+from utils.embeds import format_embed_body
+from utils.jobs import ICONS, Job, JobContext, JobError, JobType
+from utils.purge import CLEAN, CLEAN_USER, PurgeJobs
+
+RESET_CHANNEL = "reset_channel"
+
 
-settings = load_settings()
+def _describe_reset(job: Job) -> str:
+    new_id = job.progress.get("new_channel_id")
+    return (
+        f"{ICONS.get(job.status, '🕒')} **{job.status}** • <#{job.params['channel_id']}>"
+        + (f"\n✅ Novo canal: <#{new_id}>" if new_id else "")
+        + (f"\n⛔ {job.error}" if job.error else "")
+    )
 
 
 class CleanupCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.settings = bot.settings
+        for kind in bot.purges.job_types():
+            bot.jobs.register(kind)
+        bot.jobs.register(JobType(RESET_CHANNEL, "RESET DE CANAL", self._run_reset, _describe_reset))
 
     # -------------------------
-    # /clean (purge)
+    # /clean (purge em background)
     # -------------------------
-    @app_commands.command(name="clean", description="Limpa mensagens de um canal (admin).")
+    @app_commands.command(name="clean", description="Limpa mensagens de um canal em background (admin).")
+    @app_commands.describe(quantidade="Quantas mensagens ler (0 = o canal inteiro)")
     @app_commands.checks.has_permissions(administrator=True)
     async def clean(
         self,
         interaction: discord.Interaction,
         canal: discord.TextChannel,
-        quantidade: app_commands.Range[int, 1, 1000] = 100,
+        quantidade: app_commands.Range[int, 0, 1_000_000] = 100,
         incluir_fixadas: bool = False,
     ) -> None:
-        await interaction.response.defer(ephemeral=True)
+        params = PurgeJobs.clean_params(
+            canal,
+            limit=quantidade or None,
+            include_pinned=incluir_fixadas,
+            reason=f"{self.settings.bot_name}: clean",
+        )
+        job = await self.bot.jobs.submit(
+            interaction.guild_id,
+            CLEAN,
+            params,
+            created_by_id=interaction.user.id,
+            report_channel_id=self.settings.admin_channel_id,
+        )
 
-        def check(msg: discord.Message) -> bool:
-            if incluir_fixadas:
-                return True
-            return not msg.pinned
+        embed = self.bot.embeds.branded("LIMPEZA")
+        body = (
+            f"🧹 Limpeza **#{job.id}** na fila para {canal.mention}\n"
+            f"🔎 Mensagens: **{quantidade or 'todas'}**\n"
+            f"📌 Fixadas incluídas: **{'sim' if incluir_fixadas else 'não'}**\n"
+            f"📈 O progresso sai em <#{self.settings.admin_channel_id}>.\n"
+        )
+        embed.description = format_embed_body(body)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
-        try:
-            deleted = await canal.purge(limit=quantidade, check=check, bulk=True, reason=f"{settings.bot_name}: clean")
-        except discord.Forbidden:
-            await interaction.followup.send("⛔ Sem permissão para apagar mensagens nesse canal.", ephemeral=True)
-            return
-        except Exception as e:
-            await interaction.followup.send(f"⛔ Falha ao limpar: `{type(e).__name__}`", ephemeral=True)
+    # -------------------------
+    # /clean_user (autores em todos os canais)
+    # -------------------------
+    @app_commands.command(name="clean_user", description="Apaga mensagens de usuários em todos os canais (admin).")
+    @app_commands.describe(
+        usuarios="Menções ou IDs separados por espaço (funciona com quem já saiu)",
+        horas="Só mensagens das últimas N horas",
+    )
+    @app_commands.checks.has_permissions(administrator=True)
+    async def clean_user(
+        self,
+        interaction: discord.Interaction,
+        usuarios: str,
+        horas: app_commands.Range[int, 1, 720] = 24,
+    ) -> None:
+        author_ids = frozenset(int(x) for x in re.findall(r"\d{15,20}", usuarios))
+        if not author_ids:
+            await interaction.response.send_message("❌ Informe ao menos uma menção ou ID.", ephemeral=True)
             return
 
-        embed = make_embed(
-            title="LIMPEZA",
-            footer=settings.bot_name,
-            author_name=settings.bot_name,
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
+        guild = interaction.guild
+        me = guild.me
+        channels = [
+            ch for ch in guild.text_channels
+            if (perms := ch.permissions_for(me)).read_message_history and perms.manage_messages
+        ]
+        params = PurgeJobs.sweep_params(
+            channels,
+            author_ids,
+            after=discord.utils.utcnow() - datetime.timedelta(hours=horas),
+            reason=f"{self.settings.bot_name}: clean_user",
+        )
+        job = await self.bot.jobs.submit(
+            interaction.guild_id,
+            CLEAN_USER,
+            params,
+            created_by_id=interaction.user.id,
+            report_channel_id=self.settings.admin_channel_id,
         )
+
+        embed = self.bot.embeds.branded("VARREDURA")
         body = (
-            f"🧹 Canal: {canal.mention}\n"
-            f"🗑️ Removidas: **{len(deleted)}** mensagens\n"
-            f"📌 Fixadas incluídas: **{'sim' if incluir_fixadas else 'não'}**\n"
+            f"🧹 Varredura **#{job.id}** na fila para **{len(channels)}** canais\n"
+            f"👤 Autores: {', '.join(f'<@{a}>' for a in sorted(author_ids))}\n"
+            f"🕒 Janela: últimas **{horas}h**\n"
+            f"📈 O relatório sai em <#{self.settings.admin_channel_id}>.\n"
         )
         embed.description = format_embed_body(body)
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
     # -------------------------
     # /reset_channel (clona e remove o antigo)
@@ -60,37 +122,42 @@ class CleanupCog(commands.Cog):
     @app_commands.command(name="reset_channel", description="Reseta um canal (clona e remove o antigo) (admin).")
     @app_commands.checks.has_permissions(administrator=True)
     async def reset_channel(self, interaction: discord.Interaction, canal: discord.TextChannel) -> None:
-        await interaction.response.defer(ephemeral=True)
-
-        guild = interaction.guild
-        if not guild:
-            await interaction.followup.send("Use no servidor.", ephemeral=True)
-            return
-
-        try:
-            new_ch = await canal.clone(reason=f"{settings.bot_name}: reset_channel")
-            await new_ch.edit(position=canal.position)
-            await canal.delete(reason=f"{settings.bot_name}: reset_channel")
-        except discord.Forbidden:
-            await interaction.followup.send("⛔ Sem permissão para clonar/deletar canal.", ephemeral=True)
-            return
-        except Exception as e:
-            await interaction.followup.send(f"⛔ Falha ao resetar canal: `{type(e).__name__}`", ephemeral=True)
-            return
-
-        embed = make_embed(
-            title="RESET DE CANAL",
-            footer=settings.bot_name,
-            author_name=settings.bot_name,
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
+        job = await self.bot.jobs.submit(
+            interaction.guild_id,
+            RESET_CHANNEL,
+            {"channel_id": canal.id},
+            created_by_id=interaction.user.id,
+            report_channel_id=self.settings.admin_channel_id,
         )
+
+        embed = self.bot.embeds.branded("RESET DE CANAL")
         body = (
-            f"♻️ Canal resetado com sucesso.\n"
-            f"✅ Novo canal: {new_ch.mention}\n"
+            f"♻️ Reset **#{job.id}** de {canal.mention} na fila.\n"
+            f"📈 O resultado sai em <#{self.settings.admin_channel_id}>.\n"
         )
         embed.description = format_embed_body(body)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
-        await interaction.followup.send(embed=embed, ephemeral=True)
+    async def _run_reset(self, ctx: JobContext) -> None:
+        reason = f"{self.settings.bot_name}: reset_channel"
+        old = self.bot.get_channel(ctx.params["channel_id"])
+        new_id = ctx.progress.get("new_channel_id")
+        try:
+            if new_id is None:
+                if old is None:
+                    raise JobError("Canal não existe mais.")
+                new_ch = await old.clone(reason=reason)
+                # o clone não pode se repetir numa retomada
+                await ctx.save({"new_channel_id": new_ch.id})
+            else:
+                new_ch = self.bot.get_channel(new_id)
+                if new_ch is None:
+                    raise JobError("O canal novo sumiu antes do fim do reset.")
+            if old is not None:
+                await new_ch.edit(position=old.position)
+                await old.delete(reason=reason)
+        except discord.Forbidden:
+            raise JobError("Sem permissão para clonar/deletar canal.") from None
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -3,6 +3,11 @@ from discord import app_commands
 from discord.ext import commands
 import random
 
+from utils import event_service
+from utils.karaoke_queue import karaoke_queues
+from utils.signup_board import COUNTS_FIELD
+from views.karaoke_signup import KaraokeSignupView
+
 class EventsCog(commands.GroupCog, group_name="evento"):
     def __init__(self, bot):
         self.bot = bot
@@ -20,16 +25,35 @@ class EventsCog(commands.GroupCog, group_name="evento"):
         titulo: str,
         descricao: str | None = None
     ):
+        if await event_service.get_open_karaoke_event(interaction.guild_id) is not None:
+            await interaction.response.send_message("⚠️ Já existe um karaokê aberto.", ephemeral=True)
+            return
+
+        event_id = await event_service.create_event(interaction.guild_id, titulo, interaction.user.id)
+        # aquece o cache: a rajada de cliques resolve o evento sem ir ao banco
+        await event_service.get_open_karaoke_event(interaction.guild_id)
         embed = discord.Embed(
             title=f"🎤 {titulo}",
             description=descricao or "Clique abaixo para participar.",
             color=discord.Color.magenta()
         )
-        await interaction.response.send_message(
-            "✅ Esqueleto da chamada funcionando. Próximo passo: ligar botões e banco.",
-            ephemeral=True
-        )
-        await interaction.channel.send(embed=embed)
+        embed.add_field(name=COUNTS_FIELD, value="🎤 Cantores: **0**\n👀 Espectadores: **0**")
+        await interaction.response.send_message("✅ Chamada aberta.", ephemeral=True)
+        message = await interaction.channel.send(embed=embed, view=KaraokeSignupView(event_id))
+        await self.bot.signup_board.track(event_id, message)
+
+    async def _open_event(self, interaction: discord.Interaction):
+        event = await event_service.get_open_karaoke_event(interaction.guild_id)
+        if event is None:
+            await self._reply(interaction, "❌ Nenhum karaokê aberto.")
+        return event
+
+    async def _reply(self, interaction: discord.Interaction, content: str, **kwargs):
+        # comandos que fazem defer antes de tocar no banco respondem por followup
+        if interaction.response.is_done():
+            await interaction.followup.send(content, ephemeral=True, **kwargs)
+        else:
+            await interaction.response.send_message(content, ephemeral=True, **kwargs)
 
     @karaoke.command(name="iniciar", description="Inicia o karaokê")
     @app_commands.describe(
@@ -44,23 +68,70 @@ class EventsCog(commands.GroupCog, group_name="evento"):
         nome_canal_voz: str | None = None,
         nome_canal_texto: str | None = None
     ):
-        await interaction.response.send_message(
-            f"✅ Esqueleto do karaokê iniciado.\nTítulo: {titulo}\nVoz: {nome_canal_voz or 'padrão'}\nTexto: {nome_canal_texto or 'padrão'}",
+        event = await self._open_event(interaction)
+        if event is None:
+            return
+        if event["status"] == "active":
+            await interaction.response.send_message("⚠️ O karaokê já começou.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        # inscrições ainda no lote precisam estar no banco antes de montar a fila
+        await self.bot.signups.flush()
+        singers = await event_service.get_event_singers(event["id"])
+        queue = await karaoke_queues.get(event["id"])
+        await queue.build(singers)
+        await event_service.set_event_status(interaction.guild_id, event["id"], "active", interaction.user.id)
+
+        await interaction.followup.send(
+            f"✅ Karaokê iniciado com **{len(queue)}** cantor(es) na fila.\n"
+            f"Título: {titulo}\nVoz: {nome_canal_voz or 'padrão'}\nTexto: {nome_canal_texto or 'padrão'}",
             ephemeral=True
         )
 
     @karaoke.command(name="status", description="Mostra o status do karaokê")
     async def status(self, interaction: discord.Interaction):
+        event = await self._open_event(interaction)
+        if event is None:
+            return
+        queue = await karaoke_queues.get(event["id"])
+        upcoming = "\n".join(f"`{i}.` <@{uid}>" for i, uid in enumerate(queue.peek(10), start=1)) or "—"
+        current = f"<@{queue.current}>" if queue.current else "—"
         await interaction.response.send_message(
-            "✅ Esqueleto do status funcionando.",
-            ephemeral=True
+            f"🎤 **{event['title']}** ({event['status']})\n"
+            f"Cantando agora: {current}\n"
+            f"Na fila: **{len(queue)}**\n\n{upcoming}",
+            ephemeral=True,
+            allowed_mentions=discord.AllowedMentions.none()
         )
 
     @karaoke.command(name="proximo", description="Avança para o próximo cantor")
     async def proximo(self, interaction: discord.Interaction):
-        await interaction.response.send_message(
-            "✅ Esqueleto do próximo funcionando.",
-            ephemeral=True
+        await interaction.response.defer(ephemeral=True)
+        event = await self._open_event(interaction)
+        if event is None:
+            return
+        queue = await karaoke_queues.get(event["id"])
+        if queue.current is None and len(queue) == 0:
+            await self._reply(interaction, "🏁 Fila vazia — ninguém mais para cantar.")
+            return
+        # mesmo sem ninguém esperando, fecha quem está cantando
+        previous, current = await queue.advance()
+        await event_service.log_staff_action(
+            interaction.guild_id, event["id"], "queue_next", interaction.user.id,
+            interaction.user.display_name, target_user_id=current
+        )
+        if current is None:
+            await self._reply(
+                interaction,
+                f"🏁 Fila vazia — <@{previous}> foi o último a cantar.",
+                allowed_mentions=discord.AllowedMentions.none()
+            )
+            return
+        await self._reply(
+            interaction,
+            f"🎤 Agora: <@{current}>" + (f" (antes: <@{previous}>)" if previous else ""),
+            allowed_mentions=discord.AllowedMentions.none()
         )
 
     @karaoke.command(name="pular", description="Move um cantor para o final da fila")
@@ -74,17 +145,81 @@ class EventsCog(commands.GroupCog, group_name="evento"):
         usuario: discord.Member,
         motivo: str
     ):
-        await interaction.response.send_message(
-            f"✅ {usuario.mention} seria movido para o fim da fila. Motivo: {motivo}",
-            ephemeral=True
+        await interaction.response.defer(ephemeral=True)
+        event = await self._open_event(interaction)
+        if event is None:
+            return
+        queue = await karaoke_queues.get(event["id"])
+        if not await queue.skip(usuario.id):
+            await self._reply(interaction, f"❌ {usuario.mention} não está na fila.")
+            return
+        await event_service.log_staff_action(
+            interaction.guild_id, event["id"], "queue_skip", interaction.user.id,
+            interaction.user.display_name, target_user_id=usuario.id, reason=motivo
+        )
+        await self._reply(interaction, f"✅ {usuario.mention} foi para o fim da fila. Motivo: {motivo}")
+
+    @karaoke.command(name="remover", description="Tira um cantor da fila")
+    @app_commands.describe(
+        usuario="Cantor que sai da fila",
+        motivo="Motivo da remoção"
+    )
+    async def remover(
+        self,
+        interaction: discord.Interaction,
+        usuario: discord.Member,
+        motivo: str
+    ):
+        await interaction.response.defer(ephemeral=True)
+        event = await self._open_event(interaction)
+        if event is None:
+            return
+        queue = await karaoke_queues.get(event["id"])
+        if not await queue.remove(usuario.id):
+            await self._reply(interaction, f"❌ {usuario.mention} não está na fila.")
+            return
+        await event_service.log_staff_action(
+            interaction.guild_id, event["id"], "queue_remove", interaction.user.id,
+            interaction.user.display_name, target_user_id=usuario.id, reason=motivo
+        )
+        await self._reply(interaction, f"✅ {usuario.mention} saiu da fila. Motivo: {motivo}")
+
+    @karaoke.command(name="voltar", description="Coloca um cantor de volta na fila")
+    @app_commands.describe(
+        usuario="Cantor que volta para a fila",
+        proximo="Entra como o próximo a cantar (senão vai para o fim)"
+    )
+    async def voltar(
+        self,
+        interaction: discord.Interaction,
+        usuario: discord.Member,
+        proximo: bool = False
+    ):
+        await interaction.response.defer(ephemeral=True)
+        event = await self._open_event(interaction)
+        if event is None:
+            return
+        queue = await karaoke_queues.get(event["id"])
+        if not await queue.reinsert(usuario.id, front=proximo):
+            await self._reply(interaction, f"⚠️ {usuario.mention} já está na fila.")
+            return
+        await event_service.log_staff_action(
+            interaction.guild_id, event["id"], "queue_reinsert", interaction.user.id,
+            interaction.user.display_name, target_user_id=usuario.id
         )
+        where = "como o próximo" if proximo else "no fim da fila"
+        await self._reply(interaction, f"✅ {usuario.mention} voltou {where}.")
 
     @karaoke.command(name="encerrar", description="Encerra o karaokê")
     async def encerrar(self, interaction: discord.Interaction):
-        await interaction.response.send_message(
-            "✅ Esqueleto do encerramento funcionando.",
-            ephemeral=True
-        )
+        event = await self._open_event(interaction)
+        if event is None:
+            return
+        await event_service.set_event_status(interaction.guild_id, event["id"], "ended", interaction.user.id)
+        karaoke_queues.forget(event["id"])
+        await interaction.response.send_message("✅ Karaokê encerrado.", ephemeral=True)
+        await self.bot.signup_board.finish(event["id"])
+        self.bot.signups.forget(event["id"])
 
 async def setup(bot):
     await bot.add_cog(EventsCog(bot))
@@ -1,11 +1,25 @@
+import codecs
+from typing import AsyncIterator
+
+import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from config import load_settings
-from utils.embeds import make_embed, format_embed_body
+from utils.dm_fanout import ANNOUNCE_DM
+from utils.embeds import format_embed_body
+from utils.jobs import ICONS, Job, JobContext, JobError, JobType
+from utils.paging import paginate, send_embeds, send_text
+from utils.templates import NAME_MAX, PLACEHOLDERS
+
+ANNOUNCE = "announce"
+
+# teto para os textos paginados (≈ 5 mensagens cheias de embeds)
+MAX_TEXT_CHARS = 30000
 
-settings = load_settings()
+# anexos .txt/.md: teto de download e tamanho de cada pedaço lido
+MAX_ATTACHMENT_BYTES = 128 * 1024
+ATTACHMENT_CHUNK = 16 * 1024
 
 
 def _safe_allowed_mentions(pingar: bool) -> discord.AllowedMentions:
@@ -14,18 +28,84 @@ def _safe_allowed_mentions(pingar: bool) -> discord.AllowedMentions:
     return discord.AllowedMentions(everyone=False, roles=False, users=True)
 
 
-async def _read_text_attachment(attachment: discord.Attachment, max_chars: int = 3800) -> str:
+def _parts(sent: list[discord.Message]) -> str:
+    return f" ({len(sent)} mensagens)" if len(sent) > 1 else ""
+
+
+def _sniff_encoding(head: bytes) -> str:
+    # só olha o BOM; sem BOM tenta UTF-8 (utf-8-sig descarta o BOM se vier)
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    return "utf-8-sig"
+
+
+async def _iter_attachment(
+    session: aiohttp.ClientSession,
+    attachment: discord.Attachment,
+    max_bytes: int,
+) -> AsyncIterator[bytes]:
+    """Baixa o anexo em pedaços, abortando assim que passar de max_bytes."""
+    received = 0
+    async with session.get(attachment.url) as resp:
+        resp.raise_for_status()
+        async for chunk in resp.content.iter_chunked(ATTACHMENT_CHUNK):
+            received += len(chunk)
+            if received > max_bytes:
+                raise ValueError(f"Arquivo muito grande (máx {max_bytes // 1024} KB).")
+            yield chunk
+
+
+async def _read_text_attachment(
+    session: aiohttp.ClientSession,
+    attachment: discord.Attachment,
+    max_chars: int = MAX_TEXT_CHARS,
+    max_bytes: int = MAX_ATTACHMENT_BYTES,
+) -> str:
+    """
+    Lê um anexo .txt/.md como texto.
+    - Recusa pelo tamanho declarado antes de baixar qualquer byte.
+    - Baixa em streaming com teto de bytes (não confia só no `size`).
+    - Decodifica em pedaços: UTF-8 (ou UTF-16 com BOM); UTF-8 inválido
+      cai para latin-1, redecodificando só o que já chegou. UTF-16
+      inválido é recusado (latin-1 ali só daria lixo).
+    """
     name = (attachment.filename or "").lower()
     if not (name.endswith(".txt") or name.endswith(".md")):
         raise ValueError("Envie um arquivo .txt ou .md")
+    if attachment.size > max_bytes:
+        raise ValueError(f"Arquivo muito grande ({attachment.size // 1024} KB, máx {max_bytes // 1024} KB).")
 
-    data = await attachment.read()
+    encoding = None
+    decoder = None
+    raw = bytearray()
+    parts: list[str] = []
     try:
-        text = data.decode("utf-8")
+        async for chunk in _iter_attachment(session, attachment, max_bytes):
+            if decoder is None:
+                encoding = _sniff_encoding(chunk)
+                decoder = codecs.getincrementaldecoder(encoding)()
+            raw += chunk
+            try:
+                parts.append(decoder.decode(chunk))
+            except UnicodeDecodeError:
+                if encoding == "utf-16":
+                    raise
+                # latin-1 aceita qualquer byte: o resto do arquivo segue nele
+                encoding = "latin-1"
+                decoder = codecs.getincrementaldecoder(encoding)()
+                parts = [decoder.decode(bytes(raw))]
+        if decoder is not None:
+            try:
+                parts.append(decoder.decode(b"", final=True))
+            except UnicodeDecodeError:
+                if encoding == "utf-16":
+                    raise
+                # sequência cortada no fim do arquivo
+                parts = [bytes(raw).decode("latin-1")]
     except UnicodeDecodeError:
-        text = data.decode("latin-1")
+        raise ValueError("Arquivo com BOM UTF-16, mas o conteúdo não é UTF-16 válido.") from None
 
-    text = text.replace("\r\n", "\n").replace("\r", "\n").strip()
+    text = "".join(parts).replace("\r\n", "\n").replace("\r", "\n").strip()
     if not text:
         raise ValueError("Arquivo vazio.")
     if len(text) > max_chars:
@@ -33,9 +113,40 @@ async def _read_text_attachment(attachment: discord.Attachment, max_chars: int =
     return text
 
 
+def _describe_announce(job: Job) -> str:
+    message_ids = job.progress.get("message_ids") or []
+    message_id = message_ids[0] if message_ids else None
+    link = f"https://discord.com/channels/{job.guild_id}/{job.params['channel_id']}/{message_id}"
+    return (
+        f"{ICONS.get(job.status, '🕒')} **{job.status}** • <#{job.params['channel_id']}>\n"
+        f"📣 **{job.params['title']}**"
+        + (f"\n🔗 {link}" if message_id else "")
+        + (f"\n⛔ {job.error}" if job.error else "")
+    )
+
+
 class MessagesCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.settings = bot.settings
+        bot.jobs.register(JobType(ANNOUNCE, "ANÚNCIO", self._run_announce, _describe_announce))
+        bot.jobs.register(bot.dm_fanout.job_type())
+        # sessão HTTP única para baixar anexos (aberta no primeiro uso)
+        self._session: aiohttp.ClientSession | None = None
+
+    async def cog_unload(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+    def _http(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    def _pages(self, title: str, text: str, guild: discord.Guild | None) -> list[list[discord.Embed]]:
+        # 1ª página com título/thumbnail; o resto continua o texto
+        first = self.bot.embeds.branded(title, guild=guild, thumbnail=True)
+        return paginate(format_embed_body(text, add_divider_top=True), first)
 
     # =========================
     # /enviar (texto direto)
@@ -51,17 +162,13 @@ class MessagesCog(commands.Cog):
     ) -> None:
         await interaction.response.defer(ephemeral=True)
 
-        if len(mensagem) > 2000:
-            await interaction.followup.send("⚠️ A mensagem passou de 2000 caracteres. Reduza o texto.", ephemeral=True)
-            return
-
         try:
-            await canal.send(mensagem, allowed_mentions=_safe_allowed_mentions(pingar))
+            sent = await send_text(canal, mensagem, allowed_mentions=_safe_allowed_mentions(pingar))
         except Exception as e:
             await interaction.followup.send(f"⛔ Falha ao enviar: `{type(e).__name__}`", ephemeral=True)
             return
 
-        await interaction.followup.send(f"✅ Enviado em {canal.mention}", ephemeral=True)
+        await interaction.followup.send(f"✅ Enviado em {canal.mention}{_parts(sent)}", ephemeral=True)
 
     # =========================
     # /enviar_msg (texto longo pegando ID)
@@ -102,21 +209,13 @@ class MessagesCog(commands.Cog):
             await interaction.followup.send("⚠️ A mensagem está vazia.", ephemeral=True)
             return
 
-        if len(text) > 2000:
-            await interaction.followup.send(
-                "⚠️ Passou de 2000 caracteres (limite de mensagem comum). "
-                "Divida em 2 mensagens ou use embed.",
-                ephemeral=True,
-            )
-            return
-
         try:
-            await canal.send(text, allowed_mentions=_safe_allowed_mentions(pingar))
+            sent = await send_text(canal, text, allowed_mentions=_safe_allowed_mentions(pingar))
         except Exception as e:
             await interaction.followup.send(f"⛔ Falha ao enviar: `{type(e).__name__}`", ephemeral=True)
             return
 
-        await interaction.followup.send(f"✅ Texto enviado em {canal.mention}", ephemeral=True)
+        await interaction.followup.send(f"✅ Texto enviado em {canal.mention}{_parts(sent)}", ephemeral=True)
 
     # =========================
     # /enviarembed (texto curto direto)
@@ -136,29 +235,16 @@ class MessagesCog(commands.Cog):
         if len(titulo) > 256:
             await interaction.followup.send("⚠️ Título muito grande (máx 256).", ephemeral=True)
             return
-        if len(texto) > 3800:
-            await interaction.followup.send(
-                "⚠️ Texto muito grande. Use /enviarembed_msg ou /enviarembed_txt.",
-                ephemeral=True,
-            )
-            return
 
-        embed = make_embed(
-            title=titulo.strip(),
-            footer=settings.bot_name,
-            author_name=settings.bot_name,
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
-            thumbnail_url=interaction.guild.icon.url if interaction.guild and interaction.guild.icon else None,
-        )
-        embed.description = format_embed_body(texto, add_divider_top=True)
+        pages = self._pages(titulo.strip(), texto, interaction.guild)
 
         try:
-            await canal.send(embed=embed, allowed_mentions=_safe_allowed_mentions(pingar))
+            sent = await send_embeds(canal, pages, allowed_mentions=_safe_allowed_mentions(pingar))
         except Exception as e:
             await interaction.followup.send(f"⛔ Falha ao enviar embed: `{type(e).__name__}`", ephemeral=True)
             return
 
-        await interaction.followup.send(f"✅ Embed enviado em {canal.mention}", ephemeral=True)
+        await interaction.followup.send(f"✅ Embed enviado em {canal.mention}{_parts(sent)}", ephemeral=True)
 
     # =========================
     # /enviarembed_msg (texto longo via mensagem ID)
@@ -203,26 +289,16 @@ class MessagesCog(commands.Cog):
         if not text:
             await interaction.followup.send("⚠️ A mensagem está vazia.", ephemeral=True)
             return
-        if len(text) > 3800:
-            await interaction.followup.send("⚠️ Texto grande demais para 1 embed. Divida em 2.", ephemeral=True)
-            return
 
-        embed = make_embed(
-            title=titulo.strip(),
-            footer=settings.bot_name,
-            author_name=settings.bot_name,
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
-            thumbnail_url=interaction.guild.icon.url if interaction.guild and interaction.guild.icon else None,
-        )
-        embed.description = format_embed_body(text, add_divider_top=True)
+        pages = self._pages(titulo.strip(), text, interaction.guild)
 
         try:
-            await canal.send(embed=embed, allowed_mentions=_safe_allowed_mentions(pingar))
+            sent = await send_embeds(canal, pages, allowed_mentions=_safe_allowed_mentions(pingar))
         except Exception as e:
             await interaction.followup.send(f"⛔ Falha ao enviar embed: `{type(e).__name__}`", ephemeral=True)
             return
 
-        await interaction.followup.send(f"✅ Embed enviado em {canal.mention}", ephemeral=True)
+        await interaction.followup.send(f"✅ Embed enviado em {canal.mention}{_parts(sent)}", ephemeral=True)
 
     # =========================
     # /enviarembed_txt (via arquivo .txt/.md)
@@ -247,32 +323,170 @@ class MessagesCog(commands.Cog):
             return
 
         try:
-            text = await _read_text_attachment(arquivo, max_chars=3800)
+            text = await _read_text_attachment(self._http(), arquivo)
         except Exception as e:
             await interaction.followup.send(f"⚠️ Não consegui ler o arquivo: {e}", ephemeral=True)
             return
 
-        embed = make_embed(
-            title=titulo.strip(),
-            footer=settings.bot_name,
-            author_name=settings.bot_name,
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
-            thumbnail_url=interaction.guild.icon.url if interaction.guild and interaction.guild.icon else None,
-        )
-        embed.description = format_embed_body(text, add_divider_top=True)
+        pages = self._pages(titulo.strip(), text, interaction.guild)
 
         try:
-            await canal.send(embed=embed, allowed_mentions=_safe_allowed_mentions(pingar))
+            sent = await send_embeds(canal, pages, allowed_mentions=_safe_allowed_mentions(pingar))
         except Exception as e:
             await interaction.followup.send(f"⛔ Falha ao enviar embed: `{type(e).__name__}`", ephemeral=True)
             return
 
-        await interaction.followup.send(f"✅ Embed enviado em {canal.mention}", ephemeral=True)
+        await interaction.followup.send(f"✅ Embed enviado em {canal.mention}{_parts(sent)}", ephemeral=True)
+
+    # =========================
+    # templates (texto salvo no banco, re-postado sem fetch_message)
+    # =========================
+    async def _template_names(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        if interaction.guild_id is None:
+            return []
+        # lista em cache no TemplateStore: digitar não vira query a cada tecla
+        current = current.strip().lower()
+        names = await self.bot.templates.names(interaction.guild_id)
+        return [app_commands.Choice(name=n, value=n) for n in names if current in n][:25]
+
+    @app_commands.command(
+        name="template_salvar",
+        description="Salva (ou atualiza) um template de mensagem a partir de uma mensagem ou arquivo .txt/.md.",
+    )
+    @app_commands.describe(
+        nome=f"Nome do template (até {NAME_MAX} caracteres)",
+        titulo="Título do embed (vazio = texto comum)",
+        mensagem_id="ID de uma mensagem deste canal com o texto",
+        arquivo="Arquivo .txt/.md com o texto",
+    )
+    @app_commands.checks.has_permissions(administrator=True)
+    async def template_salvar(
+        self,
+        interaction: discord.Interaction,
+        nome: str,
+        titulo: str | None = None,
+        mensagem_id: str | None = None,
+        arquivo: discord.Attachment | None = None,
+    ) -> None:
+        await interaction.response.defer(ephemeral=True)
+
+        guild = interaction.guild
+        if not guild:
+            await interaction.followup.send("Use no servidor.", ephemeral=True)
+            return
+        if (mensagem_id is None) == (arquivo is None):
+            await interaction.followup.send("⚠️ Informe **um** entre mensagem_id e arquivo.", ephemeral=True)
+            return
+        if titulo and len(titulo) > 256:
+            await interaction.followup.send("⚠️ Título muito grande (máx 256).", ephemeral=True)
+            return
+
+        if arquivo is not None:
+            try:
+                text = await _read_text_attachment(self._http(), arquivo)
+            except Exception as e:
+                await interaction.followup.send(f"⚠️ Não consegui ler o arquivo: {e}", ephemeral=True)
+                return
+        else:
+            try:
+                mid = int(mensagem_id.strip())
+            except ValueError:
+                await interaction.followup.send("⚠️ mensagem_id inválido. Copie o ID da mensagem.", ephemeral=True)
+                return
+            src_channel = interaction.channel
+            if not isinstance(src_channel, discord.TextChannel):
+                await interaction.followup.send("Use esse comando em um canal de texto do servidor.", ephemeral=True)
+                return
+            try:
+                msg = await src_channel.fetch_message(mid)
+            except Exception:
+                await interaction.followup.send("⚠️ Não encontrei essa mensagem nesse canal.", ephemeral=True)
+                return
+            text = (msg.content or "").replace("\r\n", "\n").replace("\r", "\n").strip()
+            if not text:
+                await interaction.followup.send("⚠️ A mensagem está vazia.", ephemeral=True)
+                return
+
+        try:
+            template = await self.bot.templates.save(guild.id, nome, titulo, text, created_by_id=interaction.user.id)
+        except ValueError as e:
+            await interaction.followup.send(f"⚠️ {e}", ephemeral=True)
+            return
+
+        kind = "embed" if template.is_embed else "texto"
+        await interaction.followup.send(
+            f"✅ Template **{template.name}** salvo ({kind}, {len(template.body)} chars). Use `/template_enviar`.",
+            ephemeral=True,
+        )
+
+    @app_commands.command(name="template_enviar", description="Posta um template salvo em um canal (admin).")
+    @app_commands.describe(membro="Quem preenche {member}/{member_name} (padrão: você)")
+    @app_commands.autocomplete(nome=_template_names)
+    @app_commands.checks.has_permissions(administrator=True)
+    async def template_enviar(
+        self,
+        interaction: discord.Interaction,
+        nome: str,
+        canal: discord.TextChannel,
+        pingar: bool = False,
+        membro: discord.Member | None = None,
+    ) -> None:
+        await interaction.response.defer(ephemeral=True)
+
+        template = await self.bot.templates.get(canal.guild.id, nome)
+        if template is None:
+            await interaction.followup.send(f"❌ Template **{nome}** não existe. Veja `/template_listar`.", ephemeral=True)
+            return
+
+        title, text = template.render(member=membro or interaction.user, guild=canal.guild, channel=canal)
+        try:
+            if template.is_embed:
+                sent = await send_embeds(
+                    canal, self._pages(title, text, canal.guild), allowed_mentions=_safe_allowed_mentions(pingar)
+                )
+            else:
+                sent = await send_text(canal, text, allowed_mentions=_safe_allowed_mentions(pingar))
+        except Exception as e:
+            await interaction.followup.send(f"⛔ Falha ao enviar: `{type(e).__name__}`", ephemeral=True)
+            return
+
+        await interaction.followup.send(f"✅ Template **{template.name}** enviado em {canal.mention}{_parts(sent)}", ephemeral=True)
+
+    @app_commands.command(name="template_listar", description="Lista os templates de mensagem salvos (admin).")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def template_listar(self, interaction: discord.Interaction) -> None:
+        if interaction.guild_id is None:
+            await interaction.response.send_message("Use no servidor.", ephemeral=True)
+            return
+
+        names = await self.bot.templates.names(interaction.guild_id)
+        placeholders = " ".join(f"`{{{p}}}`" for p in PLACEHOLDERS)
+        body = ("\n".join(f"📝 **{n}**" for n in names) if names else "Nenhum template salvo.") + (
+            f"\n\n🔧 Placeholders: {placeholders}"
+        )
+        embed = self.bot.embeds.branded("TEMPLATES")
+        embed.description = format_embed_body(body)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="template_apagar", description="Apaga um template de mensagem (admin).")
+    @app_commands.autocomplete(nome=_template_names)
+    @app_commands.checks.has_permissions(administrator=True)
+    async def template_apagar(self, interaction: discord.Interaction, nome: str) -> None:
+        if interaction.guild_id is None:
+            await interaction.response.send_message("Use no servidor.", ephemeral=True)
+            return
+
+        if await self.bot.templates.delete(interaction.guild_id, nome):
+            msg = f"🗑️ Template **{nome}** apagado."
+        else:
+            msg = f"❌ Template **{nome}** não existe."
+        await interaction.response.send_message(msg, ephemeral=True)
 
     # =========================
     # /anuncio (canal fixo via env)
     # =========================
     @app_commands.command(name="anuncio", description="Enviar anúncio no canal oficial de anúncios (admin).")
+    @app_commands.describe(dm_cargo="Também manda o anúncio por DM para todos os membros deste cargo")
     @app_commands.checks.has_permissions(administrator=True)
     async def anuncio(
         self,
@@ -280,10 +494,11 @@ class MessagesCog(commands.Cog):
         titulo: str,
         texto: str,
         pingar_everyone: bool = False,
+        dm_cargo: discord.Role | None = None,
     ) -> None:
         await interaction.response.defer(ephemeral=True)
 
-        if not getattr(settings, "announce_channel_id", None):
+        if not self.settings.announce_channel_id:
             await interaction.followup.send("⚠️ ANNOUNCE_CHANNEL_ID não definido no host.", ephemeral=True)
             return
 
@@ -292,7 +507,7 @@ class MessagesCog(commands.Cog):
             await interaction.followup.send("Use no servidor.", ephemeral=True)
             return
 
-        ch = guild.get_channel(settings.announce_channel_id)
+        ch = guild.get_channel(self.settings.announce_channel_id)
         if not isinstance(ch, discord.TextChannel):
             await interaction.followup.send("⚠️ ANNOUNCE_CHANNEL_ID inválido (canal não encontrado).", ephemeral=True)
             return
@@ -300,34 +515,60 @@ class MessagesCog(commands.Cog):
         if len(titulo) > 256:
             await interaction.followup.send("⚠️ Título muito grande (máx 256).", ephemeral=True)
             return
-        if len(texto) > 3800:
-            await interaction.followup.send("⚠️ Texto grande demais. Use /enviarembed_txt e poste no canal.", ephemeral=True)
+        if len(texto) > MAX_TEXT_CHARS:
+            await interaction.followup.send(f"⚠️ Texto grande demais (máx {MAX_TEXT_CHARS}).", ephemeral=True)
             return
 
-        embed = make_embed(
-            title="ANÚNCIO",
-            footer=settings.bot_name,
-            author_name=f"{settings.bot_name} • avisos",
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
-            thumbnail_url=guild.icon.url if guild.icon else None,
+        job = await self.bot.jobs.submit(
+            guild.id,
+            ANNOUNCE,
+            {"channel_id": ch.id, "title": titulo.strip(), "text": texto.strip(), "ping_everyone": pingar_everyone},
+            created_by_id=interaction.user.id,
+            report_channel_id=self.settings.admin_channel_id,
         )
+        msg = f"📣 Anúncio **#{job.id}** na fila para {ch.mention}"
+
+        if dm_cargo is not None:
+            dm_job = await self.bot.jobs.submit(
+                guild.id,
+                ANNOUNCE_DM,
+                {"role_id": dm_cargo.id, "title": titulo.strip(), "text": texto.strip()},
+                created_by_id=interaction.user.id,
+                report_channel_id=self.settings.admin_channel_id,
+            )
+            msg += f"\n📨 DMs para {dm_cargo.mention}: job **#{dm_job.id}** (progresso em <#{self.settings.admin_channel_id}>)"
+
+        await interaction.followup.send(msg, ephemeral=True)
+
+    async def _run_announce(self, ctx: JobContext) -> None:
+        params = ctx.params
+        ch = self.bot.get_channel(params["channel_id"])
+        if ch is None:
+            raise JobError("Canal de anúncios não encontrado.")
 
-        body = f"📣 **{titulo.strip()}**\n\n{texto.strip()}"
-        embed.description = format_embed_body(body, add_divider_top=True)
+        first = self.bot.embeds.branded("ANÚNCIO", guild=ch.guild, author_suffix="avisos", thumbnail=True)
+        body = f"📣 **{params['title']}**\n\n{params['text']}"
+        pages = paginate(format_embed_body(body, add_divider_top=True), first)
 
-        content = "@everyone" if pingar_everyone else None
+        # as partes que já saíram antes do restart/falha não são postadas de novo
+        message_ids: list[int] = list(ctx.progress.get("message_ids") or [])
 
+        async def saved(msg: discord.Message) -> None:
+            message_ids.append(msg.id)
+            await ctx.save({"message_ids": message_ids, "total": len(pages)})
+
+        ping = params["ping_everyone"]
         try:
-            await ch.send(
-                content=content,
-                embed=embed,
-                allowed_mentions=discord.AllowedMentions(everyone=pingar_everyone, roles=False, users=True),
+            await send_embeds(
+                ch,
+                pages,
+                content="@everyone" if ping else None,
+                allowed_mentions=discord.AllowedMentions(everyone=ping, roles=False, users=True),
+                skip=len(message_ids),
+                on_sent=saved,
             )
-        except Exception as e:
-            await interaction.followup.send(f"⛔ Falha ao enviar anúncio: `{type(e).__name__}`", ephemeral=True)
-            return
-
-        await interaction.followup.send(f"✅ Anúncio enviado em {ch.mention}", ephemeral=True)
+        except discord.Forbidden:
+            raise JobError("Sem permissão para postar no canal de anúncios.") from None
 
 
 async def setup(bot: commands.Bot) -> None:
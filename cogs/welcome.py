@@ -1,11 +1,9 @@
-import os
 import discord
 from discord.ext import commands
 
-from config import load_settings
-from utils.embeds import make_embed, retro_divider
-
-settings = load_settings()
+from utils.dm_dispatcher import WelcomeDispatcher
+from utils.embeds import retro_divider
+from utils.metrics import timed
 
 
 def _render(text: str, member: discord.Member) -> str:
@@ -15,39 +13,35 @@ def _render(text: str, member: discord.Member) -> str:
 class WelcomeCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self.text = os.getenv("DM_WELCOME_TEXT", "").strip()
-
-    async def _log(self, guild: discord.Guild, msg: str) -> None:
-        if not settings.log_channel_id:
-            return
-        ch = guild.get_channel(settings.log_channel_id)
-        if isinstance(ch, discord.TextChannel):
-            try:
-                await ch.send(msg)
-            except Exception:
-                pass
-
-    @commands.Cog.listener()
-    async def on_member_join(self, member: discord.Member) -> None:
-        guild = member.guild
+        self.settings = bot.settings
+        self.text = bot.settings.dm_welcome_text
+        self._resumed = False
+        self.dispatcher = WelcomeDispatcher(
+            self._build_embed,
+            self._on_dm_blocked,
+            workers=bot.settings.dm_workers,
+            max_queue=bot.settings.dm_queue_size,
+            rate=bot.settings.dm_rate,
+        )
 
-        # log entrada
-        await self._log(guild, f"🟢 ENTROU: {member} ({member.id})")
+    async def cog_load(self) -> None:
+        self.dispatcher.start()
 
-        if not settings.dm_welcome_enabled:
-            return
+    async def cog_unload(self) -> None:
+        await self.dispatcher.stop()
 
-        if not self.text:
+    def _log(self, guild: discord.Guild, msg: str) -> None:
+        if not self.settings.log_channel_id:
             return
+        ch = guild.get_channel(self.settings.log_channel_id)
+        if isinstance(ch, discord.TextChannel):
+            # agrupado em rajadas; não espera o envio
+            self.bot.log_digest.post(ch, msg)
 
+    def _build_embed(self, member: discord.Member) -> discord.Embed:
         text = _render(self.text, member)
 
-        embed = make_embed(
-            title="BEM-VINDO(A)",
-            footer=settings.bot_name,
-            author_name=settings.bot_name,
-            author_icon=self.bot.user.display_avatar.url if self.bot.user else None,
-        )
+        embed = self.bot.embeds.branded("BEM-VINDO(A)")
 
         embed.description = (
             f"{retro_divider()}\n"
@@ -55,15 +49,42 @@ class WelcomeCog(commands.Cog):
             f"{retro_divider()}\n\n"
             f"{text}"
         )
+        return embed
+
+    async def _on_dm_blocked(self, member: discord.Member) -> None:
+        self._log(member.guild, f"⚠️ DM BLOQUEADA: {member.mention}")
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        # boas-vindas que ficaram na fila no último desligamento (uma vez só)
+        if self._resumed:
+            return
+        self._resumed = True
+        for guild in self.bot.guilds:
+            await self.dispatcher.resume(guild)
+
+    @commands.Cog.listener()
+    @timed("listener", "welcome.member_join")
+    async def on_member_join(self, member: discord.Member) -> None:
+        guild = member.guild
+
+        # log entrada
+        self._log(guild, f"🟢 ENTROU: {member} ({member.id})")
+
+        if not self.settings.dm_welcome_enabled:
+            return
+
+        if not self.text:
+            return
 
-        try:
-            await member.send(embed=embed)
-        except Exception:
-            await self._log(guild, f"⚠️ DM BLOQUEADA: {member.mention}")
+        # a DM sai pelo dispatcher; o listener não espera o envio
+        self.dispatcher.submit(member)
 
     @commands.Cog.listener()
+    @timed("listener", "welcome.member_remove")
     async def on_member_remove(self, member: discord.Member) -> None:
-        await self._log(member.guild, f"🔴 SAIU: {member} ({member.id})")
+        self._log(member.guild, f"🔴 SAIU: {member} ({member.id})")
+        await self.dispatcher.forget(member)
 
 
 async def setup(bot: commands.Bot) -> None:
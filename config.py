@@ -2,53 +2,193 @@
 import os
 from dataclasses import dataclass
 
-@dataclass
-class Settings:
-    discord_token: str = os.getenv("DISCORD_TOKEN", "")
-    admin_channel_id: int = int(os.getenv("ADMIN_CHANNEL_ID", "0"))
-    rules_role_id: int = int(os.getenv("RULES_ROLE_ID", "0"))
-    rules_text: str = os.getenv("RULES_TEXT", "")
-    bot_name: str = os.getenv("BOT_NAME", "Robô Duki")
-
-    events_category_id: int = int(os.getenv("EVENTS_CATEGORY_ID", "0"))
-    events_logs_channel_id: int = int(os.getenv("EVENTS_LOGS_CHANNEL_ID", "0"))
-    events_announce_channel_id: int = int(os.getenv("EVENTS_ANNOUNCE_CHANNEL_ID", "0"))
+_TRUE = ("1", "true", "yes")
 
 
-def _get_int(name: str, default: int | None = None) -> int | None:
-    v = os.getenv(name)
-    if v is None:
-        return default
-    v = v.strip()
+def _env_int(name: str, default: int | None = None) -> int | None:
+    v = (os.getenv(name) or "").strip()
     if not v:
         return default
-    return int(v)
+    try:
+        return int(v)
+    except ValueError:
+        raise RuntimeError(f"{name} inválido: esperado um número inteiro, veio {v!r}.") from None
+
+
+def _env_float(name: str, default: float) -> float:
+    v = (os.getenv(name) or "").strip()
+    if not v:
+        return float(default)
+    try:
+        return float(v)
+    except ValueError:
+        raise RuntimeError(f"{name} inválido: esperado um número, veio {v!r}.") from None
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    v = (os.getenv(name) or "").strip().lower()
+    return v in _TRUE if v else default
+
+
+# campos que precisam ser > 0 / >= 1 (nome do campo -> variável de ambiente)
+_POSITIVE = {
+    "role_grant_rate": "ROLE_GRANT_RATE",
+    "role_grant_burst": "ROLE_GRANT_BURST",
+    "dm_rate": "DM_RATE",
+    "announce_dm_rate": "ANNOUNCE_DM_RATE",
+    "chamada_edit_interval": "CHAMADA_EDIT_INTERVAL",
+    "job_progress_interval": "JOB_PROGRESS_INTERVAL",
+    "clean_old_rate": "CLEAN_OLD_RATE",
+    "health_interval": "HEALTH_INTERVAL",
+    "loop_stall_ms": "LOOP_STALL_MS",
+}
+_AT_LEAST_ONE = {
+    "dm_workers": "DM_WORKERS",
+    "dm_queue_size": "DM_QUEUE_SIZE",
+    "announce_dm_workers": "ANNOUNCE_DM_WORKERS",
+    "template_cache_size": "TEMPLATE_CACHE_SIZE",
+    "command_sync_concurrency": "COMMAND_SYNC_CONCURRENCY",
+    "job_workers": "JOB_WORKERS",
+    "job_guild_concurrency": "JOB_GUILD_CONCURRENCY",
+    "clean_sweep_concurrency": "CLEAN_SWEEP_CONCURRENCY",
+    "health_window": "HEALTH_WINDOW",
+}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Configuração do bot.
+    - Os defaults ficam aqui; o ambiente só é lido em load_settings(), então
+      importar este módulo nunca falha.
+    - Imutável: montada uma vez em load_settings() e injetada nos cogs via
+      bot.settings.
+    - Valores fora da faixa derrubam o boot com a variável culpada na
+      mensagem, em vez de quebrar lá na frente.
+    """
+
+    discord_token: str = ""
+    admin_channel_id: int = 0
+    rules_role_id: int = 0
+    rules_text: str = ""
+    bot_name: str = "Robô Duki"
+
+    log_channel_id: int | None = None
+    dm_welcome_enabled: bool = True
+    dm_welcome_text: str = ""
+    announce_channel_id: int | None = None
+
+    events_category_id: int = 0
+    events_logs_channel_id: int = 0
+    events_announce_channel_id: int = 0
+
+    # fila de cargos (botão de regras)
+    role_grant_rate: float = 5.0
+    role_grant_burst: float = 1.0
+
+    # DM de boas-vindas
+    dm_workers: int = 3
+    dm_queue_size: int = 5000
+    dm_rate: float = 2.0
+
+    # /anuncio por DM para um cargo (workers e DMs/s)
+    announce_dm_workers: int = 3
+    announce_dm_rate: float = 2.0
+
+    # templates de mensagem em memória (LRU)
+    template_cache_size: int = 128
+
+    # sync de slash commands no primeiro READY
+    command_sync_concurrency: int = 4
+    command_sync_force: bool = False
+
+    # contagem ao vivo na chamada do karaokê (segundos entre edições)
+    chamada_edit_interval: float = 3.0
+
+    # jobs em background (workers, jobs simultâneos por guild, intervalo do
+    # relatório e backoff base entre tentativas, em segundos)
+    job_workers: int = 4
+    job_guild_concurrency: int = 2
+    job_progress_interval: float = 5.0
+    job_retry_base: float = 30.0
+
+    # /clean (deletes/s de mensagens antigas)
+    clean_old_rate: float = 1.0
+    # /clean_user: canais varridos ao mesmo tempo
+    clean_sweep_concurrency: int = 8
+
+    # endpoint /metrics local (0 = desligado)
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 0
+
+    # amostragem do /health (segundos entre amostras, tamanho da janela)
+    health_interval: float = 5.0
+    health_window: int = 60
+
+    # watchdog de travadas do loop (opt-in)
+    loop_watchdog: bool = False
+    loop_stall_ms: int = 250
+    loop_stall_cooldown: float = 60.0
+
+    def __post_init__(self) -> None:
+        problems = [f"{env} deve ser > 0" for name, env in _POSITIVE.items() if getattr(self, name) <= 0]
+        problems += [f"{env} deve ser >= 1" for name, env in _AT_LEAST_ONE.items() if getattr(self, name) < 1]
+        if self.job_retry_base < 0:
+            problems.append("JOB_RETRY_BASE deve ser >= 0")
+        if self.loop_stall_cooldown < 0:
+            problems.append("LOOP_STALL_COOLDOWN deve ser >= 0")
+        if not 0 <= self.metrics_port <= 65535:
+            problems.append("METRICS_PORT deve estar entre 0 e 65535")
+        if problems:
+            raise RuntimeError("Configuração inválida: " + "; ".join(problems) + ".")
 
 
 def load_settings() -> Settings:
+    """Único ponto que lê o ambiente e monta o Settings do processo (chamado pelo main)."""
     token = os.getenv("DISCORD_TOKEN", "").strip()
     if not token:
         raise RuntimeError("DISCORD_TOKEN não definido.")
 
-    admin_id = _get_int("ADMIN_CHANNEL_ID")
+    admin_id = _env_int("ADMIN_CHANNEL_ID")
     if not admin_id:
         raise RuntimeError("ADMIN_CHANNEL_ID não definido.")
 
-    log_id = _get_int("LOG_CHANNEL_ID", None)
-    dm_enabled = os.getenv("DM_WELCOME_ENABLED", "1").strip().lower() in ("1", "true", "yes")
-
-    announce_id = _get_int("ANNOUNCE_CHANNEL_ID", None)
-
-    rules_role_id = _get_int("RULES_ROLE_ID", None)
-    rules_text = os.getenv("RULES_TEXT", "").strip() or None
-
+    d = Settings
     return Settings(
         discord_token=token,
-        bot_name=os.getenv("BOT_NAME", "Robô Duki").strip() or "Robô Duki",
-        admin_channel_id=int(admin_id),
-        log_channel_id=int(log_id) if log_id else None,
-        dm_welcome_enabled=dm_enabled,
-        announce_channel_id=int(announce_id) if announce_id else None,
-        rules_role_id=int(rules_role_id) if rules_role_id else None,
-        rules_text=rules_text,
+        admin_channel_id=admin_id,
+        rules_role_id=_env_int("RULES_ROLE_ID", d.rules_role_id),
+        rules_text=os.getenv("RULES_TEXT", "").strip(),
+        bot_name=os.getenv("BOT_NAME", "").strip() or d.bot_name,
+        log_channel_id=_env_int("LOG_CHANNEL_ID") or None,
+        dm_welcome_enabled=_env_bool("DM_WELCOME_ENABLED", d.dm_welcome_enabled),
+        dm_welcome_text=os.getenv("DM_WELCOME_TEXT", "").strip(),
+        announce_channel_id=_env_int("ANNOUNCE_CHANNEL_ID") or None,
+        events_category_id=_env_int("EVENTS_CATEGORY_ID", d.events_category_id),
+        events_logs_channel_id=_env_int("EVENTS_LOGS_CHANNEL_ID", d.events_logs_channel_id),
+        events_announce_channel_id=_env_int("EVENTS_ANNOUNCE_CHANNEL_ID", d.events_announce_channel_id),
+        role_grant_rate=_env_float("ROLE_GRANT_RATE", d.role_grant_rate),
+        role_grant_burst=_env_float("ROLE_GRANT_BURST", d.role_grant_burst),
+        dm_workers=_env_int("DM_WORKERS", d.dm_workers),
+        dm_queue_size=_env_int("DM_QUEUE_SIZE", d.dm_queue_size),
+        dm_rate=_env_float("DM_RATE", d.dm_rate),
+        announce_dm_workers=_env_int("ANNOUNCE_DM_WORKERS", d.announce_dm_workers),
+        announce_dm_rate=_env_float("ANNOUNCE_DM_RATE", d.announce_dm_rate),
+        template_cache_size=_env_int("TEMPLATE_CACHE_SIZE", d.template_cache_size),
+        command_sync_concurrency=_env_int("COMMAND_SYNC_CONCURRENCY", d.command_sync_concurrency),
+        command_sync_force=_env_bool("COMMAND_SYNC_FORCE", d.command_sync_force),
+        chamada_edit_interval=_env_float("CHAMADA_EDIT_INTERVAL", d.chamada_edit_interval),
+        job_workers=_env_int("JOB_WORKERS", d.job_workers),
+        job_guild_concurrency=_env_int("JOB_GUILD_CONCURRENCY", d.job_guild_concurrency),
+        job_progress_interval=_env_float("JOB_PROGRESS_INTERVAL", d.job_progress_interval),
+        job_retry_base=_env_float("JOB_RETRY_BASE", d.job_retry_base),
+        clean_old_rate=_env_float("CLEAN_OLD_RATE", d.clean_old_rate),
+        clean_sweep_concurrency=_env_int("CLEAN_SWEEP_CONCURRENCY", d.clean_sweep_concurrency),
+        metrics_host=os.getenv("METRICS_HOST", "").strip() or d.metrics_host,
+        metrics_port=_env_int("METRICS_PORT", d.metrics_port),
+        health_interval=_env_float("HEALTH_INTERVAL", d.health_interval),
+        health_window=_env_int("HEALTH_WINDOW", d.health_window),
+        loop_watchdog=_env_bool("LOOP_WATCHDOG", d.loop_watchdog),
+        loop_stall_ms=_env_int("LOOP_STALL_MS", d.loop_stall_ms),
+        loop_stall_cooldown=_env_float("LOOP_STALL_COOLDOWN", d.loop_stall_cooldown),
     )
@@ -0,0 +1,15 @@
+# conftest.py
+# na raiz de propósito: o pytest põe este diretório no sys.path e os
+# testes importam utils/cogs/config como o main.py
+import pytest
+
+from utils import database
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Banco SQLite novo e migrado por teste; o pool abre no primeiro uso."""
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "test.db"))
+    database.init_db()
+    yield
+    database.get_pool().close()
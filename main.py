@@ -1,41 +1,163 @@
+import time
+
+from utils import startup
+
+# antes dos outros imports, para medir cada um (STARTUP_PROFILE=1)
+startup.begin()
+
 import discord
+from discord import app_commands
 from discord.ext import commands
-from config import Settings
+
+from config import Settings, load_settings
+from utils import database, event_service, metrics
+from utils.command_sync import sync_commands
+from utils.dm_fanout import DmFanout
+from utils.embeds import EmbedTemplates
+from utils.health import HealthSampler
+from utils.jobs import JobScheduler
+from utils.log_digest import LogDigest
+from utils.logging_ import setup_logging
+from utils.purge import PurgeJobs
+from utils.role_grants import RoleGrantWorker
+from utils.signup_board import SignupBoard
+from utils.signups import SignupIngest
+from utils.templates import TemplateStore
+from utils.watchdog import LoopWatchdog
+from views.karaoke_signup import KaraokeSignupView
 from views.verify import VerifyRulesView
 
-settings = Settings()
+startup.profiler.mark("imports")
+logger = setup_logging()
+
+EXTENSIONS = (
+    "cogs.rules",
+    "cogs.events",
+    "cogs.welcome",
+    "cogs.admin",
+    "cogs.cleanup",
+    "cogs.messages",
+)
 
 intents = discord.Intents.default()
 intents.guilds = True
 intents.members = True
 
+
 class DukiBot(commands.Bot):
-    def __init__(self):
+    def __init__(self, settings: Settings | None = None):
         super().__init__(command_prefix="!", intents=intents)
-        self.settings = settings
+        # único Settings do processo; os cogs leem daqui (bot.settings)
+        settings = self.settings = settings or load_settings()
+        self._ran = False
+        self.log_digest = LogDigest()
+        self.embeds = EmbedTemplates(settings.bot_name, self)
+        self.health = HealthSampler(self, interval=settings.health_interval, window=settings.health_window)
+        self.metrics_server = (
+            metrics.MetricsServer(settings.metrics_host, settings.metrics_port) if settings.metrics_port else None
+        )
+        self.role_grants = RoleGrantWorker(rate=settings.role_grant_rate, burst=settings.role_grant_burst)
+        self.signups = SignupIngest()
+        self.jobs = JobScheduler(
+            self,
+            workers=settings.job_workers,
+            per_guild=settings.job_guild_concurrency,
+            progress_interval=settings.job_progress_interval,
+            retry_base=settings.job_retry_base,
+        )
+        self.purges = PurgeJobs(self, old_rate=settings.clean_old_rate, sweep_concurrency=settings.clean_sweep_concurrency)
+        self.dm_fanout = DmFanout(self, workers=settings.announce_dm_workers, rate=settings.announce_dm_rate)
+        self.templates = TemplateStore(capacity=settings.template_cache_size)
+        self.signup_board = SignupBoard(self, self.signups, interval=settings.chamada_edit_interval)
+        self.watchdog = (
+            LoopWatchdog(
+                self._report_stall,
+                threshold=settings.loop_stall_ms / 1000,
+                cooldown=settings.loop_stall_cooldown,
+            )
+            if settings.loop_watchdog
+            else None
+        )
 
     async def setup_hook(self):
-        self.add_view(VerifyRulesView(self.settings.rules_role_id))
+        with startup.profiler.phase("setup_hook"):
+            await self._setup()
 
-        await self.load_extension("cogs.rules")
-        await self.load_extension("cogs.events")
-        await self.load_extension("cogs.welcome")
-        await self.load_extension("cogs.admin")
-        await self.load_extension("cogs.cleanup")
+    async def _setup(self) -> None:
+        # schema + pool de conexões antes de qualquer cog tocar no banco
+        database.init_db()
+        await database.open_pool()
+        event_service.staff_log_writer.start()
+        self.role_grants.start()
+        self.signups.start()
+        self.dm_fanout.start()
 
-bot = DukiBot()
-bot.run(settings.discord_token)
+        self.add_view(VerifyRulesView(self.settings.rules_role_id))
+        self.add_view(KaraokeSignupView(0))
+        await self.signup_board.recover()
 
+        for ext in EXTENSIONS:
+            with startup.profiler.phase(f"load {ext}"):
+                await self.load_extension(ext)
 
         # Comandos apenas no canal admin
         async def only_admin_channel(interaction: discord.Interaction) -> bool:
             if interaction.guild is None:
                 raise app_commands.CheckFailure("Comandos só no servidor.")
-            if interaction.channel_id != settings.admin_channel_id:
-                raise app_commands.CheckFailure(f"❌ Use comandos só em <#{settings.admin_channel_id}>.")
+            if interaction.channel_id != self.settings.admin_channel_id:
+                raise app_commands.CheckFailure(f"❌ Use comandos só em <#{self.settings.admin_channel_id}>.")
             return True
 
-        self.tree.interaction_check = only_admin_channel
+        async def interaction_check(interaction: discord.Interaction) -> bool:
+            metrics.start_interaction(interaction)
+            return await only_admin_channel(interaction)
+
+        self.tree.interaction_check = interaction_check
+        self.tree.on_error = self.on_app_command_error
+
+        metrics.registry.add_collector("staff_logs", event_service.staff_log_writer.stats)
+        metrics.registry.add_collector("open_event_cache", event_service.open_event_cache.stats)
+        metrics.registry.add_collector("role_grants", self.role_grants.stats)
+        metrics.registry.add_collector("signups", self.signups.stats)
+        metrics.registry.add_collector("signup_board", self.signup_board.stats)
+        metrics.registry.add_collector("log_digest", self.log_digest.stats)
+        metrics.registry.add_collector("jobs", self.jobs.stats)
+        metrics.registry.add_collector("dm_fanout", self.dm_fanout.stats)
+        metrics.registry.add_collector("templates", self.templates.stats)
+        metrics.registry.add_collector("process", self.health.stats)
+        if startup.profiler.enabled:
+            metrics.registry.add_collector("startup", startup.profiler.stats)
+        self.health.start()
+        if self.watchdog is not None:
+            metrics.registry.add_collector("loop_watchdog", self.watchdog.stats)
+            self.watchdog.start()
+        if self.metrics_server is not None:
+            await self.metrics_server.start()
+
+    async def close(self) -> None:
+        # posta o que sobrou no canal de log enquanto ainda há conexão
+        await self.log_digest.flush()
+        await self.signup_board.flush()
+        # jobs em andamento voltam para a fila e retomam no próximo boot
+        await self.jobs.stop()
+        await super().close()
+        await self.health.stop()
+        if self.watchdog is not None:
+            await self.watchdog.stop()
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+        await self.role_grants.stop()
+        await self.signups.stop()
+        await self.dm_fanout.stop()
+        # grava os logs pendentes antes de fechar as conexões
+        await event_service.staff_log_writer.stop()
+        await database.close_pool()
+
+    async def login(self, token: str) -> None:
+        # o discord.py roda o setup_hook dentro do login; aqui fica só o HTTP
+        with startup.profiler.phase("login", exclude=("setup_hook",)):
+            await super().login(token)
+        startup.profiler.mark("login")
 
     async def on_ready(self) -> None:
         logger.info("Online como %s (id=%s).", self.user, self.user.id)
@@ -44,6 +166,17 @@ bot.run(settings.discord_token)
         if self._ran:
             return
         self._ran = True
+        startup.profiler.mark("first_ready")
+        startup.profiler.finish()
+
+        # jobs dependem do cache de canais: só sobem depois do primeiro READY;
+        # falha aqui não pode impedir o registro dos comandos abaixo
+        try:
+            resumed = await self.jobs.start()
+            if resumed:
+                logger.info("Jobs retomados: %s.", resumed)
+        except Exception:
+            logger.exception("Falha ao iniciar o agendador de jobs.")
 
         # pega o application id
         app_id = self.application_id
@@ -52,31 +185,45 @@ bot.run(settings.discord_token)
             app_id = app.id
 
         try:
+            t0 = time.perf_counter()
             local_cmds = self.tree.get_commands()
-            logger.info("DEBUG local commands: %s", [c.name for c in local_cmds])
-
             payload = [c.to_dict(self.tree) for c in local_cmds]
-            logger.info("DEBUG payload_count: %s", len(payload))
+            build_ms = (time.perf_counter() - t0) * 1000
+            logger.info("Local commands (%s): %s", len(payload), [c.name for c in local_cmds])
 
-            # 1) Zera global (para não “vazar” comandos fora do guild)
-            logger.info("STEP 1: overwriting GLOBAL commands -> empty")
-            await self.http.bulk_upsert_global_commands(app_id, [])
-            logger.info("OK 1: Global commands overwritten with EMPTY list (nuked).")
-
-            # 2) Publica comandos no(s) guild(s) onde o bot está
-            for g in self.guilds:
-                logger.info("STEP 2: overwriting GUILD commands -> guild=%s (%s)", g.id, g.name)
-                await self.http.bulk_upsert_guild_commands(app_id, g.id, payload)
-                logger.info("OK 2: Guild commands overwritten: guild=%s (%s) count=%s", g.id, g.name, len(payload))
+            # só sobrescreve escopos cujo payload mudou desde o último sync
+            report = await sync_commands(
+                self.http,
+                app_id,
+                list(self.guilds),
+                payload,
+                concurrency=self.settings.command_sync_concurrency,
+                force=self.settings.command_sync_force,
+            )
+            logger.info("Command sync: build=%.0fms %s", build_ms, report.summary())
 
         except Exception:
             logger.exception("Hard overwrite of commands failed.")
 
+    # assets em cache nos embeds da marca
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
+        self.embeds.invalidate_guild(after.id)
+
+    def _report_stall(self, text: str) -> None:
+        ch = self.get_channel(self.settings.log_channel_id) if self.settings.log_channel_id else None
+        if ch is not None:
+            self.log_digest.post(ch, text)
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command) -> None:
+        metrics.finish_interaction(interaction)
+
     async def on_app_command_error(
         self,
         interaction: discord.Interaction,
         error: app_commands.AppCommandError,
     ) -> None:
+        metrics.finish_interaction(interaction, error=True)
+
         # erros de check (canal admin, permissão, etc.)
         if isinstance(error, app_commands.CheckFailure):
             msg = str(error) or "❌ Comando não permitido aqui."
@@ -100,7 +247,8 @@ bot.run(settings.discord_token)
 
 
 def main() -> None:
-    bot = RoboDukiBot()
+    settings = load_settings()
+    bot = DukiBot(settings)
     bot.run(settings.discord_token)
 
 
@@ -0,0 +1,73 @@
+# tests/test_config.py
+import dataclasses
+
+import pytest
+
+from config import Settings, load_settings
+
+
+def test_defaults_are_valid():
+    settings = Settings()
+    assert settings.dm_workers == 3
+    assert settings.metrics_port == 0
+
+
+@pytest.mark.parametrize(
+    "field, value, env",
+    [
+        ("dm_rate", 0.0, "DM_RATE deve ser > 0"),
+        ("loop_stall_ms", -1, "LOOP_STALL_MS deve ser > 0"),
+        ("job_workers", 0, "JOB_WORKERS deve ser >= 1"),
+        ("template_cache_size", 0, "TEMPLATE_CACHE_SIZE deve ser >= 1"),
+        ("job_retry_base", -1.0, "JOB_RETRY_BASE deve ser >= 0"),
+        ("loop_stall_cooldown", -0.5, "LOOP_STALL_COOLDOWN deve ser >= 0"),
+        ("metrics_port", 70000, "METRICS_PORT deve estar entre 0 e 65535"),
+    ],
+)
+def test_post_init_rejects_out_of_range(field, value, env):
+    with pytest.raises(RuntimeError, match=env):
+        Settings(**{field: value})
+
+
+def test_post_init_reports_every_problem():
+    with pytest.raises(RuntimeError) as exc:
+        Settings(dm_workers=0, health_interval=0.0, metrics_port=-1)
+    message = str(exc.value)
+    for env in ("DM_WORKERS", "HEALTH_INTERVAL", "METRICS_PORT"):
+        assert env in message
+
+
+def test_zero_is_allowed_where_documented():
+    settings = Settings(job_retry_base=0.0, loop_stall_cooldown=0.0, metrics_port=0)
+    assert settings.job_retry_base == 0.0
+
+
+def test_settings_is_frozen():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        Settings().dm_workers = 5
+
+
+def test_load_settings_reads_env(monkeypatch):
+    monkeypatch.setenv("DISCORD_TOKEN", " abc ")
+    monkeypatch.setenv("ADMIN_CHANNEL_ID", "123")
+    monkeypatch.setenv("DM_WORKERS", "7")
+    monkeypatch.setenv("LOOP_WATCHDOG", "yes")
+    monkeypatch.delenv("BOT_NAME", raising=False)
+    settings = load_settings()
+    assert settings.discord_token == "abc"
+    assert settings.admin_channel_id == 123
+    assert settings.dm_workers == 7
+    assert settings.loop_watchdog is True
+    assert settings.bot_name == Settings.bot_name
+
+
+def test_load_settings_names_the_bad_variable(monkeypatch):
+    monkeypatch.setenv("DISCORD_TOKEN", "abc")
+    monkeypatch.setenv("ADMIN_CHANNEL_ID", "abc")
+    with pytest.raises(RuntimeError, match="ADMIN_CHANNEL_ID inválido"):
+        load_settings()
+
+    monkeypatch.setenv("ADMIN_CHANNEL_ID", "1")
+    monkeypatch.setenv("DM_WORKERS", "0")
+    with pytest.raises(RuntimeError, match="DM_WORKERS deve ser >= 1"):
+        load_settings()
@@ -0,0 +1,72 @@
+# tests/test_dm_dispatcher.py
+import asyncio
+import types
+
+import discord
+import pytest
+
+from utils import database
+from utils.dm_dispatcher import WelcomeDispatcher
+
+pytestmark = pytest.mark.usefixtures("temp_db")
+
+
+class _Member:
+    def __init__(self, guild, member_id: int) -> None:
+        self.guild = guild
+        self.id = member_id
+        self.dms = 0
+
+    async def send(self, **kwargs) -> None:
+        self.dms += 1
+
+
+def _dispatcher() -> WelcomeDispatcher:
+    return WelcomeDispatcher(lambda m: discord.Embed(), workers=1, rate=1000)
+
+
+async def _statuses() -> dict[int, str]:
+    rows = await database.fetchall("SELECT user_id, status FROM welcomed_members", ())
+    return {r["user_id"]: r["status"] for r in rows}
+
+
+def test_stop_after_send_keeps_member_as_sent():
+    guild = types.SimpleNamespace(id=1)
+    members = {i: _Member(guild, i) for i in (1, 2)}
+    guild.get_member = members.get
+
+    async def first_boot():
+        dispatcher = _dispatcher()
+        dispatcher.start()
+        put = dispatcher._marks.put
+        blocked = asyncio.Event()
+
+        async def backpressure(row):
+            # writer cheio: a marca do envio fica presa até o cancelamento
+            if row[2] == "sent":
+                blocked.set()
+                await asyncio.Event().wait()
+            return await put(row)
+
+        dispatcher._marks.put = backpressure
+        for member in members.values():
+            dispatcher.submit(member)
+        await blocked.wait()
+        dispatcher._marks.put = put
+        await dispatcher.stop()
+        return await _statuses()
+
+    async def second_boot():
+        dispatcher = _dispatcher()
+        dispatcher.start()
+        resumed = await dispatcher.resume(guild)
+        while dispatcher.stats()["sent"] < resumed:
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+        return resumed, await _statuses()
+
+    assert asyncio.run(first_boot()) == {1: "sent", 2: "pending"}
+    resumed, statuses = asyncio.run(second_boot())
+    assert resumed == 1
+    assert statuses == {1: "sent", 2: "sent"}
+    assert (members[1].dms, members[2].dms) == (1, 1)
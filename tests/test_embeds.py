@@ -0,0 +1,40 @@
+# tests/test_embeds.py
+import discord
+
+from utils.embeds import EmbedTemplates, make_embed
+
+
+class _User:
+    def __init__(self, avatar: str) -> None:
+        self.id = 111
+        self.avatar = avatar
+
+    @property
+    def display_avatar(self) -> discord.Asset:
+        return discord.Asset._from_avatar(None, self.id, self.avatar)
+
+
+def test_branded_matches_make_embed():
+    user = _User("a" * 32)
+    templates = EmbedTemplates("Robô Duki")
+    old = make_embed(
+        title="STATUS",
+        footer="Robô Duki",
+        author_name="Robô Duki • status",
+        author_icon=user.display_avatar.url,
+    )
+    new = templates.branded("STATUS", user=user, author_suffix="status")
+    assert new.to_dict() == old.to_dict()
+
+
+def test_avatar_change_refreshes_cached_embeds():
+    user = _User("a" * 32)
+    templates = EmbedTemplates("Robô Duki")
+    first = templates.branded("STATUS", user=user)
+    assert first.author.icon_url == user.display_avatar.url
+
+    # troca de avatar da própria conta: sem evento, a key do asset muda
+    user.avatar = "b" * 32
+    second = templates.branded("STATUS", user=user)
+    assert second.author.icon_url == user.display_avatar.url
+    assert second.author.icon_url != first.author.icon_url
@@ -0,0 +1,205 @@
+# tests/test_jobs.py
+import asyncio
+import time
+import types
+
+import pytest
+
+from utils import database
+from utils.jobs import CANCELLED, DONE, FAILED, PENDING, GET_JOB_SQL, JobError, JobScheduler, JobType
+
+pytestmark = pytest.mark.usefixtures("temp_db")
+
+
+def _scheduler(**kwargs) -> JobScheduler:
+    # sem report_channel_id o scheduler nunca toca no client
+    return JobScheduler(types.SimpleNamespace(), workers=2, **kwargs)
+
+
+def _kind(run, name: str = "test", max_attempts: int = 3) -> JobType:
+    return JobType(name, "TESTE", run, lambda job: job.status, max_attempts)
+
+
+async def _wait(scheduler: JobScheduler, job_id: int, *statuses: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = await scheduler.get(job_id)
+        if job.status in statuses:
+            return job
+        assert time.monotonic() < deadline, f"job #{job_id} parou em {job.status}"
+        await asyncio.sleep(0.01)
+
+
+def test_unexpected_error_retries_with_backoff():
+    calls: list[float] = []
+
+    async def flaky(ctx):
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            raise RuntimeError("boom")
+
+    async def scenario():
+        scheduler = _scheduler(retry_base=0.05)
+        scheduler.register(_kind(flaky))
+        await scheduler.start()
+        job = await scheduler.submit(1, "test", {})
+        job = await _wait(scheduler, job.id, DONE)
+        await scheduler.stop()
+        return scheduler, job
+
+    scheduler, job = asyncio.run(scenario())
+    assert job.attempts == 3
+    assert job.error is None
+    assert scheduler.stats()["retried"] == 2
+    # retry_base * 2^(n-1): 0.05s e depois 0.1s
+    assert calls[1] - calls[0] >= 0.05
+    assert calls[2] - calls[1] >= 0.1
+
+
+def test_gives_up_after_max_attempts():
+    async def broken(ctx):
+        raise RuntimeError("boom")
+
+    async def scenario():
+        scheduler = _scheduler(retry_base=0.0)
+        scheduler.register(_kind(broken, max_attempts=2))
+        await scheduler.start()
+        job = await scheduler.submit(1, "test", {})
+        job = await _wait(scheduler, job.id, FAILED)
+        await scheduler.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.attempts == 2
+    assert job.error == "RuntimeError"
+
+
+def test_job_error_fails_without_retry():
+    async def refuse(ctx):
+        raise JobError("Canal não existe mais.")
+
+    async def scenario():
+        scheduler = _scheduler(retry_base=0.0)
+        scheduler.register(_kind(refuse))
+        await scheduler.start()
+        job = await scheduler.submit(1, "test", {})
+        job = await _wait(scheduler, job.id, FAILED)
+        await scheduler.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.attempts == 1
+    assert job.error == "Canal não existe mais."
+
+
+def test_stop_requeues_and_start_resumes_from_checkpoint():
+    seen: list[dict] = []
+
+    async def long_job(ctx):
+        seen.append(dict(ctx.progress))
+        if ctx.progress.get("step"):
+            return
+        await ctx.save({"step": 1})
+        await asyncio.sleep(3600)
+
+    async def first_boot():
+        scheduler = _scheduler()
+        scheduler.register(_kind(long_job))
+        await scheduler.start()
+        job = await scheduler.submit(1, "test", {"x": 1})
+        # espera o checkpoint gravado antes de derrubar o processo
+        while not (await scheduler.get(job.id)).progress:
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+        return job.id
+
+    async def second_boot(job_id: int):
+        row = await database.fetchone(GET_JOB_SQL, (job_id,))
+        assert row["status"] == PENDING
+        scheduler = _scheduler()
+        scheduler.register(_kind(long_job))
+        resumed = await scheduler.start()
+        job = await _wait(scheduler, job_id, DONE)
+        await scheduler.stop()
+        return resumed, job
+
+    job_id = asyncio.run(first_boot())
+    resumed, job = asyncio.run(second_boot(job_id))
+    assert resumed == 1
+    assert seen == [{}, {"step": 1}]
+    assert job.params == {"x": 1}
+
+
+def test_running_job_left_by_a_crash_is_requeued():
+    async def quick(ctx):
+        return
+
+    async def scenario():
+        scheduler = _scheduler()
+        scheduler.register(_kind(quick))
+        job = await scheduler.submit(1, "test", {})
+        # processo caiu com o job em running
+        await database.execute("UPDATE jobs SET status = 'running' WHERE id = ?", (job.id,))
+        fresh = _scheduler()
+        fresh.register(_kind(quick))
+        resumed = await fresh.start()
+        job = await _wait(fresh, job.id, DONE)
+        await fresh.stop()
+        return resumed, job
+
+    resumed, job = asyncio.run(scenario())
+    assert resumed == 1
+    assert job.status == DONE
+
+
+def test_retry_requeues_failed_job_from_checkpoint():
+    seen: list[dict] = []
+
+    async def once_broken(ctx):
+        seen.append(dict(ctx.progress))
+        if not ctx.progress:
+            await ctx.save({"step": 1})
+            raise JobError("sem permissão")
+
+    async def scenario():
+        scheduler = _scheduler()
+        scheduler.register(_kind(once_broken))
+        await scheduler.start()
+        job = await scheduler.submit(1, "test", {})
+        await _wait(scheduler, job.id, FAILED)
+        retried = await scheduler.retry(job.id)
+        assert retried is not None and retried.attempts == 0
+        job = await _wait(scheduler, job.id, DONE)
+        # só falho/cancelado volta para a fila
+        assert await scheduler.retry(job.id) is None
+        await scheduler.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert seen == [{}, {"step": 1}]
+    assert job.attempts == 1
+    assert job.error is None
+
+
+def test_cancel_running_job():
+    started = []
+
+    async def forever(ctx):
+        started.append(ctx.job.id)
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        scheduler = _scheduler()
+        scheduler.register(_kind(forever))
+        await scheduler.start()
+        job = await scheduler.submit(1, "test", {})
+        while not started:
+            await asyncio.sleep(0.01)
+        assert await scheduler.cancel(job.id)
+        job = await _wait(scheduler, job.id, CANCELLED)
+        await scheduler.stop()
+        return scheduler, job
+
+    scheduler, job = asyncio.run(scenario())
+    assert job.finished_at is not None
+    assert scheduler.stats()["cancelled"] == 1
@@ -0,0 +1,68 @@
+# tests/test_open_event_cache.py
+from utils import event_service
+from utils.event_service import OpenEventCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_miss_then_hit():
+    cache = OpenEventCache()
+    assert cache.get(1) == (False, None)
+    cache.put(1, {"id": 9})
+    assert cache.get(1) == (True, {"id": 9})
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_caches_absence():
+    cache = OpenEventCache()
+    cache.put(1, None)
+    assert cache.get(1) == (True, None)
+
+
+def test_ttl_expires(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(event_service.time, "monotonic", clock)
+    cache = OpenEventCache(ttl=60.0)
+    cache.put(1, {"id": 9})
+    clock.now += 59.9
+    assert cache.get(1) == (True, {"id": 9})
+    clock.now += 0.2
+    assert cache.get(1) == (False, None)
+
+
+def test_stale_put_after_invalidate_is_dropped():
+    cache = OpenEventCache()
+    generation = cache.generation(1)
+    # create_event/set_event_status invalidam enquanto a leitura está no banco
+    cache.invalidate(1)
+    cache.put(1, {"id": 9}, generation)
+    assert cache.get(1) == (False, None)
+
+    cache.put(1, {"id": 10}, cache.generation(1))
+    assert cache.get(1) == (True, {"id": 10})
+
+
+def test_generation_is_per_guild():
+    cache = OpenEventCache()
+    generation = cache.generation(2)
+    cache.invalidate(1)
+    cache.put(2, {"id": 5}, generation)
+    assert cache.get(2) == (True, {"id": 5})
+
+
+def test_invalidate_and_clear():
+    cache = OpenEventCache()
+    cache.put(1, {"id": 1})
+    cache.put(2, None)
+    cache.invalidate(1)
+    assert cache.get(1) == (False, None)
+    assert cache.invalidations == 1
+    cache.clear()
+    assert cache.get(2) == (False, None)
+    assert cache.stats()["size"] == 0
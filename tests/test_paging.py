@@ -0,0 +1,86 @@
+# tests/test_paging.py
+import random
+
+import discord
+
+from utils.paging import (
+    EMBED_DESC_MAX,
+    EMBED_TOTAL_MAX,
+    EMBEDS_PER_MESSAGE,
+    paginate,
+    split_text,
+)
+
+
+def _words(n: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    return " ".join("".join(rng.choice("abcdefghij") for _ in range(rng.randint(2, 9))) for _ in range(n))
+
+
+def _first() -> discord.Embed:
+    embed = discord.Embed(title="ANÚNCIO")
+    embed.set_author(name="Robô Duki • avisos")
+    embed.set_footer(text="Robô Duki")
+    return embed
+
+
+def _squash(text: str) -> str:
+    return "".join(text.split())
+
+
+def _check_limits(messages: list[list[discord.Embed]], page_max: int, message_max: int, per_message: int) -> None:
+    for embeds in messages:
+        assert 1 <= len(embeds) <= per_message
+        assert sum(len(e) for e in embeds) <= message_max
+        for e in embeds:
+            assert len(e.description or "") <= page_max
+
+
+def test_split_text_fits_limit_and_prefers_paragraphs():
+    paras = [_words(40, seed=i) for i in range(6)]
+    chunks = split_text("\n\n".join(paras), 600)
+    assert all(len(c) <= 600 for c in chunks)
+    # cada parágrafo cabe no limite: nenhum é cortado ao meio
+    for para in paras:
+        assert any(para in c for c in chunks)
+
+
+def test_split_text_cuts_between_words_then_hard():
+    text = _words(300)
+    chunks = split_text(text, 100)
+    assert all(len(c) <= 100 for c in chunks)
+    assert " ".join(chunks) == text
+
+    chunks = split_text("x" * 250, 100)
+    assert chunks == ["x" * 100, "x" * 100, "x" * 50]
+
+
+def test_split_text_empty():
+    assert split_text("  \n\n ", 100) == []
+
+
+def test_paginate_short_text_is_one_page():
+    first = _first()
+    messages = paginate("oi", first)
+    assert messages == [[first]]
+    assert first.description == "oi"
+
+
+def test_paginate_respects_api_limits():
+    text = "\n\n".join(_words(random.Random(i).randint(5, 400), seed=i) for i in range(400))
+    messages = paginate(text, _first())
+    assert len(messages) > 1
+    _check_limits(messages, EMBED_DESC_MAX, EMBED_TOTAL_MAX, EMBEDS_PER_MESSAGE)
+    assert messages[0][0].title == "ANÚNCIO"
+    pages = [e.description or "" for embeds in messages for e in embeds]
+    assert _squash("".join(pages)) == _squash(text)
+
+
+def test_paginate_huge_paragraph_fills_pages():
+    # um parágrafo só, bem maior que uma página: as páginas saem cheias
+    text = _words(5000)
+    messages = paginate(text, _first(), page_max=1000, message_max=3000, per_message=4)
+    _check_limits(messages, 1000, 3000, 4)
+    pages = [e.description or "" for embeds in messages for e in embeds]
+    assert all(len(p) > 500 for p in pages[:-1])
+    assert _squash("".join(pages)) == _squash(text)
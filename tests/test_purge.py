@@ -0,0 +1,72 @@
+# tests/test_purge.py
+import asyncio
+import datetime
+
+import pytest
+
+from benchmarks.fake_discord import FakeGuild, FakeHTTP, FakeTextChannel, RouteLimit
+from utils.jobs import CANCELLED, DONE
+from utils.purge import PurgeJob, PurgeProgress
+
+DAY = datetime.timedelta(days=1)
+
+
+def _channel(latency: float = 0.0) -> FakeTextChannel:
+    http = FakeHTTP()
+    http.DEFAULT = RouteLimit(limit=10**6, window=1.0, latency=latency)
+    guild = FakeGuild(http)
+    return guild.add_channel(FakeTextChannel(http, guild, 10))
+
+
+def test_counts_every_lane():
+    channel = _channel()
+    channel.seed(40, age=30 * DAY, spread=DAY, pinned_every=10)
+    channel.seed(150, age=datetime.timedelta(hours=1), spread=DAY, pinned_every=10)
+    job = PurgeJob(1, channel, None, old_rate=10_000)
+
+    asyncio.run(job.run())
+
+    p = job.progress
+    assert job.status == DONE
+    assert (p.scanned, p.deleted_bulk, p.deleted_old, p.skipped, p.failed) == (190, 135, 36, 19, 0)
+    assert len(channel.messages) == 19
+    assert all(m.pinned for m in channel.messages)
+
+
+def test_limit_stops_reading():
+    channel = _channel()
+    channel.seed(250, age=datetime.timedelta(hours=1), spread=DAY)
+    job = PurgeJob(1, channel, 120, old_rate=10_000)
+
+    asyncio.run(job.run())
+
+    assert job.progress.scanned == 120
+    assert len(channel.messages) == 130
+
+
+def test_cancel_and_resume_does_not_recount():
+    # página só de mensagens antigas: cancela no meio da faixa lenta
+    channel = _channel(latency=0.001)
+    channel.seed(60, age=30 * DAY, spread=DAY, pinned_every=5)
+    job = PurgeJob(1, channel, None, old_rate=10_000)
+    checkpoints: list[dict] = []
+
+    async def cancel_midway() -> None:
+        task = asyncio.create_task(job.run(lambda j: checkpoints.append(j.state())))
+        while len(channel.messages) > 40:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+    assert job.status == CANCELLED
+    assert job.progress.cursor is None
+    assert job.progress.skipped == 0
+
+    resumed = PurgeJob(1, channel, None, old_rate=10_000, progress=PurgeProgress.from_dict(checkpoints[-1]))
+    asyncio.run(resumed.run())
+
+    p = resumed.progress
+    assert resumed.status == DONE
+    assert (p.scanned, p.deleted_old, p.skipped) == (60, 48, 12)
@@ -0,0 +1,111 @@
+# tests/test_templates.py
+import asyncio
+import types
+
+import pytest
+
+from utils import database
+from utils.templates import MessageTemplate, TemplateStore, compile_text, normalize_name
+
+
+def test_compile_text_splits_literals_and_placeholders():
+    assert compile_text("Oi {member}, bem-vindo ao {guild}!") == (
+        ("Oi ", "member"),
+        (", bem-vindo ao ", "guild"),
+        ("!", None),
+    )
+
+
+def test_compile_text_escaped_braces_are_literal():
+    pieces = compile_text("{{member}} é {member}")
+    assert pieces == (("{", None), ("member}", None), (" é ", "member"))
+
+
+def test_compile_text_rejects_unknown_placeholder():
+    with pytest.raises(ValueError, match="Placeholder inválido"):
+        compile_text("Oi {usuario}")
+
+
+@pytest.mark.parametrize("text", ["{member:>10}", "{member!r}", "{member_count:05d}"])
+def test_compile_text_rejects_format_spec_and_conversion(text):
+    with pytest.raises(ValueError, match="Placeholder inválido"):
+        compile_text(text)
+
+
+def test_compile_text_rejects_unbalanced_braces():
+    with pytest.raises(ValueError, match="desbalanceadas"):
+        compile_text("Oi {member")
+
+
+def test_render_fills_placeholders():
+    template = MessageTemplate.build(1, "boas vindas", "Olá {member_name}", "{member} • {member_count} no {guild}")
+    member = types.SimpleNamespace(mention="<@7>", display_name="Ana")
+    guild = types.SimpleNamespace(name="Duki", member_count=42)
+    assert template.render(member=member, guild=guild) == ("Olá Ana", "<@7> • 42 no Duki")
+
+
+def test_normalize_name():
+    assert normalize_name("  Boas   Vindas ") == "boas vindas"
+    with pytest.raises(ValueError):
+        normalize_name("   ")
+    with pytest.raises(ValueError):
+        normalize_name("x" * 33)
+
+
+def _slow(monkeypatch, attr: str):
+    # a leitura termina só depois do save/delete concorrente
+    original = getattr(database, attr)
+
+    async def slow(*args):
+        result = await original(*args)
+        await asyncio.sleep(0.05)
+        return result
+
+    monkeypatch.setattr(database, attr, slow)
+    return original
+
+
+@pytest.mark.usefixtures("temp_db")
+def test_store_caches_hits_and_misses():
+    async def scenario():
+        store = TemplateStore()
+        assert await store.get(1, "Aviso") is None
+        assert await store.get(1, " aviso ") is None
+        await store.save(1, "Aviso", None, "oi {member}", created_by_id=2)
+        assert (await store.get(1, "AVISO")).body == "oi {member}"
+        return store.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+@pytest.mark.usefixtures("temp_db")
+def test_get_racing_delete_does_not_cache_stale_row(monkeypatch):
+    async def scenario():
+        store = TemplateStore()
+        await store.save(1, "aviso", None, "oi", created_by_id=2)
+        store._cache.clear()
+        _slow(monkeypatch, "fetchone")
+        reading = asyncio.create_task(store.get(1, "aviso"))
+        await asyncio.sleep(0.01)
+        assert await store.delete(1, "aviso")
+        await reading
+        return await store.get(1, "aviso")
+
+    assert asyncio.run(scenario()) is None
+
+
+@pytest.mark.usefixtures("temp_db")
+def test_names_racing_save_does_not_cache_stale_list(monkeypatch):
+    async def scenario():
+        store = TemplateStore()
+        await store.save(1, "a", None, "oi", created_by_id=2)
+        fetchall = _slow(monkeypatch, "fetchall")
+        reading = asyncio.create_task(store.names(1))
+        await asyncio.sleep(0.01)
+        await store.save(1, "b", None, "oi", created_by_id=2)
+        assert await reading == ["a"]
+        monkeypatch.setattr(database, "fetchall", fetchall)
+        return await store.names(1)
+
+    assert asyncio.run(scenario()) == ["a", "b"]
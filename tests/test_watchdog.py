@@ -0,0 +1,56 @@
+# tests/test_watchdog.py
+import asyncio
+import time
+
+from utils.watchdog import LoopWatchdog
+
+
+def _short_stall() -> None:
+    time.sleep(0.23)
+
+
+def _long_stall() -> None:
+    time.sleep(0.5)
+
+
+def test_reports_the_stall_it_captured():
+    reports: list[str] = []
+
+    async def scenario() -> LoopWatchdog:
+        watchdog = LoopWatchdog(reports.append, threshold=0.25, interval=0.05, cooldown=60.0)
+        watchdog.start()
+        await asyncio.sleep(0.2)
+        # abaixo do threshold: não pode gastar o cooldown nem deixar pilha velha
+        _short_stall()
+        await asyncio.sleep(0.2)
+        _long_stall()
+        await asyncio.sleep(0.2)
+        await watchdog.stop()
+        return watchdog
+
+    watchdog = asyncio.run(scenario())
+    stats = watchdog.stats()
+    assert (stats["stalls"], stats["reported"], stats["suppressed"]) == (1, 1, 0)
+    assert len(reports) == 1
+    assert "_long_stall" in reports[0]
+    assert "_short_stall" not in reports[0]
+
+
+def test_cooldown_suppresses_second_report():
+    reports: list[str] = []
+
+    async def scenario() -> LoopWatchdog:
+        watchdog = LoopWatchdog(reports.append, threshold=0.1, interval=0.02, cooldown=60.0)
+        watchdog.start()
+        await asyncio.sleep(0.1)
+        _long_stall()
+        await asyncio.sleep(0.1)
+        _long_stall()
+        await asyncio.sleep(0.1)
+        await watchdog.stop()
+        return watchdog
+
+    watchdog = asyncio.run(scenario())
+    stats = watchdog.stats()
+    assert (stats["stalls"], stats["reported"], stats["suppressed"]) == (2, 1, 1)
+    assert len(reports) == 1
@@ -0,0 +1,158 @@
+# utils/batch_writer.py
+import asyncio
+import logging
+from typing import Callable, Hashable
+
+from utils import database
+
+logger = logging.getLogger("duki_odyssey.db")
+
+_STOP = object()
+
+
+class BatchWriter:
+    """
+    Write-behind com group commit.
+    - put() só enfileira; o worker grava em lote (executemany, 1 transação).
+    - Flush a cada `max_batch` linhas ou `max_delay_ms`, o que vier primeiro.
+    - Fila limitada: put() espera até `put_timeout` (backpressure) e, se ainda
+      estiver cheia, descarta a linha e conta em `dropped`.
+    - stop() grava tudo o que ainda estiver na fila.
+    - Com `key`, linhas da mesma chave no mesmo lote viram uma só (a última),
+      para upserts em que só o estado final importa.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sql: str,
+        *,
+        max_batch: int = 100,
+        max_delay_ms: int = 500,
+        max_backlog: int = 5000,
+        put_timeout: float = 2.0,
+        key: Callable[[tuple], Hashable] | None = None,
+    ) -> None:
+        self.name = name
+        self.sql = sql
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.put_timeout = put_timeout
+        self.key = key
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_backlog)
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+        self.buffered = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.coalesced = 0
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "buffered": self.buffered,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "pending": self.pending,
+        }
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._closed = False
+            self._task = asyncio.create_task(self._run(), name=f"batch-writer:{self.name}")
+
+    async def put(self, row: tuple) -> bool:
+        if self._closed:
+            self.dropped += 1
+            return False
+        if self._task is None:
+            self.start()
+
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(row), timeout=self.put_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                logger.warning("BatchWriter %s cheio: linha descartada.", self.name)
+                return False
+
+        self.buffered += 1
+        return True
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+
+            batch = [item]
+            stop = False
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    async def _flush(self, batch: list[tuple]) -> None:
+        if self.key is not None:
+            latest = {self.key(row): row for row in batch}
+            self.coalesced += len(batch) - len(latest)
+            batch = list(latest.values())
+        try:
+            await database.executemany(self.sql, batch)
+        except Exception:
+            self.dropped += len(batch)
+            logger.exception("BatchWriter %s: falha ao gravar %s linhas.", self.name, len(batch))
+            return
+        self.flushed += len(batch)
+        self.batches += 1
+
+    async def join(self) -> None:
+        """Espera o que já foi enfileirado chegar ao banco (sem fechar a fila)."""
+        if self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Fecha a fila e espera o worker gravar o que sobrou."""
+        self._closed = True
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.put(_STOP)
+            await self._task
+        self._task = None
+
+        # linhas que entraram depois do sentinela (put em backpressure)
+        leftover = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                leftover.append(item)
+        for i in range(0, len(leftover), self.max_batch):
+            await self._flush(leftover[i:i + self.max_batch])
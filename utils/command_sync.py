@@ -0,0 +1,115 @@
+# utils/command_sync.py
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import discord
+
+from utils import database
+
+logger = logging.getLogger("duki_odyssey.sync")
+
+UPSERT_STATE_SQL = """
+INSERT INTO command_sync_state (scope, payload_hash, synced_at)
+VALUES (?, ?, ?)
+ON CONFLICT(scope) DO UPDATE SET payload_hash = excluded.payload_hash, synced_at = excluded.synced_at
+"""
+
+
+def payload_hash(payload: list[dict]) -> str:
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SyncReport:
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    synced: list[int] = field(default_factory=list)
+    skipped: list[int] = field(default_factory=list)
+    failed: list[int] = field(default_factory=list)
+    global_synced: bool = False
+
+    def summary(self) -> str:
+        t = " ".join(f"{k}={v:.0f}ms" for k, v in self.timings_ms.items())
+        return (
+            f"global={'sync' if self.global_synced else 'skip'} "
+            f"guilds synced={len(self.synced)} skipped={len(self.skipped)} failed={len(self.failed)} | {t}"
+        )
+
+
+async def _load_hashes(app_id: int) -> dict[str, str]:
+    rows = await database.fetchall(
+        "SELECT scope, payload_hash FROM command_sync_state WHERE scope LIKE ?",
+        (f"{app_id}:%",),
+    )
+    return {r["scope"]: r["payload_hash"] for r in rows}
+
+
+async def sync_commands(
+    http,
+    app_id: int,
+    guilds: list[discord.Guild],
+    payload: list[dict],
+    *,
+    concurrency: int = 4,
+    force: bool = False,
+) -> SyncReport:
+    """
+    Sobrescreve os comandos (global vazio + payload por guild), pulando os
+    escopos cujo hash do payload já foi sincronizado antes.
+    Guilds que precisam de sync rodam em paralelo com limite `concurrency`.
+    """
+    report = SyncReport()
+    t_total = time.perf_counter()
+
+    t0 = time.perf_counter()
+    known = {} if force else await _load_hashes(app_id)
+    report.timings_ms["load_hashes"] = (time.perf_counter() - t0) * 1000
+
+    now = datetime.utcnow().isoformat()
+    done: list[tuple] = []
+
+    # 1) global vazio (para não “vazar” comandos fora do guild)
+    t0 = time.perf_counter()
+    global_scope = f"{app_id}:global"
+    global_hash = payload_hash([])
+    if known.get(global_scope) != global_hash:
+        await http.bulk_upsert_global_commands(app_id, [])
+        done.append((global_scope, global_hash, now))
+        report.global_synced = True
+    report.timings_ms["global"] = (time.perf_counter() - t0) * 1000
+
+    # 2) payload por guild
+    t0 = time.perf_counter()
+    guild_hash = payload_hash(payload)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(g: discord.Guild) -> None:
+        scope = f"{app_id}:guild:{g.id}"
+        if known.get(scope) == guild_hash:
+            report.skipped.append(g.id)
+            return
+        async with sem:
+            try:
+                await http.bulk_upsert_guild_commands(app_id, g.id, payload)
+            except Exception:
+                logger.exception("Sync de comandos falhou: guild=%s (%s)", g.id, g.name)
+                report.failed.append(g.id)
+                return
+        done.append((scope, guild_hash, now))
+        report.synced.append(g.id)
+
+    await asyncio.gather(*(one(g) for g in guilds))
+    report.timings_ms["guilds"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    if done:
+        await database.executemany(UPSERT_STATE_SQL, done)
+    report.timings_ms["save_hashes"] = (time.perf_counter() - t0) * 1000
+
+    report.timings_ms["total"] = (time.perf_counter() - t_total) * 1000
+    return report
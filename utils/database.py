@@ -1,9 +1,30 @@
 # utils/database.py
+import asyncio
 import sqlite3
+import threading
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from typing import Any, Callable, Iterable, TypeVar
+
+from utils.metrics import registry as metrics
+
+T = TypeVar("T")
 
 DB_NAME = "duki_bot.db"
 
+# conexões de vida longa (uma por thread do pool)
+POOL_SIZE = 2
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS events (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -60,6 +81,124 @@ CREATE TABLE IF NOT EXISTS staff_logs (
 );
 """
 
+# Migrações versionadas: (versão, nome, script). Só acrescente no final;
+# cada script roda uma única vez, dentro de uma transação.
+MIGRATIONS: list[tuple[int, str, str]] = [
+    (1, "base_schema", SCHEMA),
+    (
+        2,
+        "hot_query_indexes",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_guild_type_status
+            ON events (guild_id, event_type, status, id);
+        CREATE INDEX IF NOT EXISTS idx_event_queue_event_status_pos
+            ON event_queue (event_id, queue_status, queue_position);
+        CREATE INDEX IF NOT EXISTS idx_staff_logs_guild_created
+            ON staff_logs (guild_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_staff_logs_event_created
+            ON staff_logs (event_id, created_at);
+        """,
+    ),
+    (
+        3,
+        "welcomed_members",
+        """
+        CREATE TABLE IF NOT EXISTS welcomed_members (
+            guild_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            welcomed_at TEXT NOT NULL,
+            PRIMARY KEY (guild_id, user_id)
+        );
+        """,
+    ),
+    (
+        4,
+        "command_sync_state",
+        """
+        CREATE TABLE IF NOT EXISTS command_sync_state (
+            scope TEXT PRIMARY KEY,
+            payload_hash TEXT NOT NULL,
+            synced_at TEXT NOT NULL
+        );
+        """,
+    ),
+    (
+        5,
+        "events_signup_message",
+        """
+        ALTER TABLE events ADD COLUMN signup_channel_id INTEGER;
+        ALTER TABLE events ADD COLUMN signup_message_id INTEGER;
+        """,
+    ),
+    (
+        6,
+        "jobs",
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            job_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            params_json TEXT NOT NULL,
+            progress_json TEXT NOT NULL DEFAULT '{}',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            run_after REAL NOT NULL DEFAULT 0,
+            error TEXT,
+            created_by_id INTEGER,
+            report_channel_id INTEGER,
+            report_message_id INTEGER,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status
+            ON jobs (status, id);
+        CREATE INDEX IF NOT EXISTS idx_jobs_guild
+            ON jobs (guild_id, id);
+        """,
+    ),
+    (
+        7,
+        "announcement_deliveries",
+        """
+        CREATE TABLE IF NOT EXISTS announcement_deliveries (
+            job_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            delivered_at TEXT NOT NULL,
+            PRIMARY KEY (job_id, user_id)
+        );
+        """,
+    ),
+    (
+        8,
+        "message_templates",
+        """
+        CREATE TABLE IF NOT EXISTS message_templates (
+            guild_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            title TEXT,
+            body TEXT NOT NULL,
+            created_by_id INTEGER,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (guild_id, name)
+        );
+        """,
+    ),
+]
+
+# Queries quentes e o índice que cada uma precisa usar.
+# nome -> (sql, params de exemplo, nome do índice)
+HOT_QUERIES: dict[str, tuple[str, tuple, str]] = {}
+
+
+def register_hot_query(name: str, sql: str, params: tuple, index: str) -> None:
+    HOT_QUERIES[name] = (sql, params, index)
+
+
 @contextmanager
 def get_conn():
     conn = sqlite3.connect(DB_NAME)
@@ -70,6 +209,190 @@ def get_conn():
     finally:
         conn.close()
 
+def _current_version(conn: sqlite3.Connection) -> int:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """
+    )
+    row = conn.execute("SELECT MAX(version) AS v FROM schema_version").fetchone()
+    return row["v"] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> list[int]:
+    """Aplica, em ordem, as migrações ainda não registradas em schema_version."""
+    current = _current_version(conn)
+    conn.commit()
+
+    applied: list[int] = []
+    for version, name, script in MIGRATIONS:
+        if version <= current:
+            continue
+        # executescript não aceita parâmetros; versão/nome são constantes do código
+        conn.executescript(
+            f"""
+            BEGIN;
+            {script}
+            INSERT INTO schema_version (version, name, applied_at)
+            VALUES ({int(version)}, '{name}', '{datetime.utcnow().isoformat()}');
+            COMMIT;
+            """
+        )
+        applied.append(version)
+    return applied
+
+
 def init_db():
     with get_conn() as conn:
-        conn.executescript(SCHEMA)
+        migrate(conn)
+
+
+def check_query_plans(conn: sqlite3.Connection) -> list[str]:
+    """
+    Roda EXPLAIN QUERY PLAN em cada query quente registrada.
+    Devolve a lista de falhas (query que não usa o índice esperado).
+    """
+    failures: list[str] = []
+    for name, (sql, params, index) in HOT_QUERIES.items():
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        plan = " | ".join(r["detail"] for r in rows)
+        if index not in plan:
+            failures.append(f"{name}: esperado {index}, plano: {plan}")
+    return failures
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class DatabasePool:
+    """
+    Acesso assíncrono ao SQLite.
+    - Cada thread do executor mantém a própria conexão (WAL + pragmas).
+    - O event loop só faz await; nenhum I/O de disco roda nele.
+    - Cada chamada de run() é uma transação: commit no sucesso, rollback no erro.
+    """
+
+    def __init__(self, path: str | None = None, size: int = POOL_SIZE) -> None:
+        self.path = path
+        self.size = size
+        self._executor: ThreadPoolExecutor | None = None
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._executor is not None
+
+    def open(self) -> None:
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.size,
+            thread_name_prefix="duki-db",
+            initializer=self._init_worker,
+        )
+
+    def _init_worker(self) -> None:
+        conn = _connect(self.path or DB_NAME)
+        self._local.conn = conn
+        with self._lock:
+            self._conns.append(conn)
+
+    def _call(self, fn: Callable[..., T], args: tuple) -> T:
+        conn: sqlite3.Connection = self._local.conn
+        try:
+            result = fn(conn, *args)
+            conn.commit()
+            return result
+        except BaseException:
+            conn.rollback()
+            raise
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Roda fn(conn, *args) numa thread do pool e devolve o resultado."""
+        if self._executor is None:
+            self.open()
+        loop = asyncio.get_running_loop()
+        t0 = time.perf_counter()
+        error = False
+        try:
+            return await loop.run_in_executor(self._executor, self._call, fn, args)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            # inclui a espera na fila do executor (é o que o caller sente)
+            metrics.observe("db", fn.__name__.lstrip("_"), time.perf_counter() - t0, error=error)
+
+    def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+
+
+_pool = DatabasePool()
+
+
+def get_pool() -> DatabasePool:
+    return _pool
+
+
+async def open_pool() -> None:
+    _pool.open()
+
+
+async def close_pool() -> None:
+    # shutdown espera as transações em andamento; fora do loop
+    await asyncio.to_thread(_pool.close)
+
+
+async def run(fn: Callable[..., T], *args: Any) -> T:
+    return await _pool.run(fn, *args)
+
+
+def _execute(conn: sqlite3.Connection, sql: str, params: Iterable[Any]) -> int:
+    return conn.execute(sql, tuple(params)).lastrowid
+
+
+def _executemany(conn: sqlite3.Connection, sql: str, rows: list[tuple]) -> int:
+    return conn.executemany(sql, rows).rowcount
+
+
+def _fetchone(conn: sqlite3.Connection, sql: str, params: Iterable[Any]) -> sqlite3.Row | None:
+    return conn.execute(sql, tuple(params)).fetchone()
+
+
+def _fetchall(conn: sqlite3.Connection, sql: str, params: Iterable[Any]) -> list[sqlite3.Row]:
+    return conn.execute(sql, tuple(params)).fetchall()
+
+
+async def execute(sql: str, params: Iterable[Any] = ()) -> int:
+    """Executa um comando e devolve o lastrowid."""
+    return await _pool.run(_execute, sql, params)
+
+
+async def executemany(sql: str, rows: Iterable[tuple]) -> int:
+    """Executa o mesmo comando para várias linhas numa única transação."""
+    return await _pool.run(_executemany, sql, list(rows))
+
+
+async def fetchone(sql: str, params: Iterable[Any] = ()) -> sqlite3.Row | None:
+    return await _pool.run(_fetchone, sql, params)
+
+
+async def fetchall(sql: str, params: Iterable[Any] = ()) -> list[sqlite3.Row]:
+    return await _pool.run(_fetchall, sql, params)
@@ -0,0 +1,187 @@
+# utils/dm_dispatcher.py
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable
+
+import discord
+
+from utils import database
+from utils.batch_writer import BatchWriter
+from utils.rate_limit import TokenBucket, call_with_backoff
+
+logger = logging.getLogger("duki_odyssey.dm")
+
+PENDING = "pending"
+
+MARK_WELCOMED_SQL = """
+INSERT INTO welcomed_members (guild_id, user_id, status, welcomed_at)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(guild_id, user_id) DO UPDATE SET
+    status = excluded.status,
+    welcomed_at = excluded.welcomed_at
+WHERE excluded.status != 'pending' OR welcomed_members.status = 'pending'
+"""
+
+IS_WELCOMED_SQL = "SELECT 1 FROM welcomed_members WHERE guild_id = ? AND user_id = ? AND status != 'pending'"
+
+PENDING_WELCOMES_SQL = "SELECT user_id FROM welcomed_members WHERE guild_id = ? AND status = 'pending'"
+
+FORGET_WELCOMED_SQL = "DELETE FROM welcomed_members WHERE guild_id = ? AND user_id = ?"
+
+database.register_hot_query(
+    "pending_welcomes", PENDING_WELCOMES_SQL, (0,), "sqlite_autoindex_welcomed_members_1"
+)
+
+
+class WelcomeDispatcher:
+    """
+    Envia as DMs de boas-vindas fora do listener.
+    - submit() é O(1): só enfileira (fila limitada).
+    - `workers` tasks consomem a fila, espaçadas por um bucket global de DMs.
+    - 429/5xx: retry com backoff (call_with_backoff).
+    - Quem já recebeu (ou tem DM fechada) fica marcado em welcomed_members,
+      então um restart não repete a DM. A marca vale enquanto o membro
+      está no servidor: forget() (saída) apaga, e quem volta recebe de novo.
+    - stop() grava a fila (e o envio interrompido) como "pending";
+      resume() reenfileira esses membros depois do READY. Quem já recebeu
+      a DM quando o worker foi cancelado fica com o status real.
+    """
+
+    def __init__(
+        self,
+        build_embed: Callable[[discord.Member], discord.Embed],
+        on_blocked: Callable[[discord.Member], Awaitable[None]] | None = None,
+        *,
+        workers: int = 3,
+        max_queue: int = 5000,
+        rate: float = 2.0,
+    ) -> None:
+        self.build_embed = build_embed
+        self.on_blocked = on_blocked
+        self.workers = workers
+        self._queue: asyncio.Queue[discord.Member] = asyncio.Queue(maxsize=max_queue)
+        self._bucket = TokenBucket(rate, max(1.0, rate))
+        self._queued: set[tuple[int, int]] = set()
+        # (membro, status) de quem estava com um worker no stop()
+        self._interrupted: list[tuple[discord.Member, str]] = []
+        self._tasks: list[asyncio.Task] = []
+        self._marks = BatchWriter(
+            "welcomed_members",
+            MARK_WELCOMED_SQL,
+            max_batch=50,
+            max_delay_ms=250,
+            key=lambda row: (row[0], row[1]),
+        )
+
+        self.sent = 0
+        self.blocked = 0
+        self.failed = 0
+        self.skipped = 0
+        self.dropped = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "sent": self.sent,
+            "blocked": self.blocked,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "dropped": self.dropped,
+        }
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._marks.start()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"welcome-dm:{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # quem não recebeu ainda fica pendente para o próximo boot; quem já
+        # recebeu mas não teve a marca gravada fica com o status real
+        members, self._interrupted = self._interrupted, []
+        while not self._queue.empty():
+            members.append((self._queue.get_nowait(), PENDING))
+        now = datetime.utcnow().isoformat()
+        for member, status in members:
+            await self._marks.put((member.guild.id, member.id, status, now))
+        self._queued.clear()
+        await self._marks.stop()
+
+    async def resume(self, guild: discord.Guild) -> int:
+        """Reenfileira as boas-vindas que ficaram pendentes no último stop()."""
+        resumed = 0
+        for row in await database.fetchall(PENDING_WELCOMES_SQL, (guild.id,)):
+            member = guild.get_member(row["user_id"])
+            if member is None:
+                await database.execute(FORGET_WELCOMED_SQL, (guild.id, row["user_id"]))
+            elif self.submit(member):
+                resumed += 1
+        return resumed
+
+    async def forget(self, member: discord.Member) -> None:
+        """Membro saiu: apaga a marca para ele receber a DM se voltar."""
+        # a marca ainda no buffer não pode cair no banco depois do DELETE
+        await self._marks.join()
+        await database.execute(FORGET_WELCOMED_SQL, (member.guild.id, member.id))
+
+    def submit(self, member: discord.Member) -> bool:
+        key = (member.guild.id, member.id)
+        if key in self._queued:
+            return False
+        try:
+            self._queue.put_nowait(member)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Fila de DM cheia: boas-vindas de %s descartada.", member.id)
+            return False
+        self._queued.add(key)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            member = await self._queue.get()
+            # preenchido pelo _deliver assim que o Discord responde
+            outcome: list[str] = []
+            try:
+                await self._deliver(member, outcome)
+            except asyncio.CancelledError:
+                self._interrupted.append((member, outcome[0] if outcome else PENDING))
+                raise
+            except Exception:
+                self.failed += 1
+                logger.exception("Falha ao enviar DM de boas-vindas para %s.", member.id)
+            finally:
+                self._queued.discard((member.guild.id, member.id))
+
+    async def _deliver(self, member: discord.Member, outcome: list[str]) -> None:
+        key = (member.guild.id, member.id)
+        if await database.fetchone(IS_WELCOMED_SQL, key):
+            self.skipped += 1
+            return
+
+        embed = self.build_embed(member)
+        try:
+            await call_with_backoff(lambda: member.send(embed=embed), bucket=self._bucket)
+        except discord.Forbidden:
+            outcome.append("blocked")
+            self.blocked += 1
+            await self._mark(member, "blocked")
+            if self.on_blocked is not None:
+                await self.on_blocked(member)
+            return
+
+        outcome.append("sent")
+        self.sent += 1
+        await self._mark(member, "sent")
+
+    async def _mark(self, member: discord.Member, status: str) -> None:
+        await self._marks.put((member.guild.id, member.id, status, datetime.utcnow().isoformat()))
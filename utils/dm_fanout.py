@@ -0,0 +1,197 @@
+# utils/dm_fanout.py
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime
+
+import discord
+
+from utils import database
+from utils.batch_writer import BatchWriter
+from utils.embeds import format_embed_body
+from utils.jobs import ICONS, RUNNING, Job, JobContext, JobError, JobType
+from utils.paging import paginate
+from utils.rate_limit import TokenBucket, call_with_backoff
+
+ANNOUNCE_DM = "announce_dm"
+
+SENT = "sent"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+UPSERT_DELIVERY_SQL = """
+INSERT INTO announcement_deliveries (job_id, user_id, status, delivered_at)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(job_id, user_id) DO UPDATE SET
+    status = excluded.status,
+    delivered_at = excluded.delivered_at
+"""
+
+DELIVERIES_SQL = "SELECT user_id, status FROM announcement_deliveries WHERE job_id = ?"
+
+database.register_hot_query(
+    "announcement_deliveries", DELIVERIES_SQL, (1,), "sqlite_autoindex_announcement_deliveries_1"
+)
+
+
+def _fmt_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rem = divmod(seconds, 3600)
+    mins, secs = divmod(rem, 60)
+    if hours:
+        return f"{hours}h {mins:02d}m"
+    if mins:
+        return f"{mins}m {secs:02d}s"
+    return f"{secs}s"
+
+
+def describe_announce_dm(job: Job) -> str:
+    p = job.progress
+    total = p.get("total", 0)
+    done = p.get(SENT, 0) + p.get(FAILED, 0) + p.get(BLOCKED, 0)
+    lines = [
+        f"{ICONS.get(job.status, '🕒')} **{job.status}** • DM para <@&{job.params['role_id']}>",
+        f"📣 **{job.params['title']}**",
+        f"👥 **{done}** / {total}" + (f" ({done / total:.0%})" if total else ""),
+        f"📨 Enviadas: **{p.get(SENT, 0)}** • 🚫 DM fechada: **{p.get(BLOCKED, 0)}** • ❗ Falhas: **{p.get(FAILED, 0)}**",
+    ]
+    rate = p.get("rate", 0.0)
+    if job.status == RUNNING and rate > 0 and total > done:
+        lines.append(f"⚡ {rate:.1f}/s • ⏱️ ETA **{_fmt_eta((total - done) / rate)}**")
+    if job.error:
+        lines.append(f"⛔ {job.error}")
+    return "\n".join(lines)
+
+
+class DmFanout:
+    """
+    Anúncio por DM para todos os membros de um cargo (job "announce_dm").
+    - Os alvos saem do cache de membros em streaming, para uma fila
+      limitada; `workers` tasks enviam espaçadas por um bucket compartilhado.
+    - 429/5xx: retry com backoff (call_with_backoff). DM fechada conta como
+      blocked; outros erros como failed. Depois que a primeira página saiu,
+      o membro conta como sent mesmo se uma página seguinte falhar (a
+      retomada reenviaria o anúncio do começo).
+    - Cada destinatário vira uma linha em announcement_deliveries, gravada
+      em lote. A retomada pula quem já recebeu (ou está bloqueado) e tenta
+      de novo só os que falharam.
+    - Progresso (enviados/falhos/bloqueados, taxa e ETA) vai no checkpoint
+      e no relatório do job.
+    """
+
+    def __init__(self, client: discord.Client, *, workers: int = 3, rate: float = 2.0) -> None:
+        self.client = client
+        self.workers = workers
+        self._bucket = TokenBucket(rate, max(1.0, rate))
+        self._writer = BatchWriter(
+            "announcement_deliveries",
+            UPSERT_DELIVERY_SQL,
+            max_batch=200,
+            max_delay_ms=250,
+            key=lambda row: (row[0], row[1]),
+        )
+
+        self.sent = 0
+        self.failed = 0
+        self.blocked = 0
+        # enviados em que alguma página depois da primeira falhou
+        self.partial = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "blocked": self.blocked,
+            "partial": self.partial,
+            **self._writer.stats(),
+        }
+
+    def job_type(self) -> JobType:
+        return JobType(ANNOUNCE_DM, "ANÚNCIO POR DM", self._run, describe_announce_dm)
+
+    def start(self) -> None:
+        self._writer.start()
+
+    async def stop(self) -> None:
+        await self._writer.stop()
+
+    async def _run(self, ctx: JobContext) -> None:
+        params = ctx.params
+        guild = self.client.get_guild(ctx.job.guild_id)
+        if guild is None:
+            raise JobError("Servidor não encontrado.")
+        role_id = params["role_id"]
+        if guild.get_role(role_id) is None:
+            raise JobError("Cargo não existe mais.")
+
+        # o banco é a fonte da verdade: quem já recebeu não recebe de novo
+        counts: Counter = Counter()
+        skip: set[int] = set()
+        for row in await database.fetchall(DELIVERIES_SQL, (ctx.job.id,)):
+            if row["status"] != FAILED:
+                skip.add(row["user_id"])
+                counts[row["status"]] += 1
+
+        members = guild.members
+        total = sum(1 for m in members if not m.bot and m.get_role(role_id) is not None)
+
+        first = self.client.embeds.branded("ANÚNCIO", guild=guild, author_suffix="avisos", thumbnail=True)
+        pages = paginate(format_embed_body(f"📣 **{params['title']}**\n\n{params['text']}", add_divider_top=True), first)
+
+        started = time.monotonic()
+        delivered = 0
+
+        def report() -> None:
+            elapsed = time.monotonic() - started
+            rate = delivered / elapsed if elapsed > 0 else 0.0
+            ctx.checkpoint({"total": total, SENT: counts[SENT], FAILED: counts[FAILED], BLOCKED: counts[BLOCKED], "rate": rate})
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 4)
+
+        async def produce() -> None:
+            for m in members:
+                if m.bot or m.id in skip or m.get_role(role_id) is None:
+                    continue
+                await queue.put(m)
+            for _ in range(self.workers):
+                await queue.put(None)
+
+        async def deliver() -> None:
+            nonlocal delivered
+            while (member := await queue.get()) is not None:
+                status = await self._send(member, pages)
+                await self._writer.put((ctx.job.id, member.id, status, datetime.utcnow().isoformat()))
+                counts[status] += 1
+                delivered += 1
+                report()
+
+        report()
+        tasks = [asyncio.create_task(produce()), *(asyncio.create_task(deliver()) for _ in range(self.workers))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # erro ou cancelamento: nenhum worker continua enviando por fora
+            for task in tasks:
+                task.cancel()
+            report()
+            # o que já saiu fica registrado antes do job mudar de estado
+            await self._writer.join()
+
+    async def _send(self, member: discord.Member, pages: list[list[discord.Embed]]) -> str:
+        # anúncio longo: uma DM por mensagem montada, na ordem
+        for i, embeds in enumerate(pages):
+            try:
+                await call_with_backoff(lambda: member.send(embeds=embeds), bucket=self._bucket)
+            except discord.HTTPException as e:
+                if i:
+                    # a primeira página já saiu: a retomada não pode repetir
+                    # o começo, então conta como enviado (incompleto)
+                    self.partial += 1
+                    break
+                if isinstance(e, discord.Forbidden):
+                    self.blocked += 1
+                    return BLOCKED
+                self.failed += 1
+                return FAILED
+        self.sent += 1
+        return SENT
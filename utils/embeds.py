@@ -28,8 +28,8 @@ def make_embed(
         e.title = title
 
     if author_name:
-        # discord.Embed.Empty evita erro se author_icon=None
-        e.set_author(name=author_name, icon_url=author_icon or discord.Embed.Empty)
+        # discord.py 2.x aceita None (Embed.Empty não existe mais)
+        e.set_author(name=author_name, icon_url=author_icon or None)
 
     if thumbnail_url:
         e.set_thumbnail(url=thumbnail_url)
@@ -43,6 +43,82 @@ def make_embed(
     return e
 
 
+_UNSET = object()
+
+
+class EmbedTemplates:
+    """
+    Embeds da marca pré-montados por guild.
+    - avatar do bot fica em cache pela key do asset (muda junto com o
+      avatar; o discord.py não despacha on_user_update para a própria
+      conta); ícone da guild é invalidado em on_guild_update.
+    - branded() reaplica author/footer/thumbnail já resolvidos em vez de
+      recalcular as URLs dos assets a cada embed.
+    """
+
+    def __init__(self, bot_name: str, client: discord.Client | None = None) -> None:
+        self.bot_name = bot_name
+        self.client = client
+        self._avatar: tuple[int, str, str] | None = None
+        self._icons: dict[int, str | None] = {}
+        self._bases: dict[tuple, tuple] = {}
+
+    def avatar_url(self, user: discord.abc.User | None) -> str | None:
+        if user is None:
+            return None
+        asset = user.display_avatar
+        if self._avatar is None or self._avatar[:2] != (user.id, asset.key):
+            self._avatar = (user.id, asset.key, asset.url)
+            self._bases.clear()
+        return self._avatar[2]
+
+    def icon_url(self, guild: discord.Guild | None) -> str | None:
+        if guild is None:
+            return None
+        url = self._icons.get(guild.id, _UNSET)
+        if url is _UNSET:
+            url = self._icons[guild.id] = guild.icon.url if guild.icon else None
+        return url
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        self._icons.pop(guild_id, None)
+        for key in [k for k in self._bases if k[0] == guild_id]:
+            del self._bases[key]
+
+    def _base(self, user, guild, author_suffix: str | None, thumbnail: bool) -> tuple:
+        avatar = self.avatar_url(user)
+        key = (guild.id if guild else None, author_suffix, thumbnail)
+        base = self._bases.get(key)
+        if base is None:
+            # só os valores públicos (texto/URLs); branded() reaplica com set_*
+            base = self._bases[key] = (
+                f"{self.bot_name} • {author_suffix}" if author_suffix else self.bot_name,
+                avatar,
+                self.icon_url(guild) if thumbnail else None,
+            )
+        return base
+
+    def branded(
+        self,
+        title: str | None = None,
+        *,
+        user: discord.abc.User | None = None,
+        guild: discord.Guild | None = None,
+        author_suffix: str | None = None,
+        thumbnail: bool = False,
+    ) -> discord.Embed:
+        """Mesmo resultado de make_embed(footer/author=bot_name, ...), sem recalcular assets."""
+        if user is None and self.client is not None:
+            user = self.client.user
+        author_name, author_icon, thumbnail_url = self._base(user, guild, author_suffix, thumbnail)
+        e = discord.Embed(color=NEON_PURPLE, title=title or None)
+        e.set_author(name=author_name, icon_url=author_icon)
+        if thumbnail_url:
+            e.set_thumbnail(url=thumbnail_url)
+        e.set_footer(text=self.bot_name)
+        return e
+
+
 def format_embed_body(text: str, *, add_divider_top: bool = True, add_divider_bottom: bool = False) -> str:
     """
     Formata o corpo do embed com divisória opcional.
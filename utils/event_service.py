@@ -1,40 +1,179 @@
 # utils/event_service.py
 import random
+import time
 from datetime import datetime
-from utils.database import get_conn
-
-def create_event(guild_id: int, title: str, created_by_id: int):
-    with get_conn() as conn:
-        cur = conn.execute(
-            """
-            INSERT INTO events (guild_id, event_type, title, status, created_by_id, created_at)
-            VALUES (?, 'karaoke', ?, 'signup_open', ?, ?)
-            """,
-            (guild_id, title, created_by_id, datetime.utcnow().isoformat())
-        )
-        return cur.lastrowid
-
-def get_open_karaoke_event(guild_id: int):
-    with get_conn() as conn:
-        row = conn.execute(
-            """
-            SELECT * FROM events
-            WHERE guild_id = ? AND event_type = 'karaoke' AND status IN ('signup_open', 'active')
-            ORDER BY id DESC LIMIT 1
-            """,
-            (guild_id,)
-        ).fetchone()
+from utils import database
+from utils.batch_writer import BatchWriter
+
+OPEN_KARAOKE_EVENT_SQL = """
+SELECT * FROM events
+WHERE guild_id = ? AND event_type = 'karaoke' AND status IN ('signup_open', 'active')
+ORDER BY id DESC LIMIT 1
+"""
+
+STAFF_LOGS_BY_GUILD_SQL = """
+SELECT * FROM staff_logs
+WHERE guild_id = ? AND created_at >= ?
+ORDER BY created_at DESC LIMIT ?
+"""
+
+STAFF_LOGS_BY_EVENT_SQL = """
+SELECT * FROM staff_logs
+WHERE event_id = ?
+ORDER BY created_at
+"""
+
+EVENT_SINGERS_SQL = """
+SELECT user_id FROM event_signups
+WHERE event_id = ? AND signup_type = 'singer' AND status = 'confirmed'
+ORDER BY id
+"""
+
+EVENT_SIGNUPS_SQL = """
+SELECT user_id, signup_type FROM event_signups
+WHERE event_id = ? AND status = 'confirmed'
+"""
+
+# chamadas com mensagem de contagem ao vivo (retomadas no boot)
+TRACKED_SIGNUP_MESSAGES_SQL = """
+SELECT id, guild_id, signup_channel_id, signup_message_id FROM events
+WHERE event_type = 'karaoke' AND status IN ('signup_open', 'active') AND signup_message_id IS NOT NULL
+"""
+
+INSERT_STAFF_LOG_SQL = """
+INSERT INTO staff_logs (guild_id, event_id, action_type, target_user_id, actor_user_id, actor_display_name, reason, metadata_json, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# logs de staff são gravados em lote (1 fsync por lote, não por ação)
+staff_log_writer = BatchWriter("staff_logs", INSERT_STAFF_LOG_SQL, max_batch=100, max_delay_ms=500, max_backlog=5000)
+
+
+class OpenEventCache:
+    """
+    Cache por guild do evento de karaokê aberto (ou da ausência dele).
+    - Preenchido na primeira leitura.
+    - Invalidado por create_event / set_event_status.
+    - TTL cobre edições feitas direto no banco.
+    - A geração por guild impede que uma leitura antiga sobrescreva uma invalidação.
+    """
+
+    def __init__(self, ttl: float = 60.0) -> None:
+        self.ttl = ttl
+        self._entries: dict[int, tuple[float, object]] = {}
+        self._generation: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, guild_id: int) -> tuple[bool, object]:
+        entry = self._entries.get(guild_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return True, entry[1]
+        self.misses += 1
+        return False, None
+
+    def generation(self, guild_id: int) -> int:
+        return self._generation.get(guild_id, 0)
+
+    def put(self, guild_id: int, row, generation: int | None = None) -> None:
+        if generation is not None and generation != self.generation(guild_id):
+            return
+        self._entries[guild_id] = (time.monotonic() + self.ttl, row)
+
+    def invalidate(self, guild_id: int) -> None:
+        self._generation[guild_id] = self.generation(guild_id) + 1
+        if self._entries.pop(guild_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        for guild_id in list(self._entries):
+            self.invalidate(guild_id)
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "size": len(self._entries),
+        }
+
+
+open_event_cache = OpenEventCache()
+
+database.register_hot_query("open_karaoke_event", OPEN_KARAOKE_EVENT_SQL, (0,), "idx_events_guild_type_status")
+database.register_hot_query("staff_logs_by_guild", STAFF_LOGS_BY_GUILD_SQL, (0, "", 50), "idx_staff_logs_guild_created")
+database.register_hot_query("staff_logs_by_event", STAFF_LOGS_BY_EVENT_SQL, (0,), "idx_staff_logs_event_created")
+
+async def create_event(guild_id: int, title: str, created_by_id: int):
+    event_id = await database.execute(
+        """
+        INSERT INTO events (guild_id, event_type, title, status, created_by_id, created_at)
+        VALUES (?, 'karaoke', ?, 'signup_open', ?, ?)
+        """,
+        (guild_id, title, created_by_id, datetime.utcnow().isoformat())
+    )
+    open_event_cache.invalidate(guild_id)
+    return event_id
+
+async def get_open_karaoke_event(guild_id: int):
+    found, row = open_event_cache.get(guild_id)
+    if found:
         return row
+    return await load_open_karaoke_event(guild_id)
+
+async def load_open_karaoke_event(guild_id: int):
+    # vai direto ao banco; para quem já consultou (e contou) o cache
+    generation = open_event_cache.generation(guild_id)
+    row = await database.fetchone(OPEN_KARAOKE_EVENT_SQL, (guild_id,))
+    open_event_cache.put(guild_id, row, generation)
+    return row
 
-def log_staff_action(guild_id, event_id, action_type, actor_user_id, actor_display_name, target_user_id=None, reason=None, metadata_json=None):
-    with get_conn() as conn:
-        conn.execute(
-            """
-            INSERT INTO staff_logs (guild_id, event_id, action_type, target_user_id, actor_user_id, actor_display_name, reason, metadata_json, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (guild_id, event_id, action_type, target_user_id, actor_user_id, actor_display_name, reason, metadata_json, datetime.utcnow().isoformat())
+async def set_event_status(guild_id: int, event_id: int, status: str, actor_user_id: int | None = None):
+    now = datetime.utcnow().isoformat()
+    if status == "active":
+        await database.execute(
+            "UPDATE events SET status = ?, started_by_id = ?, started_at = ? WHERE id = ?",
+            (status, actor_user_id, now, event_id)
         )
+    elif status == "ended":
+        await database.execute(
+            "UPDATE events SET status = ?, ended_by_id = ?, ended_at = ? WHERE id = ?",
+            (status, actor_user_id, now, event_id)
+        )
+    else:
+        await database.execute("UPDATE events SET status = ? WHERE id = ?", (status, event_id))
+    open_event_cache.invalidate(guild_id)
+
+async def set_signup_message(event_id: int, channel_id: int, message_id: int):
+    await database.execute(
+        "UPDATE events SET signup_channel_id = ?, signup_message_id = ? WHERE id = ?",
+        (channel_id, message_id, event_id)
+    )
+
+async def get_tracked_signup_messages():
+    return await database.fetchall(TRACKED_SIGNUP_MESSAGES_SQL)
+
+async def get_event_signups(event_id: int):
+    return await database.fetchall(EVENT_SIGNUPS_SQL, (event_id,))
+
+async def get_event_singers(event_id: int) -> list[int]:
+    rows = await database.fetchall(EVENT_SINGERS_SQL, (event_id,))
+    return [r["user_id"] for r in rows]
+
+async def log_staff_action(guild_id, event_id, action_type, actor_user_id, actor_display_name, target_user_id=None, reason=None, metadata_json=None):
+    return await staff_log_writer.put(
+        (guild_id, event_id, action_type, target_user_id, actor_user_id, actor_display_name, reason, metadata_json, datetime.utcnow().isoformat())
+    )
+
+async def get_staff_logs(guild_id: int, since_iso: str = "", limit: int = 50):
+    return await database.fetchall(STAFF_LOGS_BY_GUILD_SQL, (guild_id, since_iso, limit))
+
+async def get_event_staff_logs(event_id: int):
+    return await database.fetchall(STAFF_LOGS_BY_EVENT_SQL, (event_id,))
 
 def randomize_queue(user_ids: list[int]):
     data = user_ids[:]
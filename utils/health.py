@@ -0,0 +1,131 @@
+# utils/health.py
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import psutil
+
+logger = logging.getLogger("duki_odyssey.health")
+
+
+@dataclass(frozen=True)
+class HealthSample:
+    at: float
+    rss_mb: float
+    cpu_percent: float
+    fds: int
+    threads: int
+    tasks: int
+    guilds: int
+    members: int
+    messages: int
+    loop_lag_ms: float
+
+
+class HealthSampler:
+    """
+    Amostra processo + loop em background e guarda uma janela móvel.
+    - Lag do loop: quanto o sleep(interval) atrasou além do pedido.
+    - psutil é lido aqui, nunca dentro do comando.
+    - /health só lê latest() / summary() (valores prontos).
+    """
+
+    def __init__(self, client=None, *, interval: float = 5.0, window: int = 60) -> None:
+        self.client = client
+        self.interval = interval
+        self._samples: deque[HealthSample] = deque(maxlen=window)
+        self._proc = psutil.Process(os.getpid())
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            # primeira leitura de cpu_percent sempre volta 0.0; serve de base
+            self._proc.cpu_percent(None)
+            self._task = asyncio.create_task(self._run(), name="health-sampler")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            t0 = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - t0 - self.interval)
+            try:
+                self._samples.append(self._sample(lag))
+            except Exception:
+                logger.exception("Falha ao amostrar saúde do processo.")
+
+    def _sample(self, lag: float) -> HealthSample:
+        proc = self._proc
+        with proc.oneshot():
+            rss = proc.memory_info().rss
+            cpu = proc.cpu_percent(None)
+            threads = proc.num_threads()
+            try:
+                fds = proc.num_fds()
+            except AttributeError:  # Windows
+                fds = proc.num_handles()
+
+        guilds = members = messages = 0
+        client = self.client
+        if client is not None:
+            gs = client.guilds
+            guilds = len(gs)
+            # member_count é um contador; g.members montaria uma lista por guild
+            members = sum(g.member_count or 0 for g in gs)
+            messages = len(client.cached_messages)
+
+        return HealthSample(
+            at=time.time(),
+            rss_mb=rss / 1_048_576,
+            cpu_percent=cpu,
+            fds=fds,
+            threads=threads,
+            tasks=len(asyncio.all_tasks()),
+            guilds=guilds,
+            members=members,
+            messages=messages,
+            loop_lag_ms=lag * 1000,
+        )
+
+    def latest(self) -> HealthSample | None:
+        return self._samples[-1] if self._samples else None
+
+    def summary(self) -> dict[str, float]:
+        """Médias/picos da janela (lag, CPU, RSS)."""
+        samples = self._samples
+        if not samples:
+            return {}
+        lags = [s.loop_lag_ms for s in samples]
+        return {
+            "samples": len(samples),
+            "window_s": len(samples) * self.interval,
+            "lag_avg_ms": sum(lags) / len(lags),
+            "lag_max_ms": max(lags),
+            "cpu_avg": sum(s.cpu_percent for s in samples) / len(samples),
+            "rss_max_mb": max(s.rss_mb for s in samples),
+        }
+
+    def stats(self) -> dict[str, float]:
+        last = self.latest()
+        if last is None:
+            return {}
+        return {
+            "rss_mb": round(last.rss_mb, 1),
+            "cpu_percent": last.cpu_percent,
+            "fds": last.fds,
+            "threads": last.threads,
+            "tasks": last.tasks,
+            "loop_lag_ms": round(last.loop_lag_ms, 2),
+        }
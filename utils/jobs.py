@@ -0,0 +1,524 @@
+# utils/jobs.py
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable
+
+import discord
+
+from utils import database
+
+logger = logging.getLogger("duki_odyssey.jobs")
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+FINISHED = (DONE, CANCELLED, FAILED)
+ICONS = {PENDING: "🕒", RUNNING: "⏳", DONE: "✅", CANCELLED: "⏹️", FAILED: "⛔"}
+
+INSERT_JOB_SQL = """
+INSERT INTO jobs (guild_id, job_type, status, params_json, max_attempts, created_by_id, report_channel_id, created_at)
+VALUES (?, ?, 'pending', ?, ?, ?, ?, ?)
+"""
+
+SAVE_JOB_SQL = """
+UPDATE jobs SET
+    status = ?, progress_json = ?, attempts = ?, run_after = ?, error = ?,
+    report_message_id = ?, started_at = ?, finished_at = ?
+WHERE id = ?
+"""
+
+CHECKPOINT_SQL = "UPDATE jobs SET progress_json = ? WHERE id = ?"
+SET_REPORT_SQL = "UPDATE jobs SET report_message_id = ? WHERE id = ?"
+
+# o que estava rodando quando o processo caiu volta para a fila
+REQUEUE_RUNNING_SQL = "UPDATE jobs SET status = 'pending' WHERE status = 'running'"
+PENDING_JOBS_SQL = "SELECT * FROM jobs WHERE status = 'pending' ORDER BY id"
+GET_JOB_SQL = "SELECT * FROM jobs WHERE id = ?"
+GUILD_JOBS_SQL = "SELECT * FROM jobs WHERE guild_id = ? ORDER BY id DESC LIMIT ?"
+
+database.register_hot_query("jobs_pending", PENDING_JOBS_SQL, (), "idx_jobs_status")
+database.register_hot_query("jobs_guild", GUILD_JOBS_SQL, (1, 15), "idx_jobs_guild")
+
+
+class JobError(Exception):
+    """Falha definitiva: o job vai para failed sem nova tentativa."""
+
+
+@dataclass
+class Job:
+    id: int
+    guild_id: int
+    job_type: str
+    params: dict
+    status: str = PENDING
+    # checkpoint do handler (JSON); a retomada continua daqui
+    progress: dict = field(default_factory=dict)
+    attempts: int = 0
+    max_attempts: int = 3
+    # time.time() antes do qual o job não roda (backoff entre tentativas)
+    run_after: float = 0.0
+    error: str | None = None
+    created_by_id: int | None = None
+    report_channel_id: int | None = None
+    report_message_id: int | None = None
+    created_at: str = ""
+    started_at: str | None = None
+    finished_at: str | None = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(
+            id=row["id"],
+            guild_id=row["guild_id"],
+            job_type=row["job_type"],
+            params=json.loads(row["params_json"]),
+            status=row["status"],
+            progress=json.loads(row["progress_json"] or "{}"),
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            run_after=row["run_after"],
+            error=row["error"],
+            created_by_id=row["created_by_id"],
+            report_channel_id=row["report_channel_id"],
+            report_message_id=row["report_message_id"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    @property
+    def elapsed(self) -> float:
+        """Segundos da tentativa atual (ou da última)."""
+        if not self.started_at:
+            return 0.0
+        end = datetime.fromisoformat(self.finished_at) if self.finished_at else datetime.utcnow()
+        return max(0.0, (end - datetime.fromisoformat(self.started_at)).total_seconds())
+
+
+@dataclass(frozen=True)
+class JobType:
+    """
+    Um tipo de job.
+    - run(ctx): faz o trabalho; retoma de ctx.progress quando não vier vazio.
+    - describe(job): texto do relatório (canal admin e /jobs), só a partir
+      de params/progress, então funciona também para jobs antigos.
+    """
+
+    name: str
+    title: str
+    run: Callable[["JobContext"], Awaitable[None]]
+    describe: Callable[[Job], str]
+    max_attempts: int = 3
+
+
+class JobContext:
+    """O que o handler enxerga do job: parâmetros, último checkpoint e onde gravar o próximo."""
+
+    def __init__(self, scheduler: "JobScheduler", job: Job) -> None:
+        self.scheduler = scheduler
+        self.job = job
+
+    @property
+    def params(self) -> dict:
+        return self.job.params
+
+    @property
+    def progress(self) -> dict:
+        return self.job.progress
+
+    def checkpoint(self, progress: dict) -> None:
+        """Atualiza o progresso; banco e relatório no máximo a cada progress_interval."""
+        self.job.progress = progress
+        self.scheduler._touch(self.job)
+
+    async def save(self, progress: dict) -> None:
+        """Grava o progresso agora (passos que não podem ser repetidos numa retomada)."""
+        self.job.progress = progress
+        await database.execute(CHECKPOINT_SQL, (json.dumps(progress), self.job.id))
+
+
+def _recover(conn: sqlite3.Connection) -> list[sqlite3.Row]:
+    requeued = conn.execute(REQUEUE_RUNNING_SQL).rowcount
+    if requeued:
+        logger.info("%s job(s) interrompido(s) voltaram para a fila.", requeued)
+    return conn.execute(PENDING_JOBS_SQL).fetchall()
+
+
+class JobScheduler:
+    """
+    Operações longas (limpezas, reset de canal, anúncios) fora da interaction.
+    - Cada job é uma linha em `jobs`: tipo, parâmetros, estado, checkpoint
+      (JSON), tentativas e último erro. O comando só faz submit() e responde.
+    - `workers` tasks consomem a fila; no máximo `per_guild` jobs da mesma
+      guild rodam ao mesmo tempo (o resto espera a vez, na ordem).
+    - Erro inesperado: nova tentativa com backoff (retry_base * 2^n) até
+      max_attempts. JobError falha direto.
+    - start() devolve para a fila o que estava rodando quando o processo
+      caiu; stop() deixa os jobs em andamento como pending. Nos dois casos o
+      handler retoma do último checkpoint.
+    - O progresso vai numa mensagem no canal do relatório, editada no máximo
+      a cada `progress_interval` segundos.
+    """
+
+    def __init__(
+        self,
+        client: discord.Client,
+        *,
+        workers: int = 4,
+        per_guild: int = 2,
+        progress_interval: float = 5.0,
+        retry_base: float = 30.0,
+    ) -> None:
+        self.client = client
+        self.workers = workers
+        self.per_guild = per_guild
+        self.progress_interval = progress_interval
+        self.retry_base = retry_base
+        self._types: dict[str, JobType] = {}
+        self._queue: list[Job] = []
+        self._running: dict[int, Job] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._guild_running: Counter = Counter()
+        self._cancelling: set[int] = set()
+        self._wake = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+        self._stopping = False
+        # relatório: mensagem já postada, último flush e flush em andamento por job
+        self._reports: dict[int, discord.Message] = {}
+        self._flushed: dict[int, float] = {}
+        self._flushing: dict[int, asyncio.Task] = {}
+
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.retried = 0
+        self.resumed = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": len(self._queue),
+            "running": len(self._running),
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "retried": self.retried,
+            "resumed": self.resumed,
+        }
+
+    def register(self, kind: JobType) -> None:
+        self._types[kind.name] = kind
+
+    def describe(self, job: Job) -> str:
+        kind = self._types.get(job.job_type)
+        if kind is None:
+            return f"{ICONS.get(job.status, '🕒')} **{job.status}** • tipo `{job.job_type}`"
+        return kind.describe(job)
+
+    def title(self, job: Job) -> str:
+        kind = self._types.get(job.job_type)
+        return f"{kind.title if kind else job.job_type.upper()} #{job.id}"
+
+    # -------------------------
+    # ciclo de vida
+    # -------------------------
+    async def start(self) -> int:
+        """Recarrega a fila do banco e sobe os workers. Devolve quantos jobs retomou."""
+        if self._workers:
+            return 0
+        self._stopping = False
+        known = {j.id for j in self._queue}
+        jobs = [Job.from_row(r) for r in await database.run(_recover)]
+        resumed = [j for j in jobs if j.id not in known]
+        self._queue.extend(resumed)
+        self._queue.sort(key=lambda j: j.id)
+        self.resumed += len(resumed)
+        self._workers = [asyncio.create_task(self._work(), name=f"jobs:{i}") for i in range(self.workers)]
+        self._wake.set()
+        return len(resumed)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        if self._flushing:
+            await asyncio.gather(*self._flushing.values(), return_exceptions=True)
+
+    # -------------------------
+    # API dos comandos
+    # -------------------------
+    async def submit(
+        self,
+        guild_id: int,
+        job_type: str,
+        params: dict,
+        *,
+        created_by_id: int | None = None,
+        report_channel_id: int | None = None,
+    ) -> Job:
+        kind = self._types[job_type]
+        now = datetime.utcnow().isoformat()
+        job_id = await database.execute(
+            INSERT_JOB_SQL,
+            (guild_id, job_type, json.dumps(params), kind.max_attempts, created_by_id, report_channel_id, now),
+        )
+        job = Job(
+            job_id,
+            guild_id,
+            job_type,
+            params,
+            max_attempts=kind.max_attempts,
+            created_by_id=created_by_id,
+            report_channel_id=report_channel_id,
+            created_at=now,
+        )
+        self._queue.append(job)
+        self._wake.set()
+        return job
+
+    def _live(self, job_id: int) -> Job | None:
+        running = self._running.get(job_id)
+        if running is not None:
+            return running
+        return next((j for j in self._queue if j.id == job_id), None)
+
+    async def get(self, job_id: int) -> Job | None:
+        job = self._live(job_id)
+        if job is not None:
+            return job
+        row = await database.fetchone(GET_JOB_SQL, (job_id,))
+        return Job.from_row(row) if row else None
+
+    async def recent(self, guild_id: int, limit: int = 15) -> list[Job]:
+        rows = await database.fetchall(GUILD_JOBS_SQL, (guild_id, limit))
+        # o que está vivo tem progresso mais novo que o último checkpoint gravado
+        return [self._live(r["id"]) or Job.from_row(r) for r in rows]
+
+    async def cancel(self, job_id: int) -> bool:
+        if job_id in self._running:
+            self._cancelling.add(job_id)
+            task = self._tasks.get(job_id)
+            if task is not None:
+                task.cancel()
+            return True
+        job = next((j for j in self._queue if j.id == job_id), None)
+        if job is None:
+            return False
+        self._queue.remove(job)
+        job.status = CANCELLED
+        job.finished_at = datetime.utcnow().isoformat()
+        self.cancelled += 1
+        await self._save(job)
+        await self._report(job)
+        return True
+
+    async def retry(self, job_id: int) -> Job | None:
+        """Recoloca na fila um job falho/cancelado; continua do último checkpoint."""
+        if self._live(job_id) is not None:
+            return None
+        job = await self.get(job_id)
+        if job is None or job.status not in (FAILED, CANCELLED):
+            return None
+        job.status = PENDING
+        job.attempts = 0
+        job.run_after = 0.0
+        job.error = None
+        job.finished_at = None
+        await self._save(job)
+        self._queue.append(job)
+        self._wake.set()
+        return job
+
+    # -------------------------
+    # workers
+    # -------------------------
+    def _take(self) -> Job | None:
+        now = time.time()
+        for job in self._queue:
+            if job.run_after <= now and self._guild_running[job.guild_id] < self.per_guild:
+                self._queue.remove(job)
+                return job
+        return None
+
+    def _next_delay(self) -> float | None:
+        now = time.time()
+        delays = [j.run_after - now for j in self._queue if j.run_after > now]
+        return min(delays) if delays else None
+
+    async def _work(self) -> None:
+        while not self._stopping:
+            job = self._take()
+            if job is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self._next_delay())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._execute(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Falha inesperada no scheduler (job #%s).", job.id)
+
+    async def _execute(self, job: Job) -> None:
+        kind = self._types.get(job.job_type)
+        if kind is None:
+            job.status = FAILED
+            job.error = f"Tipo de job desconhecido: {job.job_type}"
+            job.finished_at = datetime.utcnow().isoformat()
+            self.failed += 1
+            await self._save(job)
+            return
+
+        job.status = RUNNING
+        job.attempts += 1
+        job.started_at = datetime.utcnow().isoformat()
+        job.finished_at = None
+        self._running[job.id] = job
+        self._guild_running[job.guild_id] += 1
+        error: str | None = None
+        retryable = False
+        interrupted = False
+        try:
+            await self._save(job)
+            await self._report(job)
+            self._flushed[job.id] = time.monotonic()
+            task = asyncio.create_task(kind.run(JobContext(self, job)), name=f"job:{job.id}:{job.job_type}")
+            self._tasks[job.id] = task
+            if job.id in self._cancelling:
+                # cancelado enquanto o relatório inicial saía
+                task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                interrupted = True
+            except JobError as e:
+                error = str(e) or type(e).__name__
+            except Exception as e:
+                error = type(e).__name__
+                retryable = True
+                logger.exception("Job #%s (%s) falhou na tentativa %s.", job.id, job.job_type, job.attempts)
+        finally:
+            self._running.pop(job.id, None)
+            self._tasks.pop(job.id, None)
+            self._guild_running[job.guild_id] -= 1
+            self._wake.set()
+
+        user_cancel = job.id in self._cancelling
+        self._cancelling.discard(job.id)
+        if interrupted and self._stopping and not user_cancel:
+            # shutdown: volta como pending e retoma no próximo boot
+            job.status = PENDING
+        elif interrupted:
+            job.status = CANCELLED
+            self.cancelled += 1
+        elif error is not None and retryable and job.attempts < job.max_attempts:
+            job.status = PENDING
+            job.error = f"{error} (tentativa {job.attempts}/{job.max_attempts})"
+            job.run_after = time.time() + self.retry_base * 2 ** (job.attempts - 1)
+            self.retried += 1
+            self._queue.append(job)
+        elif error is not None:
+            job.status = FAILED
+            job.error = error
+            self.failed += 1
+        else:
+            job.status = DONE
+            job.error = None
+            self.completed += 1
+        if job.finished:
+            job.finished_at = datetime.utcnow().isoformat()
+
+        # um flush atrasado não pode sobrescrever o relatório final
+        pending = self._flushing.pop(job.id, None)
+        if pending is not None:
+            await asyncio.gather(pending, return_exceptions=True)
+        self._flushed.pop(job.id, None)
+        await self._save(job)
+        await self._report(job)
+        if job.finished:
+            self._reports.pop(job.id, None)
+
+    async def _save(self, job: Job) -> None:
+        await database.execute(
+            SAVE_JOB_SQL,
+            (
+                job.status,
+                json.dumps(job.progress),
+                job.attempts,
+                job.run_after,
+                job.error,
+                job.report_message_id,
+                job.started_at,
+                job.finished_at,
+                job.id,
+            ),
+        )
+
+    # -------------------------
+    # progresso
+    # -------------------------
+    def _touch(self, job: Job) -> None:
+        if job.id in self._flushing:
+            return
+        now = time.monotonic()
+        if now - self._flushed.get(job.id, 0.0) < self.progress_interval:
+            return
+        self._flushed[job.id] = now
+        task = asyncio.create_task(self._flush(job), name=f"job-flush:{job.id}")
+        self._flushing[job.id] = task
+        task.add_done_callback(lambda _t, jid=job.id: self._flushing.pop(jid, None))
+
+    async def _flush(self, job: Job) -> None:
+        try:
+            await database.execute(CHECKPOINT_SQL, (json.dumps(job.progress), job.id))
+        except Exception:
+            logger.exception("Não consegui gravar o checkpoint do job #%s.", job.id)
+        await self._report(job)
+
+    def _embed(self, job: Job) -> discord.Embed:
+        embed = self.client.embeds.branded(self.title(job))
+        embed.description = self.describe(job)
+        return embed
+
+    async def _report(self, job: Job) -> None:
+        if not job.report_channel_id:
+            return
+        try:
+            message = self._reports.get(job.id)
+            if message is not None:
+                await message.edit(embed=self._embed(job))
+            elif job.report_message_id is not None:
+                # após restart: edita a mesma mensagem sem buscá-la
+                partial = self.client.get_partial_messageable(job.report_channel_id)
+                await partial.get_partial_message(job.report_message_id).edit(embed=self._embed(job))
+            else:
+                channel = self.client.get_channel(job.report_channel_id)
+                if channel is None:
+                    return
+                message = await channel.send(embed=self._embed(job))
+                self._reports[job.id] = message
+                job.report_message_id = message.id
+                await database.execute(SET_REPORT_SQL, (message.id, job.id))
+        except discord.NotFound:
+            job.report_message_id = None
+            self._reports.pop(job.id, None)
+        except discord.HTTPException:
+            logger.warning("Não consegui atualizar o relatório do job #%s.", job.id)
@@ -0,0 +1,202 @@
+# utils/karaoke_queue.py
+import asyncio
+import itertools
+import sqlite3
+from collections import OrderedDict
+
+from utils import database
+from utils.event_service import randomize_queue
+
+# distância entre posições vizinhas; mover para o fim/início só grava a
+# linha que mudou (tail + GAP / head - GAP), nunca renumera a fila
+GAP = 1024
+
+WAITING = "waiting"
+SINGING = "singing"
+DONE = "done"
+REMOVED = "removed"
+
+ACTIVE_QUEUE_SQL = """
+SELECT user_id, queue_position, queue_status FROM event_queue
+WHERE event_id = ? AND queue_status IN ('waiting', 'singing')
+ORDER BY queue_position
+"""
+
+UPSERT_QUEUE_SQL = """
+INSERT INTO event_queue (event_id, user_id, queue_position, queue_status)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(event_id, user_id) DO UPDATE SET
+    queue_position = excluded.queue_position,
+    queue_status = excluded.queue_status
+"""
+
+SET_STATUS_SQL = "UPDATE event_queue SET queue_status = ? WHERE event_id = ? AND user_id = ?"
+
+database.register_hot_query("event_queue_active", ACTIVE_QUEUE_SQL, (0,), "idx_event_queue_event_status_pos")
+
+
+def _write(conn: sqlite3.Connection, upserts: list[tuple], statuses: list[tuple]) -> int:
+    # tudo de uma operação numa transação só (run() faz o commit)
+    if upserts:
+        conn.executemany(UPSERT_QUEUE_SQL, upserts)
+    if statuses:
+        conn.executemany(SET_STATUS_SQL, statuses)
+    return len(upserts) + len(statuses)
+
+
+class KaraokeQueue:
+    """
+    Fila de um evento: OrderedDict user_id -> posição (só quem está esperando),
+    espelhado em event_queue.
+    - avançar / pular para o fim / remover / reinserir: O(1) em memória e
+      no máximo 2 linhas gravadas.
+    - Memória só muda depois que o banco confirmou.
+    """
+
+    def __init__(self, event_id: int) -> None:
+        self.event_id = event_id
+        self.current: int | None = None
+        self._current_pos = 0
+        self._waiting: OrderedDict[int, int] = OrderedDict()
+        self._lock = asyncio.Lock()
+        self.rows_written = 0
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id == self.current or user_id in self._waiting
+
+    def peek(self, n: int = 5) -> list[int]:
+        return list(itertools.islice(self._waiting, n))
+
+    def position_of(self, user_id: int) -> int | None:
+        """Lugar na fila (1 = próximo). O(n); só para exibição."""
+        for i, uid in enumerate(self._waiting, start=1):
+            if uid == user_id:
+                return i
+        return None
+
+    def _tail(self) -> int:
+        if self._waiting:
+            return next(reversed(self._waiting.values()))
+        return self._current_pos
+
+    def _head(self) -> int:
+        if self._waiting:
+            return next(iter(self._waiting.values()))
+        return self._current_pos
+
+    async def _commit(self, upserts: list[tuple] = (), statuses: list[tuple] = ()) -> None:
+        self.rows_written += await database.run(_write, list(upserts), list(statuses))
+
+    # -------------------------
+    # carga
+    # -------------------------
+    @classmethod
+    async def load(cls, event_id: int) -> "KaraokeQueue":
+        q = cls(event_id)
+        for row in await database.fetchall(ACTIVE_QUEUE_SQL, (event_id,)):
+            if row["queue_status"] == SINGING:
+                q.current, q._current_pos = row["user_id"], row["queue_position"]
+            else:
+                q._waiting[row["user_id"]] = row["queue_position"]
+        return q
+
+    async def build(self, user_ids: list[int]) -> None:
+        """Ordem inicial sorteada (randomize_queue); única operação O(n)."""
+        async with self._lock:
+            order = randomize_queue(user_ids)
+            waiting = OrderedDict((uid, (i + 1) * GAP) for i, uid in enumerate(order))
+            await self._commit(upserts=[(self.event_id, uid, pos, WAITING) for uid, pos in waiting.items()])
+            self._waiting = waiting
+            self.current, self._current_pos = None, 0
+
+    # -------------------------
+    # operações O(1)
+    # -------------------------
+    async def advance(self) -> tuple[int | None, int | None]:
+        """Fecha quem está cantando e chama o próximo. Devolve (anterior, atual)."""
+        async with self._lock:
+            statuses = []
+            if self.current is not None:
+                statuses.append((DONE, self.event_id, self.current))
+            nxt = next(iter(self._waiting), None)
+            if nxt is not None:
+                statuses.append((SINGING, self.event_id, nxt))
+            await self._commit(statuses=statuses)
+
+            previous = self.current
+            if nxt is not None:
+                self._current_pos = self._waiting.pop(nxt)
+            self.current = nxt
+            return previous, nxt
+
+    async def skip(self, user_id: int) -> bool:
+        """Manda para o fim da fila. Se era quem cantava, o próximo assume."""
+        async with self._lock:
+            if user_id == self.current:
+                nxt = next(iter(self._waiting), None)
+                pos = self._tail() + GAP
+                statuses = [(SINGING, self.event_id, nxt)] if nxt is not None else []
+                await self._commit(upserts=[(self.event_id, user_id, pos, WAITING)], statuses=statuses)
+                if nxt is not None:
+                    self._current_pos = self._waiting.pop(nxt)
+                self.current = nxt
+                self._waiting[user_id] = pos
+                return True
+
+            if user_id not in self._waiting:
+                return False
+            pos = self._tail() + GAP
+            await self._commit(upserts=[(self.event_id, user_id, pos, WAITING)])
+            self._waiting[user_id] = pos
+            self._waiting.move_to_end(user_id)
+            return True
+
+    async def remove(self, user_id: int) -> bool:
+        async with self._lock:
+            if user_id != self.current and user_id not in self._waiting:
+                return False
+            await self._commit(statuses=[(REMOVED, self.event_id, user_id)])
+            if user_id == self.current:
+                self.current = None
+            else:
+                del self._waiting[user_id]
+            return True
+
+    async def reinsert(self, user_id: int, *, front: bool = False) -> bool:
+        """Volta (ou entra) na fila, no fim ou como próximo."""
+        async with self._lock:
+            if user_id == self.current or user_id in self._waiting:
+                return False
+            pos = self._head() - GAP if front else self._tail() + GAP
+            await self._commit(upserts=[(self.event_id, user_id, pos, WAITING)])
+            self._waiting[user_id] = pos
+            if front:
+                self._waiting.move_to_end(user_id, last=False)
+            return True
+
+
+class KaraokeQueues:
+    """Filas em memória por evento; carregadas do banco na primeira vez."""
+
+    def __init__(self) -> None:
+        self._queues: dict[int, KaraokeQueue] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, event_id: int) -> KaraokeQueue:
+        q = self._queues.get(event_id)
+        if q is not None:
+            return q
+        async with self._lock:
+            q = self._queues.get(event_id)
+            if q is None:
+                q = self._queues[event_id] = await KaraokeQueue.load(event_id)
+            return q
+
+    def forget(self, event_id: int) -> None:
+        self._queues.pop(event_id, None)
+
+
+karaoke_queues = KaraokeQueues()
@@ -0,0 +1,126 @@
+# utils/log_digest.py
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import discord
+
+logger = logging.getLogger("duki_odyssey.logs")
+
+# margem abaixo dos 2000 chars de uma mensagem
+MAX_MESSAGE_CHARS = 1900
+
+
+@dataclass
+class _ChannelBuffer:
+    channel: discord.abc.Messageable
+    lines: list[str] = field(default_factory=list)
+    size: int = 0
+    recent: deque = field(default_factory=deque)
+    task: asyncio.Task | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class LogDigest:
+    """
+    Agrupa linhas de log por canal.
+    - Tráfego baixo: a linha sai na hora, sozinha.
+    - Mais de `burst_threshold` linhas dentro de `interval` segundos: as linhas
+      acumulam e saem juntas numa mensagem a cada `interval`, ou antes se
+      o texto chegar perto do limite de 2000 chars.
+    - post() não espera o envio (seguro para chamar de listeners).
+    """
+
+    def __init__(self, *, interval: float = 3.0, burst_threshold: int = 3, max_chars: int = MAX_MESSAGE_CHARS) -> None:
+        self.interval = interval
+        self.burst_threshold = burst_threshold
+        self.max_chars = max_chars
+        self._buffers: dict[int, _ChannelBuffer] = {}
+        self._sends: set[asyncio.Task] = set()
+
+        self.lines = 0
+        self.delivered = 0
+        self.messages = 0
+        self.failed = 0
+
+    @property
+    def calls_saved(self) -> int:
+        return self.delivered - self.messages
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "lines": self.lines,
+            "delivered": self.delivered,
+            "messages": self.messages,
+            "failed": self.failed,
+            "calls_saved": self.calls_saved,
+        }
+
+    def post(self, channel: discord.abc.Messageable, line: str) -> None:
+        line = line[: self.max_chars]
+        buf = self._buffers.get(channel.id)
+        if buf is None:
+            buf = self._buffers[channel.id] = _ChannelBuffer(channel)
+
+        now = time.monotonic()
+        buf.recent.append(now)
+        while buf.recent and buf.recent[0] < now - self.interval:
+            buf.recent.popleft()
+        self.lines += 1
+
+        # tráfego baixo e nada pendente: posta direto
+        if buf.task is None and not buf.lines and len(buf.recent) <= self.burst_threshold:
+            self._spawn(self._send(buf, [line]))
+            return
+
+        if buf.lines and buf.size + len(line) + 1 > self.max_chars:
+            self._spawn(self._send(buf, self._take(buf)))
+
+        buf.lines.append(line)
+        buf.size += len(line) + 1
+        if buf.task is None:
+            buf.task = asyncio.create_task(self._flush_later(buf))
+
+    def _take(self, buf: _ChannelBuffer) -> list[str]:
+        lines, buf.lines, buf.size = buf.lines, [], 0
+        return lines
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    async def _flush_later(self, buf: _ChannelBuffer) -> None:
+        try:
+            await asyncio.sleep(self.interval)
+        finally:
+            buf.task = None
+        lines = self._take(buf)
+        if lines:
+            await self._send(buf, lines)
+
+    async def _send(self, buf: _ChannelBuffer, lines: list[str]) -> None:
+        # lock por canal mantém a ordem das mensagens
+        async with buf.lock:
+            try:
+                await buf.channel.send("\n".join(lines))
+            except Exception:
+                self.failed += 1
+                logger.warning("Falha ao postar %s linha(s) de log no canal %s.", len(lines), buf.channel.id)
+                return
+            self.messages += 1
+            self.delivered += len(lines)
+
+    async def flush(self) -> None:
+        """Envia tudo o que estiver acumulado (usado no shutdown)."""
+        for buf in self._buffers.values():
+            if buf.task is not None:
+                buf.task.cancel()
+                buf.task = None
+            lines = self._take(buf)
+            if lines:
+                self._spawn(self._send(buf, lines))
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
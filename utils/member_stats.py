@@ -0,0 +1,106 @@
+# utils/member_stats.py
+import heapq
+from collections import Counter
+
+import discord
+
+
+class GuildCounters:
+    """
+    Contadores de uma guild mantidos de forma incremental.
+    - humanos / bots
+    - membros por cargo (sem o @everyone)
+    """
+
+    def __init__(self, guild_id: int) -> None:
+        self.guild_id = guild_id
+        self.humans = 0
+        self.bots = 0
+        self.roles: Counter[int] = Counter()
+
+    @classmethod
+    def build(cls, guild: discord.Guild) -> "GuildCounters":
+        c = cls(guild.id)
+        for m in guild.members:
+            c.add_member(m)
+        return c
+
+    def _role_ids(self, member: discord.Member) -> list[int]:
+        return [r.id for r in member.roles if r.id != self.guild_id]
+
+    def add_member(self, member: discord.Member) -> None:
+        if member.bot:
+            self.bots += 1
+        else:
+            self.humans += 1
+        self.roles.update(self._role_ids(member))
+
+    def remove_member(self, member: discord.Member) -> None:
+        if member.bot:
+            self.bots = max(0, self.bots - 1)
+        else:
+            self.humans = max(0, self.humans - 1)
+        for rid in self._role_ids(member):
+            self.roles[rid] -= 1
+            if self.roles[rid] <= 0:
+                del self.roles[rid]
+
+    def update_member(self, before: discord.Member, after: discord.Member) -> None:
+        old = set(self._role_ids(before))
+        new = set(self._role_ids(after))
+        if old == new:
+            return
+        for rid in new - old:
+            self.roles[rid] += 1
+        for rid in old - new:
+            self.roles[rid] -= 1
+            if self.roles[rid] <= 0:
+                del self.roles[rid]
+
+    def drop_role(self, role_id: int) -> None:
+        self.roles.pop(role_id, None)
+
+    def top_roles(self, n: int = 12) -> list[tuple[int, int]]:
+        """[(contagem, role_id)] dos n cargos com mais membros."""
+        return heapq.nlargest(n, ((c, rid) for rid, c in self.roles.items() if c > 0))
+
+    def diff(self, other: "GuildCounters") -> list[str]:
+        out: list[str] = []
+        if self.humans != other.humans:
+            out.append(f"humanos {self.humans} != {other.humans}")
+        if self.bots != other.bots:
+            out.append(f"bots {self.bots} != {other.bots}")
+        for rid in set(self.roles) | set(other.roles):
+            if self.roles.get(rid, 0) != other.roles.get(rid, 0):
+                out.append(f"cargo {rid} {self.roles.get(rid, 0)} != {other.roles.get(rid, 0)}")
+        return out
+
+
+class MemberStats:
+    """Registro de GuildCounters por guild (montado no ready, atualizado por eventos)."""
+
+    def __init__(self) -> None:
+        self._guilds: dict[int, GuildCounters] = {}
+
+    def rebuild(self, guild: discord.Guild) -> GuildCounters:
+        c = self._guilds[guild.id] = GuildCounters.build(guild)
+        return c
+
+    def get(self, guild: discord.Guild) -> GuildCounters:
+        c = self._guilds.get(guild.id)
+        if c is None:
+            c = self.rebuild(guild)
+        return c
+
+    def peek(self, guild_id: int) -> GuildCounters | None:
+        return self._guilds.get(guild_id)
+
+    def forget(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
+
+    def check(self, guild: discord.Guild) -> list[str]:
+        """Recalcula do zero e compara com os contadores incrementais."""
+        current = self.peek(guild.id)
+        if current is None:
+            return []
+        return current.diff(GuildCounters.build(guild))
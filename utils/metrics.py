@@ -0,0 +1,179 @@
+# utils/metrics.py
+import bisect
+import functools
+import logging
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger("duki_odyssey.metrics")
+
+# limites dos buckets em segundos (estilo Prometheus)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)  # último = +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimativa pelo limite superior do bucket (inf -> maior bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        acc = 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= target:
+                return BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+        return BUCKETS[-1]
+
+
+class Metric:
+    __slots__ = ("calls", "errors", "latency")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+
+class MetricsRegistry:
+    """
+    Contadores + histograma de latência por (tipo, nome).
+    Tipos usados: command, view, listener, db.
+    observe() é só um dict lookup + bisect: barato no hot path.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[tuple[str, str], Metric] = {}
+        self._collectors: dict[str, Callable[[], dict[str, float]]] = {}
+
+    def observe(self, kind: str, name: str, seconds: float, *, error: bool = False) -> None:
+        key = (kind, name)
+        m = self._metrics.get(key)
+        if m is None:
+            m = self._metrics[key] = Metric()
+        m.calls += 1
+        if error:
+            m.errors += 1
+        m.latency.observe(seconds)
+
+    def timed(self, kind: str, name: str):
+        """Decorator para corrotinas (callbacks de botão, listeners)."""
+
+        def deco(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any):
+                t0 = time.perf_counter()
+                error = False
+                try:
+                    return await fn(*args, **kwargs)
+                except BaseException:
+                    error = True
+                    raise
+                finally:
+                    self.observe(kind, name, time.perf_counter() - t0, error=error)
+
+            return wrapper
+
+        return deco
+
+    def add_collector(self, name: str, fn: Callable[[], dict[str, float]]) -> None:
+        """Gauges lidos na hora do scrape (ex.: stats() de filas e caches)."""
+        self._collectors[name] = fn
+
+    def items(self) -> list[tuple[tuple[str, str], Metric]]:
+        return sorted(self._metrics.items())
+
+    def gauges(self) -> dict[str, dict[str, float]]:
+        out: dict[str, dict[str, float]] = {}
+        for name, fn in self._collectors.items():
+            try:
+                out[name] = fn()
+            except Exception:
+                logger.exception("Collector %s falhou.", name)
+        return out
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# TYPE duki_calls_total counter",
+            "# TYPE duki_errors_total counter",
+            "# TYPE duki_latency_seconds histogram",
+        ]
+        for (kind, name), m in self.items():
+            labels = f'kind="{kind}",name="{name}"'
+            lines.append(f"duki_calls_total{{{labels}}} {m.calls}")
+            lines.append(f"duki_errors_total{{{labels}}} {m.errors}")
+            acc = 0
+            for i, c in enumerate(m.latency.counts):
+                acc += c
+                le = f"{BUCKETS[i]}" if i < len(BUCKETS) else "+Inf"
+                lines.append(f'duki_latency_seconds_bucket{{{labels},le="{le}"}} {acc}')
+            lines.append(f"duki_latency_seconds_sum{{{labels}}} {m.latency.total:.6f}")
+            lines.append(f"duki_latency_seconds_count{{{labels}}} {m.latency.count}")
+
+        lines.append("# TYPE duki_gauge gauge")
+        for group, values in self.gauges().items():
+            for key, value in values.items():
+                lines.append(f'duki_gauge{{group="{group}",key="{key}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+timed = registry.timed
+
+
+# -------------------------
+# app commands (início no interaction_check, fim no completion/erro)
+# -------------------------
+_T0_KEY = "metrics_t0"
+
+
+def start_interaction(interaction) -> None:
+    interaction.extras[_T0_KEY] = time.perf_counter()
+
+
+def finish_interaction(interaction, *, error: bool = False) -> None:
+    t0 = interaction.extras.pop(_T0_KEY, None)
+    if t0 is None:
+        return
+    cmd = interaction.command
+    name = cmd.qualified_name if cmd is not None else "unknown"
+    registry.observe("command", name, time.perf_counter() - t0, error=error)
+
+
+# -------------------------
+# endpoint HTTP local (opcional)
+# -------------------------
+class MetricsServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 9108) -> None:
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def start(self) -> None:
+        from aiohttp import web
+
+        async def handle(_request):
+            return web.Response(text=registry.render_prometheus(), content_type="text/plain")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("Metrics em http://%s:%s/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,184 @@
+# utils/paging.py
+import inspect
+from typing import Callable
+
+import discord
+
+from utils.embeds import NEON_PURPLE
+
+# limites da API do Discord
+MESSAGE_MAX = 2000
+EMBED_DESC_MAX = 4096
+EMBED_TOTAL_MAX = 6000
+EMBEDS_PER_MESSAGE = 10
+
+_SEPARATORS = ("\n\n", "\n", " ")
+
+# parágrafo maior que isso pode ser quebrado para completar uma página
+SPLIT_MIN = 500
+
+
+def split_text(text: str, limit: int, _seps: tuple[str, ...] = _SEPARATORS) -> list[str]:
+    """
+    Quebra o texto em pedaços de até `limit` caracteres.
+    - Junta o máximo possível por pedaço, cortando de preferência entre
+      parágrafos, depois entre linhas, depois entre palavras.
+    - Só corta no meio de uma palavra se ela sozinha passar do limite.
+    """
+    text = text.strip()
+    if len(text) <= limit:
+        return [text] if text else []
+    if not _seps:
+        return [text[i:i + limit] for i in range(0, len(text), limit)]
+
+    sep, rest = _seps[0], _seps[1:]
+    chunks: list[str] = []
+    current = ""
+    for part in text.split(sep):
+        if len(part) > limit:
+            # parte grande demais: quebra no separador seguinte e continua
+            # juntando a sobra com o que vem depois
+            if current:
+                chunks.append(current)
+            pieces = split_text(part, limit, rest)
+            chunks.extend(pieces[:-1])
+            current = pieces[-1] if pieces else ""
+            continue
+        candidate = f"{current}{sep}{part}" if current else part
+        if len(candidate) <= limit:
+            current = candidate
+        else:
+            chunks.append(current)
+            current = part
+    if current:
+        chunks.append(current)
+    return [c.strip() for c in chunks if c.strip()]
+
+
+def continuation_page(index: int) -> discord.Embed:
+    # páginas depois da primeira: sem título/author, só a cor da marca
+    return discord.Embed(color=NEON_PURPLE)
+
+
+def paginate(
+    text: str,
+    first: discord.Embed,
+    make_page: Callable[[int], discord.Embed] = continuation_page,
+    *,
+    page_max: int = EMBED_DESC_MAX,
+    message_max: int = EMBED_TOTAL_MAX,
+    per_message: int = EMBEDS_PER_MESSAGE,
+) -> list[list[discord.Embed]]:
+    """
+    Distribui o texto em embeds e os embeds em mensagens.
+    - `first` é a primeira página (título, author, thumbnail); as outras
+      saem de make_page(i). A description de cada página é preenchida aqui.
+    - Cada página respeita o limite de description; cada mensagem leva até
+      `per_message` embeds e no máximo `message_max` caracteres somados
+      (título, author, footer e description), como a API exige.
+    - Os cortes caem entre parágrafos sempre que possível.
+    Devolve uma lista de mensagens, cada uma com a sua lista de embeds.
+    """
+    # nenhum parágrafo pode passar do que cabe numa página vazia
+    limit = min(page_max, message_max - len(first))
+    atoms: list[str] = []
+    for para in text.strip().split("\n\n"):
+        atoms.extend(split_text(para, limit))
+
+    messages: list[list[discord.Embed]] = [[]]
+    used = 0
+    pages = 1
+    page, desc = first, ""
+
+    def close_page() -> None:
+        nonlocal used, pages, page, desc
+        page.description = desc
+        messages[-1].append(page)
+        used += len(page)
+        page, desc = make_page(pages), ""
+        pages += 1
+
+    def next_message() -> None:
+        nonlocal used
+        messages.append([])
+        used = 0
+
+    for atom in atoms:
+        while atom:
+            if len(messages[-1]) >= per_message:
+                next_message()
+            candidate = f"{desc}\n\n{atom}" if desc else atom
+            room = min(page_max, message_max - used - len(page))
+            if len(candidate) <= room:
+                desc = candidate
+                break
+            free = room - (len(desc) + 2 if desc else 0)
+            if len(atom) > SPLIT_MIN and free >= SPLIT_MIN:
+                # parágrafo enorme: completa a página em vez de abrir outra
+                head = split_text(atom, free)[0]
+                desc = f"{desc}\n\n{head}" if desc else head
+                atom = atom[len(head):].strip()
+                close_page()
+                continue
+            if desc:
+                close_page()
+            elif used:
+                # página vazia e ainda não cabe: a mensagem atual lotou
+                next_message()
+            else:
+                # não acontece com atoms <= limit; evita laço infinito
+                desc = atom[:room]
+                break
+    if desc or not messages[-1]:
+        page.description = desc or None
+        messages[-1].append(page)
+    return [m for m in messages if m]
+
+
+async def send_embeds(
+    channel: discord.abc.Messageable,
+    messages: list[list[discord.Embed]],
+    *,
+    content: str | None = None,
+    allowed_mentions: discord.AllowedMentions | None = None,
+    skip: int = 0,
+    on_sent: Callable[[discord.Message], object] | None = None,
+) -> list[discord.Message]:
+    """
+    Envia as mensagens montadas por paginate(), em ordem.
+    - `content` (ex.: @everyone) só vai na primeira.
+    - `skip` pula as que já saíram (retomada de job); on_sent é chamado
+      depois de cada envio, para o caller registrar o progresso.
+    """
+    sent: list[discord.Message] = []
+    for i, embeds in enumerate(messages):
+        if i < skip:
+            continue
+        kwargs = {"embeds": embeds}
+        if i == 0 and content:
+            kwargs["content"] = content
+        if allowed_mentions is not None:
+            kwargs["allowed_mentions"] = allowed_mentions
+        msg = await channel.send(**kwargs)
+        sent.append(msg)
+        if on_sent is not None:
+            result = on_sent(msg)
+            if inspect.isawaitable(result):
+                await result
+    return sent
+
+
+async def send_text(
+    channel: discord.abc.Messageable,
+    text: str,
+    *,
+    allowed_mentions: discord.AllowedMentions | None = None,
+) -> list[discord.Message]:
+    """Texto comum: quebra em mensagens de até 2000 caracteres, entre parágrafos."""
+    sent: list[discord.Message] = []
+    for chunk in split_text(text, MESSAGE_MAX):
+        if allowed_mentions is not None:
+            sent.append(await channel.send(chunk, allowed_mentions=allowed_mentions))
+        else:
+            sent.append(await channel.send(chunk))
+    return sent
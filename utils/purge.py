@@ -0,0 +1,391 @@
+# utils/purge.py
+import asyncio
+import datetime
+import logging
+from dataclasses import asdict, dataclass, field, fields
+from typing import Callable, Iterable
+
+import discord
+
+from utils.jobs import CANCELLED, DONE, FAILED, ICONS, PENDING, RUNNING, Job, JobContext, JobError, JobType
+from utils.rate_limit import TokenBucket, call_with_backoff
+
+logger = logging.getLogger("duki_odyssey.purge")
+
+PAGE_SIZE = 100
+BULK_MAX = 100
+# bulk delete só aceita mensagens com menos de 14 dias; a margem cobre o
+# tempo que a mensagem "envelhece" entre a leitura e o delete
+BULK_MAX_AGE = datetime.timedelta(days=14) - datetime.timedelta(minutes=10)
+
+# tipos de job (JobScheduler)
+CLEAN = "clean"
+CLEAN_USER = "clean_user"
+
+
+def bulk_cutoff() -> int:
+    """Snowflake mínimo para entrar no bulk delete."""
+    return discord.utils.time_snowflake(discord.utils.utcnow() - BULK_MAX_AGE)
+
+
+@dataclass
+class PurgeProgress:
+    scanned: int = 0
+    deleted_bulk: int = 0
+    deleted_old: int = 0
+    skipped: int = 0
+    failed: int = 0
+    # snowflake da mensagem mais antiga já tratada (retomada usa before=)
+    cursor: int | None = None
+
+    @property
+    def deleted(self) -> int:
+        return self.deleted_bulk + self.deleted_old
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PurgeProgress":
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+    @classmethod
+    def total(cls, items: Iterable["PurgeProgress"]) -> "PurgeProgress":
+        total = cls()
+        for p in items:
+            total.scanned += p.scanned
+            total.deleted_bulk += p.deleted_bulk
+            total.deleted_old += p.deleted_old
+            total.skipped += p.skipped
+            total.failed += p.failed
+        return total
+
+
+@dataclass
+class PurgeJob:
+    """
+    Limpeza de um canal.
+    - Lê o histórico em páginas de 100 (a próxima página já vem sendo
+      buscada enquanto a atual é apagada).
+    - Mensagens < 14 dias: bulk delete em lotes de até 100.
+    - Mensagens antigas: faixa lenta, uma a uma, espaçada por TokenBucket.
+    - `progress.cursor` só avança depois que a página inteira foi tratada,
+      então cancelar e retomar não pula nem repete mensagens.
+    - Estado e erro ficam no objeto; a exceção (inclusive o cancelamento)
+      sobe para quem chamou.
+    """
+
+    id: int
+    channel: discord.TextChannel
+    limit: int | None
+    include_pinned: bool = False
+    reason: str | None = None
+    old_rate: float = 1.0
+    # filtros opcionais: só estes autores / só depois deste snowflake
+    author_ids: frozenset[int] | None = None
+    after_id: int | None = None
+    status: str = PENDING
+    error: str | None = None
+    progress: PurgeProgress = field(default_factory=PurgeProgress)
+
+    def __post_init__(self) -> None:
+        self._bucket = TokenBucket(self.old_rate, 1)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, CANCELLED, FAILED)
+
+    def eligible(self, msg: discord.Message) -> bool:
+        if self.author_ids is not None and (msg.author is None or msg.author.id not in self.author_ids):
+            return False
+        return self.include_pinned or not msg.pinned
+
+    def state(self) -> dict:
+        """Checkpoint serializável (progresso + estado)."""
+        return {**asdict(self.progress), "status": self.status, "error": self.error}
+
+    async def run(self, on_progress: Callable[["PurgeJob"], None] | None = None) -> None:
+        self.status = RUNNING
+        self.error = None
+        pages: asyncio.Queue = asyncio.Queue(maxsize=2)
+        reader = asyncio.create_task(self._read(pages))
+        try:
+            while (page := await pages.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                await self._process(page)
+                self.progress.cursor = page[-1].id
+                if on_progress is not None:
+                    on_progress(self)
+            await reader
+            self.status = DONE
+        except asyncio.CancelledError:
+            self.status = CANCELLED
+            raise
+        except discord.Forbidden:
+            self.status = FAILED
+            self.error = "Sem permissão para ler/apagar mensagens nesse canal."
+            raise
+        except Exception as e:
+            self.status = FAILED
+            self.error = type(e).__name__
+            raise
+        finally:
+            reader.cancel()
+            if on_progress is not None:
+                on_progress(self)
+
+    async def _read(self, pages: asyncio.Queue) -> None:
+        before = discord.Object(self.progress.cursor) if self.progress.cursor else None
+        remaining = None if self.limit is None else self.limit - self.progress.scanned
+        try:
+            while remaining is None or remaining > 0:
+                size = PAGE_SIZE if remaining is None else min(PAGE_SIZE, remaining)
+                page = [m async for m in self.channel.history(limit=size, before=before)]
+                # histórico vem do mais novo para o mais antigo: passou da janela, acabou
+                in_window = page if self.after_id is None else [m for m in page if m.id > self.after_id]
+                if not in_window:
+                    break
+                await pages.put(in_window)
+                if len(in_window) < len(page):
+                    break
+                if remaining is not None:
+                    remaining -= len(page)
+                before = page[-1]
+        except Exception as e:
+            # erro de leitura sobe no run(), junto com os de delete
+            await pages.put(e)
+            return
+        await pages.put(None)
+
+    async def _process(self, page: list[discord.Message]) -> None:
+        p = self.progress
+        cutoff = bulk_cutoff()
+        recent: list[discord.Message] = []
+        old: list[discord.Message] = []
+        kept = 0
+        for msg in page:
+            if not self.eligible(msg):
+                kept += 1
+            elif msg.id >= cutoff:
+                recent.append(msg)
+            else:
+                old.append(msg)
+
+        # o que foi apagado não volta na retomada e conta na hora; o que
+        # fica no canal (ignoradas, falhas) só conta com a página concluída,
+        # senão cancelar no meio e retomar conta de novo
+        for i in range(0, len(recent), BULK_MAX):
+            chunk = recent[i:i + BULK_MAX]
+            await call_with_backoff(lambda: self.channel.delete_messages(chunk, reason=self.reason))
+            p.deleted_bulk += len(chunk)
+            p.scanned += len(chunk)
+
+        failed = 0
+        for msg in old:
+            try:
+                await call_with_backoff(lambda: msg.delete(), bucket=self._bucket)
+            except discord.NotFound:
+                p.skipped += 1
+                p.scanned += 1
+            except discord.HTTPException:
+                failed += 1
+            else:
+                p.deleted_old += 1
+                p.scanned += 1
+
+        p.skipped += kept
+        p.failed += failed
+        p.scanned += kept + failed
+
+
+@dataclass
+class SweepJob:
+    """
+    Limpeza de autores em vários canais (pós-raid).
+    - Um PurgeJob por canal, com filtro de autores e janela de tempo.
+    - No máximo `concurrency` canais ao mesmo tempo; cada canal tem as
+      próprias rotas de leitura/bulk no Discord, então o paralelismo rende.
+    - Erro num canal (ex.: sem permissão) não derruba os outros; fica no
+      estado do canal e entra no relatório consolidado.
+    - Canais já concluídos (retomada) não são lidos de novo.
+    """
+
+    id: int
+    channels: list[discord.TextChannel]
+    author_ids: frozenset[int]
+    after_id: int | None = None
+    concurrency: int = 8
+    reason: str | None = None
+    old_rate: float = 1.0
+    status: str = PENDING
+    children: list[PurgeJob] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if not self.children:
+            self.children = [
+                PurgeJob(
+                    self.id, ch, None, include_pinned=True, reason=self.reason, old_rate=self.old_rate,
+                    author_ids=self.author_ids, after_id=self.after_id,
+                )
+                for ch in self.channels
+            ]
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, CANCELLED, FAILED)
+
+    @property
+    def progress(self) -> PurgeProgress:
+        return PurgeProgress.total(c.progress for c in self.children)
+
+    async def run(self, on_progress: Callable[["SweepJob"], None] | None = None) -> None:
+        self.status = RUNNING
+        sem = asyncio.Semaphore(self.concurrency)
+        child_progress = (lambda _c: on_progress(self)) if on_progress is not None else None
+
+        async def one(child: PurgeJob) -> None:
+            if child.status == DONE:
+                return
+            async with sem:
+                try:
+                    await child.run(child_progress)
+                except discord.Forbidden:
+                    pass
+                except Exception:
+                    logger.exception("Varredura #%s falhou no canal %s.", self.id, child.channel.id)
+
+        try:
+            await asyncio.gather(*(one(c) for c in self.children))
+            self.status = DONE
+        except asyncio.CancelledError:
+            self.status = CANCELLED
+            raise
+        finally:
+            if on_progress is not None:
+                on_progress(self)
+
+
+# -------------------------
+# relatórios (só a partir do checkpoint)
+# -------------------------
+def describe_clean(job: Job) -> str:
+    p = PurgeProgress.from_dict(job.progress)
+    limit = job.params.get("limit")
+    return (
+        f"{ICONS.get(job.status, '🕒')} **{job.status}** • <#{job.params['channel_id']}>\n"
+        f"🔎 Lidas: **{p.scanned}**" + (f" / {limit}" if limit else "") + "\n"
+        f"🗑️ Removidas: **{p.deleted}** (lote {p.deleted_bulk} • antigas {p.deleted_old})\n"
+        f"📌 Ignoradas: **{p.skipped}** • ❗ Falhas: **{p.failed}**"
+        + (f"\n⛔ {job.error}" if job.error else "")
+    )
+
+
+def describe_sweep(job: Job) -> str:
+    states: dict[str, dict] = job.progress.get("channels", {})
+    per_channel = {cid: PurgeProgress.from_dict(s) for cid, s in states.items()}
+    p = PurgeProgress.total(per_channel.values())
+    hits = sorted((item for item in per_channel.items() if item[1].deleted), key=lambda x: x[1].deleted, reverse=True)
+    failed = [(cid, s.get("error")) for cid, s in states.items() if s.get("status") == FAILED]
+    lines = [
+        f"{ICONS.get(job.status, '🕒')} **{job.status}** • {len(job.params['channel_ids'])} canais • {job.elapsed:.1f}s",
+        f"👤 Autores: {', '.join(f'<@{a}>' for a in sorted(job.params['author_ids']))}",
+        f"🔎 Lidas: **{p.scanned}** • 🗑️ Removidas: **{p.deleted}** (lote {p.deleted_bulk} • antigas {p.deleted_old})",
+    ]
+    if hits:
+        lines.append("📂 " + " • ".join(f"<#{cid}> {cp.deleted}" for cid, cp in hits[:10]))
+    if failed:
+        lines.append("⛔ Falharam: " + " • ".join(f"<#{cid}> ({err})" for cid, err in failed[:10]))
+    if job.error:
+        lines.append(f"⛔ {job.error}")
+    return "\n".join(lines)
+
+
+class PurgeJobs:
+    """
+    Limpezas como jobs do JobScheduler.
+    - "clean": um canal (PurgeJob); checkpoint = PurgeProgress, cursor incluso.
+    - "clean_user": vários canais (SweepJob); checkpoint por canal.
+    - Restart, nova tentativa ou /job_retry retomam cada canal do próprio cursor.
+    """
+
+    def __init__(self, client: discord.Client, *, old_rate: float = 1.0, sweep_concurrency: int = 8) -> None:
+        self.client = client
+        self.old_rate = old_rate
+        self.sweep_concurrency = sweep_concurrency
+
+    def job_types(self) -> list[JobType]:
+        return [
+            JobType(CLEAN, "LIMPEZA", self._run_clean, describe_clean),
+            JobType(CLEAN_USER, "VARREDURA", self._run_sweep, describe_sweep),
+        ]
+
+    @staticmethod
+    def clean_params(
+        channel: discord.abc.GuildChannel,
+        *,
+        limit: int | None,
+        include_pinned: bool = False,
+        reason: str | None = None,
+    ) -> dict:
+        return {"channel_id": channel.id, "limit": limit, "include_pinned": include_pinned, "reason": reason}
+
+    @staticmethod
+    def sweep_params(
+        channels: list[discord.abc.GuildChannel],
+        author_ids: frozenset[int],
+        *,
+        after: datetime.datetime | None = None,
+        reason: str | None = None,
+    ) -> dict:
+        return {
+            "channel_ids": [ch.id for ch in channels],
+            "author_ids": sorted(author_ids),
+            "after_id": discord.utils.time_snowflake(after) if after is not None else None,
+            "reason": reason,
+        }
+
+    async def _run_clean(self, ctx: JobContext) -> None:
+        params = ctx.params
+        channel = self.client.get_channel(params["channel_id"])
+        if channel is None:
+            raise JobError("Canal não existe mais.")
+        job = PurgeJob(
+            ctx.job.id,
+            channel,
+            params["limit"],
+            params["include_pinned"],
+            params["reason"],
+            self.old_rate,
+            progress=PurgeProgress.from_dict(ctx.progress),
+        )
+        try:
+            await job.run(lambda j: ctx.checkpoint(asdict(j.progress)))
+        except discord.Forbidden:
+            raise JobError(job.error) from None
+
+    async def _run_sweep(self, ctx: JobContext) -> None:
+        params = ctx.params
+        states: dict[str, dict] = ctx.progress.get("channels", {})
+        author_ids = frozenset(params["author_ids"])
+        children: list[PurgeJob] = []
+        missing: dict[str, dict] = {}
+        for cid in params["channel_ids"]:
+            state = states.get(str(cid), {})
+            channel = self.client.get_channel(cid)
+            if channel is None:
+                missing[str(cid)] = {**state, "status": FAILED, "error": "canal não existe mais"}
+                continue
+            children.append(
+                PurgeJob(
+                    ctx.job.id, channel, None, include_pinned=True, reason=params["reason"], old_rate=self.old_rate,
+                    author_ids=author_ids, after_id=params["after_id"],
+                    status=state.get("status", PENDING), progress=PurgeProgress.from_dict(state),
+                )
+            )
+        sweep = SweepJob(
+            ctx.job.id, [c.channel for c in children], author_ids, params["after_id"],
+            self.sweep_concurrency, params["reason"], self.old_rate, children=children,
+        )
+
+        def checkpoint(s: SweepJob) -> None:
+            ctx.checkpoint({"channels": {**missing, **{str(c.channel.id): c.state() for c in s.children}}})
+
+        await sweep.run(checkpoint)
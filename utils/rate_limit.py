@@ -0,0 +1,85 @@
+# utils/rate_limit.py
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import discord
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Token bucket assíncrono para espaçar chamadas REST de uma mesma rota.
+    - `rate` tokens por segundo, até `capacity` acumulados (rajada).
+    - acquire() espera o próximo token sem ocupar o event loop.
+    - penalize() esvazia o bucket por um tempo (ex.: depois de um 429).
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate precisa ser > 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Espera até ter `tokens` disponíveis. Devolve quanto tempo esperou."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def penalize(self, seconds: float) -> None:
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+def _is_retryable(e: discord.HTTPException) -> bool:
+    return e.status == 429 or e.status >= 500
+
+
+async def call_with_backoff(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    attempts: int = 4,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    bucket: TokenBucket | None = None,
+) -> T:
+    """
+    Chama fn() repetindo em 429/5xx com backoff exponencial + jitter.
+    Em 429 respeita o retry_after quando vier. Outros erros sobem direto.
+    """
+    for attempt in range(attempts):
+        if bucket is not None:
+            await bucket.acquire()
+        try:
+            return await fn()
+        except discord.HTTPException as e:
+            if not _is_retryable(e) or attempt == attempts - 1:
+                raise
+            delay = min(max_delay, base_delay * (2 ** attempt)) * (1 + random.random() * 0.25)
+            retry_after = getattr(e, "retry_after", None)
+            if e.status == 429 and retry_after:
+                delay = max(delay, float(retry_after))
+            if bucket is not None:
+                # o próximo acquire() já espera; vale para todos os workers do bucket
+                bucket.penalize(delay)
+            else:
+                await asyncio.sleep(delay)
+    raise RuntimeError("unreachable")
@@ -0,0 +1,145 @@
+# utils/role_grants.py
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+import discord
+
+from utils.rate_limit import TokenBucket
+
+logger = logging.getLogger("duki_odyssey.roles")
+
+
+@dataclass
+class GrantRequest:
+    member: discord.Member
+    role: discord.Role
+    interaction: discord.Interaction
+    reason: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class RoleGrantWorker:
+    """
+    Fila compartilhada de concessão de cargos.
+    - O botão só faz defer + submit(); o add_roles roda aqui.
+    - Um bucket por guild espaça as chamadas da rota de cargos.
+    - Cliques repetidos do mesmo membro enquanto o pedido está na fila são ignorados.
+    - A confirmação vai por followup (token vale 15 min).
+    """
+
+    def __init__(self, rate: float = 5.0, burst: float = 1.0, workers: int = 4, max_queue: int = 10000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.workers = workers
+        self._queue: asyncio.Queue[GrantRequest] = asyncio.Queue(maxsize=max_queue)
+        self._pending: set[tuple[int, int]] = set()
+        self._buckets: dict[int, TokenBucket] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._replies: set[asyncio.Task] = set()
+
+        self.granted = 0
+        self.failed = 0
+        self.deduped = 0
+        self.rate_limited = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "granted": self.granted,
+            "failed": self.failed,
+            "deduped": self.deduped,
+            "rate_limited": self.rate_limited,
+            "pending": self.pending,
+        }
+
+    def is_pending(self, guild_id: int, member_id: int) -> bool:
+        return (guild_id, member_id) in self._pending
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"role-grants:{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._replies:
+            await asyncio.gather(*self._replies, return_exceptions=True)
+
+    def _bucket(self, guild_id: int) -> TokenBucket:
+        bucket = self._buckets.get(guild_id)
+        if bucket is None:
+            bucket = self._buckets[guild_id] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def submit(self, member: discord.Member, role: discord.Role, interaction: discord.Interaction, reason: str) -> bool:
+        """Enfileira o pedido. False se o membro já tem um pedido na fila (ou a fila está cheia)."""
+        key = (member.guild.id, member.id)
+        if key in self._pending:
+            self.deduped += 1
+            return False
+        try:
+            self._queue.put_nowait(GrantRequest(member, role, interaction, reason))
+        except asyncio.QueueFull:
+            return False
+        self._pending.add(key)
+        if not self._tasks:
+            self.start()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            req = await self._queue.get()
+            try:
+                await self._grant(req)
+            except Exception:
+                logger.exception("Falha inesperada ao conceder cargo.")
+            finally:
+                self._pending.discard((req.member.guild.id, req.member.id))
+
+    async def _grant(self, req: GrantRequest) -> None:
+        bucket = self._bucket(req.member.guild.id)
+        await bucket.acquire()
+
+        try:
+            await req.member.add_roles(req.role, reason=req.reason)
+        except discord.Forbidden:
+            self.failed += 1
+            await self._reply(
+                req,
+                "Não tenho permissão para dar esse cargo. "
+                "Verifique 'Gerenciar cargos' e a hierarquia.",
+            )
+            return
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self.rate_limited += 1
+                bucket.penalize(float(getattr(e, "retry_after", 1.0) or 1.0))
+            self.failed += 1
+            await self._reply(req, "O Discord recusou a ação agora. Tente novamente em instantes.")
+            return
+
+        self.granted += 1
+        await self._reply(req, "✅ Verificação concluída. Seu acesso foi liberado.")
+
+    async def _reply(self, req: GrantRequest, msg: str) -> None:
+        # followup usa outra rota (webhook); não segura a vaga do worker
+        task = asyncio.create_task(self._send_followup(req, msg))
+        self._replies.add(task)
+        task.add_done_callback(self._replies.discard)
+
+    async def _send_followup(self, req: GrantRequest, msg: str) -> None:
+        try:
+            await req.interaction.followup.send(msg, ephemeral=True)
+        except discord.HTTPException:
+            pass
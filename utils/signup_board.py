@@ -0,0 +1,141 @@
+# utils/signup_board.py
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+import discord
+
+from utils import event_service
+from utils.signups import SignupIngest
+
+logger = logging.getLogger("duki_odyssey.events")
+
+COUNTS_FIELD = "📋 Inscritos"
+
+
+@dataclass
+class _Board:
+    event_id: int
+    channel_id: int
+    message_id: int
+    embed: discord.Embed | None = None
+    dirty: bool = False
+    last_edit: float = 0.0
+    task: asyncio.Task | None = None
+
+
+class SignupBoard:
+    """
+    Contagem ao vivo (cantores/espectadores) na mensagem da chamada.
+    - touch() só marca a mensagem como suja; não chama a API.
+    - No máximo uma edição a cada `interval` segundos por mensagem, sempre
+      com a contagem mais recente (vinda de SignupIngest).
+    - Mensagens acompanhadas ficam em events (signup_channel_id /
+      signup_message_id); recover() retoma tudo no boot.
+    """
+
+    def __init__(self, client: discord.Client, ingest: SignupIngest, *, interval: float = 3.0) -> None:
+        self.client = client
+        self.ingest = ingest
+        self.interval = interval
+        self._boards: dict[int, _Board] = {}
+
+        self.touches = 0
+        self.edits = 0
+        self.failed = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "tracked": len(self._boards),
+            "touches": self.touches,
+            "edits": self.edits,
+            "edits_saved": max(0, self.touches - self.edits),
+            "failed": self.failed,
+        }
+
+    # -------------------------
+    # registro
+    # -------------------------
+    async def track(self, event_id: int, message: discord.Message) -> None:
+        await event_service.set_signup_message(event_id, message.channel.id, message.id)
+        embed = message.embeds[0] if message.embeds else None
+        self._boards[event_id] = _Board(event_id, message.channel.id, message.id, embed)
+
+    async def recover(self) -> int:
+        """Volta a acompanhar as chamadas abertas (estado de inscrições vem do banco)."""
+        rows = await event_service.get_tracked_signup_messages()
+        for row in rows:
+            event_id = row["id"]
+            self.ingest.load(event_id, await event_service.get_event_signups(event_id))
+            self._boards[event_id] = _Board(event_id, row["signup_channel_id"], row["signup_message_id"])
+            # reconcilia o que estiver na mensagem com o banco
+            self.touch(event_id)
+        return len(rows)
+
+    # -------------------------
+    # coalescer
+    # -------------------------
+    def touch(self, event_id: int) -> None:
+        board = self._boards.get(event_id)
+        if board is None:
+            return
+        self.touches += 1
+        board.dirty = True
+        if board.task is None:
+            board.task = asyncio.create_task(self._run(board), name=f"signup-board:{event_id}")
+
+    async def _run(self, board: _Board) -> None:
+        try:
+            while board.dirty:
+                delay = board.last_edit + self.interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                board.dirty = False
+                await self._edit(board)
+                board.last_edit = time.monotonic()
+        finally:
+            board.task = None
+
+    def _partial(self, board: _Board) -> discord.PartialMessage:
+        return self.client.get_partial_messageable(board.channel_id).get_partial_message(board.message_id)
+
+    async def _edit(self, board: _Board, **kwargs) -> None:
+        try:
+            if board.embed is None:
+                # após restart: busca o embed original uma única vez
+                message = await self._partial(board).fetch()
+                board.embed = message.embeds[0] if message.embeds else discord.Embed()
+            singers, spectators = self.ingest.counts(board.event_id)
+            embed = board.embed.copy()
+            embed.clear_fields()
+            embed.add_field(name=COUNTS_FIELD, value=f"🎤 Cantores: **{singers}**\n👀 Espectadores: **{spectators}**")
+            await self._partial(board).edit(embed=embed, **kwargs)
+        except discord.NotFound:
+            # mensagem apagada: para de acompanhar
+            self._boards.pop(board.event_id, None)
+            return
+        except discord.HTTPException:
+            self.failed += 1
+            logger.warning("Falha ao atualizar a contagem da chamada do evento %s.", board.event_id)
+            return
+        self.edits += 1
+
+    async def finish(self, event_id: int) -> None:
+        """Última edição (contagem final, sem botões) e para de acompanhar."""
+        board = self._boards.pop(event_id, None)
+        if board is None:
+            return
+        if board.task is not None:
+            board.task.cancel()
+        await self._edit(board, view=None)
+
+    async def flush(self) -> None:
+        """Aplica edições pendentes agora (shutdown)."""
+        for board in list(self._boards.values()):
+            if board.task is not None:
+                board.task.cancel()
+                board.task = None
+            if board.dirty:
+                board.dirty = False
+                await self._edit(board)
@@ -0,0 +1,99 @@
+# utils/signups.py
+from collections import Counter
+from datetime import datetime
+
+from utils.batch_writer import BatchWriter
+
+SINGER = "singer"
+SPECTATOR = "spectator"
+
+UPSERT_SIGNUP_SQL = """
+INSERT INTO event_signups (event_id, user_id, signup_type, status, confirmed_at)
+VALUES (?, ?, ?, 'confirmed', ?)
+ON CONFLICT(event_id, user_id) DO UPDATE SET
+    signup_type = excluded.signup_type,
+    status = 'confirmed',
+    updated_at = excluded.confirmed_at,
+    cancelled_at = NULL
+"""
+
+# resultado de record()
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+
+class SignupIngest:
+    """
+    Entrada dos cliques da chamada do karaokê.
+    - record() é síncrono: decide em memória se o clique muda algo.
+    - Clique repetido no mesmo botão não gera escrita.
+    - Trocas cantor/espectador viram upsert no BatchWriter; trocas dentro
+      do mesmo lote se fundem numa linha (key = (event_id, user_id)).
+    - O callback responde antes de enfileirar; nada espera o banco.
+    """
+
+    def __init__(self, *, max_batch: int = 200, max_delay_ms: int = 250) -> None:
+        self.writer = BatchWriter(
+            "event_signups",
+            UPSERT_SIGNUP_SQL,
+            max_batch=max_batch,
+            max_delay_ms=max_delay_ms,
+            key=lambda row: (row[0], row[1]),
+        )
+        # event_id -> {user_id: signup_type}
+        self._state: dict[int, dict[int, str]] = {}
+        # event_id -> Counter(signup_type), atualizado junto com _state
+        self._counts: dict[int, Counter] = {}
+
+        self.clicks = 0
+        self.duplicates = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"clicks": self.clicks, "duplicates": self.duplicates, **self.writer.stats()}
+
+    def start(self) -> None:
+        self.writer.start()
+
+    async def stop(self) -> None:
+        await self.writer.stop()
+
+    async def flush(self) -> None:
+        await self.writer.join()
+
+    def record(self, event_id: int, user_id: int, signup_type: str) -> str:
+        self.clicks += 1
+        users = self._state.setdefault(event_id, {})
+        previous = users.get(user_id)
+        if previous == signup_type:
+            self.duplicates += 1
+            return UNCHANGED
+        users[user_id] = signup_type
+        counts = self._counts.setdefault(event_id, Counter())
+        counts[signup_type] += 1
+        if previous is not None:
+            counts[previous] -= 1
+            return CHANGED
+        return NEW
+
+    def load(self, event_id: int, rows) -> None:
+        """Estado vindo do banco (boot): dedupe e contagem continuam certos."""
+        users = self._state.setdefault(event_id, {})
+        for row in rows:
+            users.setdefault(row["user_id"], row["signup_type"])
+        self._counts[event_id] = Counter(users.values())
+
+    def counts(self, event_id: int) -> tuple[int, int]:
+        counts = self._counts.get(event_id) or Counter()
+        return counts[SINGER], counts[SPECTATOR]
+
+    async def persist(self, event_id: int, user_id: int) -> bool:
+        """Enfileira o estado atual do usuário (chamar depois do ack)."""
+        signup_type = self._state.get(event_id, {}).get(user_id)
+        if signup_type is None:
+            return False
+        return await self.writer.put((event_id, user_id, signup_type, datetime.utcnow().isoformat()))
+
+    def forget(self, event_id: int) -> None:
+        self._state.pop(event_id, None)
+        self._counts.pop(event_id, None)
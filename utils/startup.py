@@ -0,0 +1,168 @@
+# utils/startup.py
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger("duki_odyssey.startup")
+
+# imports mostrados no relatório (os mais caros pelo tempo próprio)
+TOP_IMPORTS = 15
+
+
+class _TimedLoader:
+    """Embrulha o loader real e mede o exec_module; o resto é repassado."""
+
+    def __init__(self, loader, profiler: "StartupProfiler", name: str) -> None:
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        if threading.get_ident() != self._profiler._thread:
+            # a pilha de tempos é da thread principal
+            return self._loader.exec_module(module)
+        self._profiler._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class _ImportTimer:
+    """Meta path finder que só troca o loader do spec encontrado pelos outros."""
+
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        self._profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            find = getattr(finder, "find_spec", None)
+            if finder is self or find is None:
+                continue
+            spec = find(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profiler, name)
+        return spec
+
+
+class StartupProfiler:
+    """
+    Profiler do cold start (opt-in: STARTUP_PROFILE=1).
+    - Import de cada módulo: tempo acumulado e próprio (sem os imports
+      aninhados), medido por um finder em sys.meta_path.
+    - Fases nomeadas (extensões, login) com phase(); marcos na linha do
+      tempo (fim dos imports, primeiro READY) com mark().
+    - finish() desliga o finder e loga o relatório; stats() vira o
+      collector "startup" do /metrics.
+    Desligado, phase()/mark() não fazem nada.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._t0 = 0.0
+        self._thread: int | None = None
+        self._finder: _ImportTimer | None = None
+        self._stack: list[list[float]] = []
+        self.interpreter_ms = 0.0
+        self.imports: dict[str, tuple[float, float]] = {}
+        self.phases: dict[str, float] = {}
+        self.marks: dict[str, float] = {}
+
+    def start(self) -> None:
+        if self.enabled:
+            return
+        self.enabled = True
+        self._t0 = time.perf_counter()
+        self._thread = threading.get_ident()
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+        try:
+            import psutil
+
+            # tempo do intérprete antes do main.py (site, encodings, ...)
+            self.interpreter_ms = max(0.0, (time.time() - psutil.Process().create_time()) * 1000)
+        except Exception:
+            pass
+
+    def _enter(self) -> None:
+        # [início, tempo gasto nos imports filhos]
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _exit(self, name: str) -> None:
+        start, children = self._stack.pop()
+        total = time.perf_counter() - start
+        self.imports[name] = (total * 1000, (total - children) * 1000)
+        if self._stack:
+            self._stack[-1][1] += total
+
+    def _since_start(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+    def mark(self, name: str) -> None:
+        if self.enabled and name not in self.marks:
+            self.marks[name] = self._since_start()
+
+    @contextmanager
+    def phase(self, name: str, *, exclude: tuple[str, ...] = ()) -> Iterator[None]:
+        """Mede o bloco; `exclude` desconta fases aninhadas (ex.: setup_hook dentro do login)."""
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            self.phases[name] = ms - sum(self.phases.get(n, 0.0) for n in exclude)
+
+    def finish(self) -> None:
+        if not self.enabled or self._finder is None:
+            return
+        try:
+            sys.meta_path.remove(self._finder)
+        except ValueError:
+            pass
+        self._finder = None
+        logger.info("%s", self.report())
+
+    def report(self) -> str:
+        lines = [f"Startup (ms desde o main.py; intérprete antes disso: {self.interpreter_ms:.0f}ms)"]
+        lines += [f"  {name:<24} {ms:8.1f}" for name, ms in self.marks.items()]
+        if self.phases:
+            lines.append("Fases:")
+            lines += [f"  {name:<24} {ms:8.1f}" for name, ms in self.phases.items()]
+        if self.imports:
+            top = sorted(self.imports.items(), key=lambda kv: kv[1][1], reverse=True)[:TOP_IMPORTS]
+            lines.append(f"Imports ({len(self.imports)} módulos; próprio / acumulado):")
+            lines += [f"  {name:<40} {own:8.1f} {cum:8.1f}" for name, (cum, own) in top]
+        return "\n".join(lines)
+
+    def stats(self) -> dict[str, float]:
+        out = {f"{name}_ms": round(ms, 1) for name, ms in self.marks.items()}
+        out.update({f"{name.replace(' ', '_').replace('.', '_')}_ms": round(ms, 1) for name, ms in self.phases.items()})
+        out["interpreter_ms"] = round(self.interpreter_ms, 1)
+        out["modules_imported"] = len(self.imports)
+        return out
+
+
+profiler = StartupProfiler()
+
+
+def begin() -> None:
+    # lido direto do ambiente: precisa valer antes do import do config/discord
+    if (os.getenv("STARTUP_PROFILE") or "").strip().lower() in ("1", "true", "yes"):
+        profiler.start()
@@ -0,0 +1,214 @@
+# utils/templates.py
+import string
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import discord
+
+from utils import database
+
+# placeholders aceitos nos templates
+PLACEHOLDERS = {
+    "member": "menção do membro",
+    "member_name": "nome de exibição do membro",
+    "guild": "nome do servidor",
+    "member_count": "total de membros do servidor",
+    "channel": "menção do canal de destino",
+}
+
+NAME_MAX = 32
+
+GET_TEMPLATE_SQL = "SELECT * FROM message_templates WHERE guild_id = ? AND name = ?"
+
+TEMPLATE_NAMES_SQL = "SELECT name FROM message_templates WHERE guild_id = ? ORDER BY name"
+
+UPSERT_TEMPLATE_SQL = """
+INSERT INTO message_templates (guild_id, name, title, body, created_by_id, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(guild_id, name) DO UPDATE SET
+    title = excluded.title,
+    body = excluded.body,
+    created_by_id = excluded.created_by_id,
+    updated_at = excluded.updated_at
+"""
+
+DELETE_TEMPLATE_SQL = "DELETE FROM message_templates WHERE guild_id = ? AND name = ?"
+
+database.register_hot_query("message_template", GET_TEMPLATE_SQL, (0, ""), "sqlite_autoindex_message_templates_1")
+database.register_hot_query("message_template_names", TEMPLATE_NAMES_SQL, (0,), "sqlite_autoindex_message_templates_1")
+
+_formatter = string.Formatter()
+
+
+def compile_text(text: str) -> tuple[tuple[str, str | None], ...]:
+    """
+    Quebra o texto em (literal, placeholder) uma única vez.
+    - {{ e }} viram chaves literais.
+    - Placeholder desconhecido, com formato ({member:>10}) ou conversão
+      ({member!r}) levanta ValueError (mensagem para o usuário).
+    """
+    try:
+        parsed = list(_formatter.parse(text))
+    except ValueError:
+        raise ValueError("Chaves { } desbalanceadas. Use {{ e }} para chaves literais.") from None
+
+    pieces: list[tuple[str, str | None]] = []
+    for literal, field, spec, conversion in parsed:
+        if field is not None:
+            if field not in PLACEHOLDERS or spec or conversion:
+                raise ValueError(f"Placeholder inválido: {{{field}}}. Use: " + ", ".join(f"{{{p}}}" for p in PLACEHOLDERS))
+        pieces.append((literal, field))
+    return tuple(pieces)
+
+
+def _render(pieces: tuple[tuple[str, str | None], ...], values: dict[str, str]) -> str:
+    return "".join(literal + (values[field] if field else "") for literal, field in pieces)
+
+
+def _key_name(name: str) -> str:
+    # forma canônica do nome (minúsculo, espaços colapsados); sem validar
+    return " ".join(name.strip().lower().split())
+
+
+def normalize_name(name: str) -> str:
+    name = _key_name(name)
+    if not name or len(name) > NAME_MAX:
+        raise ValueError(f"Nome do template deve ter de 1 a {NAME_MAX} caracteres.")
+    return name
+
+
+@dataclass(frozen=True)
+class MessageTemplate:
+    guild_id: int
+    name: str
+    title: str | None
+    body: str
+    # texto já quebrado em (literal, placeholder)
+    _title: tuple = field(repr=False)
+    _body: tuple = field(repr=False)
+
+    @classmethod
+    def build(cls, guild_id: int, name: str, title: str | None, body: str) -> "MessageTemplate":
+        return cls(guild_id, name, title, body, compile_text(title or ""), compile_text(body))
+
+    @property
+    def is_embed(self) -> bool:
+        return bool(self.title)
+
+    def render(
+        self,
+        *,
+        member: discord.Member | discord.User | None = None,
+        guild: discord.Guild | None = None,
+        channel: discord.abc.GuildChannel | None = None,
+    ) -> tuple[str | None, str]:
+        """Devolve (título, corpo) com os placeholders preenchidos; nenhuma chamada REST."""
+        values = {
+            "member": member.mention if member else "",
+            "member_name": member.display_name if member else "",
+            "guild": guild.name if guild else "",
+            "member_count": str(guild.member_count or 0) if guild else "0",
+            "channel": channel.mention if channel else "",
+        }
+        title = _render(self._title, values) if self.title else None
+        return title, _render(self._body, values)
+
+
+# nome sem template no banco (cache negativo)
+_MISSING = object()
+
+
+def _delete_template(conn, guild_id: int, name: str) -> int:
+    return conn.execute(DELETE_TEMPLATE_SQL, (guild_id, name)).rowcount
+
+
+class TemplateStore:
+    """
+    Templates de mensagem por guild (tabela message_templates).
+    - LRU em memória na frente do SQLite: re-postar um template conhecido
+      não toca no banco nem faz fetch_message.
+    - O texto é compilado (placeholders resolvidos em pedaços) ao entrar
+      no cache; render() só concatena.
+    - Nome inexistente também fica em cache (sentinela), para um nome
+      errado repetido não ir ao banco toda vez.
+    - A lista de nomes por guild (autocomplete) também fica em cache e é
+      invalidada em save/delete.
+    - A geração por guild impede que uma leitura antiga (template ou lista
+      de nomes) sobrescreva um save/delete que terminou enquanto ela
+      esperava o banco.
+    """
+
+    def __init__(self, capacity: int = 128) -> None:
+        self.capacity = capacity
+        self._cache: OrderedDict[tuple[int, str], MessageTemplate | object] = OrderedDict()
+        self._generation: dict[int, int] = {}
+        self._names: dict[int, list[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _put(self, key: tuple[int, str], template: MessageTemplate | object) -> None:
+        self._cache[key] = template
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def _bump(self, guild_id: int) -> None:
+        self._generation[guild_id] = self._generation.get(guild_id, 0) + 1
+        self._names.pop(guild_id, None)
+
+    async def get(self, guild_id: int, name: str) -> MessageTemplate | None:
+        key = (guild_id, _key_name(name))
+        template = self._cache.get(key)
+        if template is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return None if template is _MISSING else template
+        self.misses += 1
+        generation = self._generation.get(guild_id, 0)
+        row = await database.fetchone(GET_TEMPLATE_SQL, key)
+        template = None if row is None else MessageTemplate.build(guild_id, key[1], row["title"], row["body"])
+        if self._generation.get(guild_id, 0) == generation:
+            self._put(key, _MISSING if template is None else template)
+        return template
+
+    async def save(self, guild_id: int, name: str, title: str | None, body: str, *, created_by_id: int) -> MessageTemplate:
+        # compila antes de gravar: template inválido nunca chega no banco
+        template = MessageTemplate.build(guild_id, normalize_name(name), (title or "").strip() or None, body)
+        now = datetime.utcnow().isoformat()
+        await database.execute(
+            UPSERT_TEMPLATE_SQL,
+            (guild_id, template.name, template.title, template.body, created_by_id, now, now),
+        )
+        self._bump(guild_id)
+        self._put((guild_id, template.name), template)
+        return template
+
+    async def delete(self, guild_id: int, name: str) -> bool:
+        key = (guild_id, _key_name(name))
+        deleted = await database.run(_delete_template, *key)
+        self._bump(guild_id)
+        self._put(key, _MISSING)
+        return deleted > 0
+
+    async def names(self, guild_id: int) -> list[str]:
+        names = self._names.get(guild_id)
+        if names is None:
+            generation = self._generation.get(guild_id, 0)
+            rows = await database.fetchall(TEMPLATE_NAMES_SQL, (guild_id,))
+            names = [r["name"] for r in rows]
+            if self._generation.get(guild_id, 0) == generation:
+                self._names[guild_id] = names
+        return names
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "size": len(self._cache),
+        }
@@ -0,0 +1,163 @@
+# utils/watchdog.py
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Callable
+
+from utils.metrics import registry as metrics
+
+logger = logging.getLogger("duki_odyssey.watchdog")
+
+# frames mostrados no relatório (os mais internos, onde o loop está preso)
+MAX_FRAMES = 12
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+class LoopWatchdog:
+    """
+    Detector de travadas do event loop (opt-in).
+    - Um heartbeat no loop atualiza `_beat` a cada `interval`.
+    - Uma thread daemon confere o heartbeat; se passou de `threshold`,
+      captura a pilha da thread do loop (sys._current_frames) e a task
+      asyncio corrente — é o código que está bloqueando naquele instante.
+    - Log no stdout na hora (mesmo que o loop nunca volte); quando o loop
+      volta, o heartbeat mede a duração total e chama `on_stall(texto)`
+      no loop (ex.: postar no canal de log).
+    - Um relatório a cada `cooldown` segundos; o resto só conta.
+    """
+
+    def __init__(
+        self,
+        on_stall: Callable[[str], None] | None = None,
+        *,
+        threshold: float = 0.25,
+        interval: float = 0.05,
+        cooldown: float = 60.0,
+    ) -> None:
+        self.on_stall = on_stall
+        self.threshold = threshold
+        self.interval = interval
+        self.cooldown = cooldown
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._beat = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+        # (heartbeat da travada, relatório) capturado pela thread,
+        # finalizado pelo heartbeat
+        self._pending: tuple[float, str] | None = None
+        self._last_report = 0.0
+
+        self.stalls = 0
+        self.reported = 0
+        self.suppressed = 0
+        self.worst_ms = 0.0
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "stalls": self.stalls,
+            "reported": self.reported,
+            "suppressed": self.suppressed,
+            "worst_ms": round(self.worst_ms, 1),
+        }
+
+    # -------------------------
+    # ciclo de vida
+    # -------------------------
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join, 1.0)
+            self._thread = None
+
+    # -------------------------
+    # loop
+    # -------------------------
+    async def _heartbeat(self) -> None:
+        while True:
+            t0 = time.monotonic()
+            self._beat = t0
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - t0 - self.interval
+            pending, self._pending = self._pending, None
+            if lag < self.threshold:
+                continue
+
+            self.stalls += 1
+            self.worst_ms = max(self.worst_ms, lag * 1000)
+            metrics.observe("loop", "stall", lag)
+
+            if pending is None or pending[0] != t0:
+                # travou entre duas checagens da thread ou caiu no cooldown
+                continue
+            if self.on_stall is not None:
+                self.reported += 1
+                try:
+                    self.on_stall(f"🐢 Loop travado por **{lag * 1000:.0f}ms**\n{pending[1]}")
+                except Exception:
+                    logger.exception("Falha ao reportar travada do loop.")
+
+    # -------------------------
+    # thread de vigia
+    # -------------------------
+    def _watch(self) -> None:
+        captured_for = None
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            # mesma medida do heartbeat: atraso além do próprio sleep
+            behind = time.monotonic() - beat - self.interval
+            if behind < self.threshold or captured_for == beat:
+                continue
+            # uma captura por travada
+            captured_for = beat
+
+            now = time.monotonic()
+            if now - self._last_report < self.cooldown:
+                self.suppressed += 1
+                continue
+            self._last_report = now
+
+            report = self._capture()
+            logger.warning("Event loop travado há %.0fms:\n%s", behind * 1000, report)
+            self._pending = (beat, report)
+
+    def _capture(self) -> str:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return "(pilha indisponível)"
+        # frames do próprio asyncio (run_forever, _run_once...) só fazem ruído
+        frames = [f for f in traceback.extract_stack(frame) if _ASYNCIO_DIR not in f.filename]
+        stack = traceback.format_list(frames[-MAX_FRAMES:])
+
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        if task is not None:
+            coro = task.get_coro()
+            where = f"task `{task.get_name()}` ({getattr(coro, '__qualname__', coro)})"
+        else:
+            where = "callback fora de task"
+        return f"Em {where}:\n```\n{''.join(stack)[-1500:]}```"
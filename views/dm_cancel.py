@@ -1,6 +1,8 @@
 # views/dm_cancel.py
 import discord
 
+from utils.metrics import timed
+
 class DmCancelPresenceView(discord.ui.View):
     def __init__(self, event_id: int):
         super().__init__(timeout=None)
@@ -11,6 +13,7 @@ class DmCancelPresenceView(discord.ui.View):
         style=discord.ButtonStyle.danger,
         custom_id="duki:karaoke:dm:cancel"
     )
+    @timed("view", "dm_cancel.cancel")
     async def cancel_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.send_message(
             "✅ Sua presença foi cancelada.",
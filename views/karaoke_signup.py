@@ -1,29 +1,62 @@
 # views/karaoke_signup.py
 import discord
 
+from utils import event_service
+from utils.metrics import timed
+from utils.signups import CHANGED, SINGER, SPECTATOR, UNCHANGED
+
+_LABELS = {SINGER: "cantor", SPECTATOR: "espectador"}
+
 class KaraokeSignupView(discord.ui.View):
     def __init__(self, event_id: int):
         super().__init__(timeout=None)
+        # 0 = view persistente registrada no boot (vale para o evento aberto)
         self.event_id = event_id
 
+    async def _signup(self, interaction: discord.Interaction, signup_type: str):
+        if interaction.guild is None:
+            return await interaction.response.send_message(
+                "Este botão só funciona dentro do servidor.",
+                ephemeral=True
+            )
+
+        # evento aberto vem do cache; só no cache frio o ack sai antes do banco
+        found, event = event_service.open_event_cache.get(interaction.guild_id)
+        if not found:
+            await interaction.response.defer(ephemeral=True)
+            event = await event_service.load_open_karaoke_event(interaction.guild_id)
+        reply = interaction.followup.send if interaction.response.is_done() else interaction.response.send_message
+
+        if event is None or (self.event_id and event["id"] != self.event_id):
+            return await reply("❌ Esta chamada já foi encerrada.", ephemeral=True)
+
+        ingest = interaction.client.signups
+        outcome = ingest.record(event["id"], interaction.user.id, signup_type)
+        label = _LABELS[signup_type]
+        if outcome == UNCHANGED:
+            return await reply(f"✅ Você já está inscrito(a) como {label}.", ephemeral=True)
+        if outcome == CHANGED:
+            await reply(f"🔁 Inscrição trocada para {label}.", ephemeral=True)
+        else:
+            await reply(f"✅ Inscrição como {label} registrada.", ephemeral=True)
+        # contagem na mensagem e gravação em lote, depois do ack
+        interaction.client.signup_board.touch(event["id"])
+        await ingest.persist(event["id"], interaction.user.id)
+
     @discord.ui.button(
         label="🎤 Vou cantar",
         style=discord.ButtonStyle.success,
         custom_id="duki:karaoke:signup:singer"
     )
+    @timed("view", "karaoke.singer")
     async def singer_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_message(
-            "✅ Inscrição como cantor registrada.",
-            ephemeral=True
-        )
+        await self._signup(interaction, SINGER)
 
     @discord.ui.button(
         label="👀 Só assistir",
         style=discord.ButtonStyle.primary,
         custom_id="duki:karaoke:signup:spectator"
     )
+    @timed("view", "karaoke.spectator")
     async def spectator_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_message(
-            "✅ Inscrição como espectador registrada.",
-            ephemeral=True
-        )
+        await self._signup(interaction, SPECTATOR)
@@ -1,5 +1,7 @@
 import discord
 
+from utils.metrics import timed
+
 class VerifyRulesView(discord.ui.View):
     def __init__(self, rules_role_id: int):
         super().__init__(timeout=None)
@@ -10,6 +12,7 @@ class VerifyRulesView(discord.ui.View):
         style=discord.ButtonStyle.success,
         custom_id="duki:rules:accept"
     )
+    @timed("view", "verify.accept")
     async def accept_rules(
         self,
         interaction: discord.Interaction,
@@ -61,21 +64,13 @@ class VerifyRulesView(discord.ui.View):
                 ephemeral=True
             )
 
-        try:
-            await member.add_roles(role, reason="Aceitou as regras do servidor")
-        except discord.Forbidden:
-            return await interaction.response.send_message(
-                "Não tenho permissão para dar esse cargo. "
-                "Verifique 'Gerenciar cargos' e a hierarquia.",
-                ephemeral=True
-            )
-        except discord.HTTPException:
-            return await interaction.response.send_message(
-                "O Discord recusou a ação agora. Tente novamente em instantes.",
-                ephemeral=True
-            )
+        # o add_roles roda na fila compartilhada; aqui só o ack
+        grants = interaction.client.role_grants
+        await interaction.response.defer(ephemeral=True, thinking=True)
 
-        await interaction.response.send_message(
-            "✅ Verificação concluída. Seu acesso foi liberado.",
-            ephemeral=True
-        )
+        if not grants.submit(member, role, interaction, reason="Aceitou as regras do servidor"):
+            if grants.is_pending(interaction.guild.id, member.id):
+                msg = "⏳ Seu acesso já está sendo liberado. Aguarde um instante."
+            else:
+                msg = "O Discord está ocupado agora. Tente novamente em instantes."
+            await interaction.followup.send(msg, ephemeral=True)